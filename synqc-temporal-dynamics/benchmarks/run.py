@@ -0,0 +1,342 @@
+"""Benchmark the synqc and synqc_live hot paths.
+
+Run from the project root:
+
+    python benchmarks/run.py                   # medium scale, compare to baseline
+    python benchmarks/run.py --scale small     # quick smoke run
+    python benchmarks/run.py --update-baseline # record a new baseline
+
+Each case reports the median wall time, throughput (samples per second) and
+peak traced memory. Results are compared against a JSON baseline
+(``benchmarks/baseline.json`` by default) and any case slower than
+``baseline * (1 + tolerance)`` is flagged as a regression. The readiness KPIs
+(full DPD cycle <= 25 ms, demod <= 3 ms) are checked on the example-sized
+workloads, and bulk RNG draws are checked against the equivalent scalar
+calls with the same tolerance. The exit status is non-zero when a regression or KPI failure is
+found. Everything runs offline; synqc_live cases are skipped if pandas or
+NumPy are missing.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+BENCH_DIR = Path(__file__).resolve().parent
+PROJECT_ROOT = BENCH_DIR.parent
+LIVE_ROOT = PROJECT_ROOT / "synqc_temporal_dynamics_live"
+for path in (PROJECT_ROOT, LIVE_ROOT):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
+
+from synqc.demod import lockin_demod  # noqa: E402
+from synqc.hardware import HardwareSignature  # noqa: E402
+from synqc.rng import default_rng  # noqa: E402
+from synqc.scheduler import run_dpd_sequence  # noqa: E402
+from synqc.track import DetuningTracker  # noqa: E402
+
+DEFAULT_BASELINE = BENCH_DIR / "baseline.json"
+
+# Readiness spec §7: end-to-end DPD cycle <= 25 ms, demod <= 3 ms.
+KPI_LIMITS_S = {"dpd/kpi-cycle": 25e-3, "demod/kpi": 3e-3}
+
+SCALES = {
+    "small": (1_000,),
+    "medium": (1_000, 10_000),
+    "large": (1_000, 10_000, 100_000),
+}
+LIVE_CYCLES = {
+    "small": (8,),
+    "medium": (8, 128),
+    "large": (8, 128, 1024),
+}
+
+
+@dataclass
+class Case:
+    name: str
+    func: Callable[[], object]
+    samples: int
+
+
+@dataclass
+class Measurement:
+    name: str
+    samples: int
+    repeats: int
+    median_s: float
+    min_s: float
+    throughput_per_s: float
+    peak_bytes: int
+
+
+def _dpd_cases(sizes) -> List[Case]:
+    hw = HardwareSignature.superconducting()
+    dt_s = 1e-8
+    cases = [
+        Case(
+            "dpd/kpi-cycle",
+            lambda: run_dpd_sequence(
+                hw, 250e3, 2.5e6, 2e-6, 20e-6, 2e-6, dt_s=2e-7, rng=default_rng(0)
+            ),
+            120,
+        )
+    ]
+    cases.append(Case(
+        "track/25-iterations",
+        lambda: DetuningTracker(hw, 2.5e6, 2e-6, 20e-6, 2e-6, dt_s=2e-7, rng=default_rng(0)).run(250e3, 25),
+        25 * 120,
+    ))
+    for n in sizes:
+        span = n * dt_s
+        common = dict(dt_s=dt_s, rng=default_rng(0), demod_window=64)
+        d1, probe_s, d2 = 0.1 * span, 0.8 * span, 0.1 * span
+        cases.append(Case(
+            f"dpd/n={n}",
+            lambda d1=d1, p=probe_s, d2=d2, kw=common: run_dpd_sequence(hw, 250e3, 2.5e6, d1, p, d2, **kw),
+            n,
+        ))
+        cases.append(Case(
+            f"dpd/n={n}/substeps=4",
+            lambda d1=d1, p=probe_s, d2=d2, kw=common: run_dpd_sequence(
+                hw, 250e3, 2.5e6, d1, p, d2, drive_substeps=4, **kw
+            ),
+            n,
+        ))
+        cases.append(Case(
+            f"dpd/n={n}/axes=xyz",
+            lambda d1=d1, p=probe_s, d2=d2, kw=common: run_dpd_sequence(
+                hw, 250e3, 2.5e6, d1, p, d2, real_time_axes=("x", "y", "z"), real_time_shots=0, **kw
+            ),
+            n,
+        ))
+    return cases
+
+
+def _demod_cases(sizes) -> List[Case]:
+    cases = [Case("demod/kpi", lambda: lockin_demod([0.5] * 120, 250e3, 2e-7, window=None), 120)]
+    for n in sizes:
+        signal = [((k * 7919) % 1000) / 1000.0 for k in range(n)]
+        for window in (8, max(1, n // 4)):
+            cases.append(Case(
+                f"demod/n={n}/window={window}",
+                lambda s=signal, w=window: lockin_demod(s, 1e5, 1e-8, window=w),
+                n,
+            ))
+    return cases
+
+
+def _scalar_normals(n: int) -> list:
+    normal = default_rng(0).normal
+    return [normal(0.0, 1.0) for _ in range(n)]
+
+
+def _rng_cases(sizes) -> List[Case]:
+    # The bulk draw must not be slower than the scalar calls it replaces.
+    cases: List[Case] = []
+    for n in sizes:
+        cases.append(Case(f"rng/normal/n={n}/scalar", lambda n=n: _scalar_normals(n), n))
+        cases.append(Case(f"rng/normal/n={n}/bulk", lambda n=n: default_rng(0).normal(0.0, 1.0, size=n), n))
+    return cases
+
+
+def _live_cases(cycles) -> List[Case]:
+    try:
+        import numpy  # noqa: F401
+        import pandas  # noqa: F401
+    except ModuleNotFoundError:
+        print("[skip] synqc_live cases need numpy and pandas", file=sys.stderr)
+        return []
+    from synqc_live.adapt import AdaptiveLoop
+    from synqc_live.demod import demodulate_probes
+    from synqc_live.hardware import SimulatedBackend
+    from synqc_live.runtime import build_quickstart_config
+    from synqc_live.scheduler import Scheduler
+
+    cases: List[Case] = []
+    for num_cycles in cycles:
+        config = build_quickstart_config(num_cycles=num_cycles)
+        scheduler = Scheduler(config=config)
+        schedule = scheduler.build_schedule()
+        backend = SimulatedBackend(config.lo_frequency_hz, config.sample_rate_hz, seed=0)
+        raw = backend.run_schedule(schedule)
+        samples = len(raw)
+        cases.append(Case(
+            f"live/to_dataframe/cycles={num_cycles}",
+            lambda sch=schedule, fs=config.sample_rate_hz: sch.to_dataframe(fs),
+            samples,
+        ))
+        cases.append(Case(
+            f"live/compile+to_dataframe/cycles={num_cycles}",
+            lambda sch=scheduler, fs=config.sample_rate_hz: sch.compile().to_dataframe(fs),
+            samples,
+        ))
+        cases.append(Case(
+            f"live/run_schedule/cycles={num_cycles}",
+            lambda b=backend, sch=schedule: b.run_schedule(sch),
+            samples,
+        ))
+        cases.append(Case(
+            f"live/iter_schedule/cycles={num_cycles}",
+            lambda b=backend, sch=scheduler: sum(len(c) for c in b.iter_schedule(sch.compile(), 16384)),
+            samples,
+        ))
+        cases.append(Case(
+            f"live/demodulate_probes/cycles={num_cycles}",
+            lambda df=raw, c=config: demodulate_probes(df, c.lo_frequency_hz, c.sample_rate_hz),
+            samples,
+        ))
+        cases.append(Case(
+            f"live/demod/ddc16/cycles={num_cycles}",
+            lambda df=raw, c=config: demodulate_probes(df, c.lo_frequency_hz, c.sample_rate_hz, decimation=16),
+            samples,
+        ))
+
+        def adaptive_run(num_cycles=num_cycles):
+            cfg = build_quickstart_config(num_cycles=num_cycles)
+            sched = Scheduler(config=cfg)
+            loop = AdaptiveLoop(
+                config=cfg,
+                scheduler=sched,
+                backend=SimulatedBackend(cfg.lo_frequency_hz, cfg.sample_rate_hz, seed=0),
+            )
+            return loop.run(num_iterations=3)
+
+        cases.append(Case(f"live/adaptive_run/cycles={num_cycles}", adaptive_run, 3 * samples))
+    return cases
+
+
+def build_cases(scale: str) -> List[Case]:
+    sizes = SCALES[scale]
+    return _dpd_cases(sizes) + _demod_cases(sizes) + _rng_cases(sizes) + _live_cases(LIVE_CYCLES[scale])
+
+
+def measure(case: Case, *, min_time_s: float, max_repeats: int) -> Measurement:
+    case.func()  # warm caches and imports
+    timings: List[float] = []
+    budget_start = time.perf_counter()
+    while len(timings) < max_repeats:
+        start = time.perf_counter()
+        case.func()
+        timings.append(time.perf_counter() - start)
+        if len(timings) >= 3 and time.perf_counter() - budget_start >= min_time_s:
+            break
+    tracemalloc.start()
+    try:
+        case.func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    median = statistics.median(timings)
+    return Measurement(
+        name=case.name,
+        samples=case.samples,
+        repeats=len(timings),
+        median_s=median,
+        min_s=min(timings),
+        throughput_per_s=case.samples / median if median > 0 else float("inf"),
+        peak_bytes=peak,
+    )
+
+
+def load_baseline(path: Path) -> Dict[str, dict]:
+    if not path.exists():
+        return {}
+    data = json.loads(path.read_text(encoding="utf-8"))
+    return {entry["name"]: entry for entry in data.get("results", [])}
+
+
+def write_baseline(path: Path, results: List[Measurement], scale: str) -> None:
+    payload = {
+        "scale": scale,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": [asdict(m) for m in results],
+    }
+    path.write_text(json.dumps(payload, indent=2) + "\n", encoding="utf-8")
+
+
+def _parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark synqc and synqc_live hot paths.")
+    parser.add_argument("--scale", choices=sorted(SCALES), default="medium",
+                        help="Workload sizes to run (default: medium).")
+    parser.add_argument("-k", "--filter", default="",
+                        help="Only run cases whose name contains this substring.")
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE,
+                        help=f"Baseline JSON path (default: {DEFAULT_BASELINE}).")
+    parser.add_argument("--update-baseline", action="store_true",
+                        help="Write the results as the new baseline instead of comparing.")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="Allowed slowdown over baseline median before flagging (default: 0.25).")
+    parser.add_argument("--min-time", type=float, default=0.2,
+                        help="Minimum seconds spent timing each case (default: 0.2).")
+    parser.add_argument("--max-repeats", type=int, default=50,
+                        help="Maximum timed repetitions per case (default: 50).")
+    parser.add_argument("--json", type=Path, help="Optional path to write this run's results.")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = _parse_args(argv)
+    cases = [case for case in build_cases(args.scale) if args.filter in case.name]
+    baseline = {} if args.update_baseline else load_baseline(args.baseline)
+
+    results: List[Measurement] = []
+    problems: List[str] = []
+    print(f"{'case':<42} {'median':>10} {'samples/s':>12} {'peak MiB':>9}  status")
+    for case in cases:
+        m = measure(case, min_time_s=args.min_time, max_repeats=args.max_repeats)
+        results.append(m)
+        status = ""
+        limit = KPI_LIMITS_S.get(m.name)
+        if limit is not None:
+            ok = m.median_s <= limit
+            status = f"KPI {'ok' if ok else 'FAIL'} (<= {limit * 1e3:g} ms)"
+            if not ok:
+                problems.append(f"{m.name}: KPI {m.median_s * 1e3:.3f} ms > {limit * 1e3:g} ms")
+        ref = baseline.get(m.name)
+        if ref is not None:
+            ratio = m.median_s / ref["median_s"] if ref["median_s"] > 0 else float("inf")
+            flag = ratio > 1.0 + args.tolerance
+            status = f"{status} {ratio:.2f}x baseline{' REGRESSION' if flag else ''}".strip()
+            if flag:
+                problems.append(f"{m.name}: {ratio:.2f}x slower than baseline")
+        print(
+            f"{m.name:<42} {m.median_s * 1e3:>8.3f}ms {m.throughput_per_s:>12.3g} "
+            f"{m.peak_bytes / 2**20:>9.2f}  {status}"
+        )
+
+    # Bulk RNG draws must keep up with the scalar calls they replace, within
+    # the same tolerance as the baseline comparison so timing noise passes.
+    medians = {m.name: m.median_s for m in results}
+    for name, median in medians.items():
+        scalar = medians.get(name[: -len("/bulk")] + "/scalar") if name.endswith("/bulk") else None
+        if scalar is not None and median > scalar * (1.0 + args.tolerance):
+            problems.append(f"{name}: bulk {median * 1e3:.3f} ms slower than scalar {scalar * 1e3:.3f} ms")
+
+    if args.json is not None:
+        write_baseline(args.json, results, args.scale)
+    if args.update_baseline:
+        write_baseline(args.baseline, results, args.scale)
+        print(f"\n[written] baseline → {args.baseline}")
+    elif not baseline:
+        print(f"\nNo baseline at {args.baseline}; run with --update-baseline to record one.")
+
+    if problems:
+        print("\nFlagged:")
+        for line in problems:
+            print(f"  - {line}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
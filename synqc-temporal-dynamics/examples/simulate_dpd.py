@@ -5,6 +5,7 @@ import matplotlib.pyplot as plt
 from synqc.adapt import ScalarKalman
 from synqc.hardware import HardwareSignature
 from synqc.scheduler import run_dpd_sequence
+from synqc.track import DetuningTracker
 
 # Config
 hw = HardwareSignature.superconducting()
@@ -16,29 +17,28 @@ probe_s = 20.0e-6
 d2_s = 2.0e-6
 dt_s = 2.0e-7
 
-# Tracker
-kf = ScalarKalman(x0=0.0, p0=1e12, q=1e7, r=1e6)
-
-est_hist = []
-phase_hist = []
-innov_hist = []
-
-for _ in range(25):
-    detuning_cmd = -kf.x
-    residual = detuning_true_hz + detuning_cmd
-    res = run_dpd_sequence(hw, residual, omega_hz, d1_s, probe_s, d2_s, readout_axis="z", dt_s=dt_s)
-
-    # Phase → Hz proxy (demo)
-    z_meas = res.phase * 1.0e5
-    kf.predict()
-    x, p, k, innov = kf.update(z_meas, H=1.0)
-
-    est_hist.append(x)
-    phase_hist.append(res.phase)
-    innov_hist.append(innov)
+# Tracker: timeline, demod weights and Kalman state persist across iterations.
+tracker = DetuningTracker(
+    hw,
+    omega_hz,
+    d1_s,
+    probe_s,
+    d2_s,
+    readout_axis="z",
+    dt_s=dt_s,
+    phase_scale_hz=1.0e5,  # phase → Hz proxy (demo)
+    kalman=ScalarKalman(x0=0.0, p0=1e12, q=1e7, r=1e6),
+)
+track = tracker.run(detuning_true_hz, 25)
+est_hist = list(track.estimate_hz)
+phase_hist = list(track.phase)
 
 print("Final estimate (Hz):", est_hist[-1])
-print("Mean |innovation|:", statistics.fmean(abs(v) for v in innov_hist))
+print("Mean |innovation|:", statistics.fmean(abs(v) for v in track.innovation))
+print(
+    f"Loop latency: mean {track.stats.mean_s * 1e3:.3f} ms, "
+    f"jitter {track.stats.jitter_s * 1e3:.3f} ms, max {track.stats.max_s * 1e3:.3f} ms"
+)
 
 # Plots
 plt.figure()
@@ -1,20 +1,41 @@
-"""SynQc Temporal Dynamics public API."""
+"""SynQc Temporal Dynamics public API.
 
-from .scheduler import DPDResult, RealTimeObservations, RealTimeProfile, run_dpd_sequence
-from .probes import drive, probe, seed_default_rng, set_default_rng, get_default_rng
+The core is pure Python. ``synqc.batch`` and ``synqc.store`` need NumPy and
+are left out of ``__all__`` so ``from synqc import *`` never imports it;
+import them explicitly.
+"""
+
+from .scheduler import (
+    DPDResult,
+    RealTimeObservations,
+    RealTimeProfile,
+    StateHistory,
+    run_dpd_sequence,
+)
+from .observers import Observer, RealTimeObserver
+from .probes import drive, drive_envelope, drive_segment, probe, seed_default_rng, set_default_rng, get_default_rng
 
 __all__ = [
     "scheduler",
     "probes",
     "demod",
     "adapt",
+    "observers",
     "mathkern",
+    "pulses",
     "hardware",
+    "sweep",
+    "track",
     "DPDResult",
     "RealTimeObservations",
     "RealTimeProfile",
+    "StateHistory",
+    "Observer",
+    "RealTimeObserver",
     "run_dpd_sequence",
     "drive",
+    "drive_segment",
+    "drive_envelope",
     "probe",
     "seed_default_rng",
     "set_default_rng",
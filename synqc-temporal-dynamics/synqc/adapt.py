@@ -18,3 +18,146 @@ class ScalarKalman:
         self.x = self.x + k*y
         self.p = (1 - k*H)*self.p
         return self.x, self.p, k, y
+
+
+KALMAN_STATES = ("detuning_hz", "drift_hz_per_s", "amplitude")
+
+
+def _require_numpy():
+    try:
+        import numpy as np  # type: ignore
+    except ModuleNotFoundError as exc:  # pragma: no cover - environment-specific
+        raise RuntimeError("numpy is required for KalmanBank.") from exc
+    return np
+
+
+def _per_filter_matrix(np, value, n, d, name):
+    """Broadcast a scalar, ``(d,)``, ``(d, d)``, ``(n,)``, ``(n, d)`` or ``(n, d, d)`` to ``(n, d, d)``."""
+
+    arr = np.asarray(value, dtype=float)
+    if arr.ndim == 0:
+        arr = arr * np.eye(d)
+    elif arr.ndim == 1 and arr.shape == (d,):
+        arr = np.diag(arr)
+    elif arr.ndim == 1 and arr.shape == (n,):
+        arr = arr[:, None, None] * np.eye(d)
+    elif arr.ndim == 2 and arr.shape == (n, d):
+        arr = arr[:, :, None] * np.eye(d)
+    elif arr.ndim not in (2, 3) or arr.shape[-2:] != (d, d):
+        raise ValueError(
+            f"{name} has shape {arr.shape}; expected a scalar, ({d},), ({d}, {d}), "
+            f"({n},), ({n}, {d}) or ({n}, {d}, {d})"
+        )
+    return np.array(np.broadcast_to(arr, (n, d, d)))
+
+
+class KalmanBank:
+    """``n`` independent linear Kalman filters stored as stacked NumPy arrays.
+
+    Each filter tracks the first ``dim`` entries of :data:`KALMAN_STATES`:
+    detuning, its drift rate (``detuning += drift * dt`` per predict) and an
+    optional random-walk amplitude. Measurements are ``z = H x + v`` with
+    ``H = [1, 0, ...]`` unless a ``(m, dim)`` matrix is given. ``q``, ``r``,
+    ``p0`` accept scalars, per-state diagonals ``(dim,)``, per-filter scales
+    ``(n,)``/diagonals ``(n, dim)`` or full ``(n, dim, dim)`` matrices; a
+    ``(dim,)`` shape wins when ``n == dim``. A scalar or ``(n,)`` ``x0`` sets
+    the detuning only.
+
+    With ``steady_state=True`` the converged gain is precomputed once and
+    :meth:`update` applies it without touching the covariances. With
+    ``dim=1`` each filter reproduces :class:`ScalarKalman`.
+    """
+
+    def __init__(self, n, *, dim=2, dt=1.0, x0=0.0, p0=1e12, q=1e7, r=1e6, H=None,
+                 steady_state=False, tol=1e-12, max_iter=10000):
+        np = _require_numpy()
+        if n < 1:
+            raise ValueError("n must be >= 1")
+        if dim not in (1, 2, 3):
+            raise ValueError("dim must be 1 (detuning), 2 (+ drift) or 3 (+ amplitude)")
+        self.n = int(n)
+        self.dim = dim
+        self.dt = float(dt)
+        self.F = np.eye(dim)
+        if dim >= 2:
+            self.F[0, 1] = self.dt
+        self.H = np.eye(1, dim) if H is None else np.atleast_2d(np.asarray(H, dtype=float))
+        if self.H.shape[1] != dim:
+            raise ValueError(f"H must have {dim} columns")
+        m = self.H.shape[0]
+        x = np.asarray(x0, dtype=float)
+        if x.ndim == 0 or (x.ndim == 1 and x.shape != (dim,)):
+            x = x.reshape(-1, 1) * np.eye(1, dim)  # detuning only, per filter or shared
+        self.x = np.array(np.broadcast_to(x, (self.n, dim)))
+        self.P = _per_filter_matrix(np, p0, self.n, dim, "p0")
+        self.Q = _per_filter_matrix(np, q, self.n, dim, "q")
+        self.R = _per_filter_matrix(np, r, self.n, m, "r")
+        self.gain = None
+        if steady_state:
+            self.freeze_gain(tol=tol, max_iter=max_iter)
+
+    @property
+    def steady_state(self):
+        """``True`` once :meth:`freeze_gain` has fixed the gain."""
+
+        return self.gain is not None
+
+    def _gain(self, P_prior):
+        np = _require_numpy()
+        PHt = P_prior @ self.H.T
+        S = self.H @ PHt + self.R
+        return np.linalg.solve(S, PHt.transpose(0, 2, 1)).transpose(0, 2, 1)
+
+    def freeze_gain(self, tol=1e-12, max_iter=10000):
+        """Iterate the Riccati recursion to convergence and fix the gain.
+
+        Afterwards :attr:`P` holds the steady-state posterior covariance.
+        Raises ``RuntimeError`` if the gain has not converged (relative
+        change ``<= tol``) within ``max_iter`` iterations.
+        """
+
+        np = _require_numpy()
+        eye = np.eye(self.dim)
+        P = self.P
+        K_prev = None
+        for _ in range(max_iter):
+            P_prior = self.F @ P @ self.F.T + self.Q
+            K = self._gain(P_prior)
+            P = (eye - K @ self.H) @ P_prior
+            if K_prev is not None and np.max(np.abs(K - K_prev)) <= tol * max(1.0, np.max(np.abs(K))):
+                self.P = P
+                self.gain = K
+                return K
+            K_prev = K
+        raise RuntimeError("Kalman gain did not converge; increase max_iter or check q/r")
+
+    def predict(self):
+        """Propagate all filters one step; returns the state array ``(n, dim)``."""
+
+        self.x = self.x @ self.F.T
+        if self.gain is None:
+            self.P = self.F @ self.P @ self.F.T + self.Q
+        return self.x
+
+    def update(self, z, mask=None):
+        """Fuse measurements ``z`` (shape ``(n,)`` or ``(n, m)``) into every filter.
+
+        Filters where ``mask`` is false, or whose measurement is NaN, keep
+        their state. Returns ``(x, innovation)`` with innovations ``(n, m)``.
+        """
+
+        np = _require_numpy()
+        z = np.asarray(z, dtype=float).reshape(self.n, -1)
+        y = z - self.x @ self.H.T
+        keep = np.all(np.isfinite(y), axis=1)
+        if mask is not None:
+            keep &= np.asarray(mask, dtype=bool)
+        y_used = np.where(keep[:, None], y, 0.0)
+        if self.gain is not None:
+            self.x = self.x + np.einsum("nij,nj->ni", self.gain, y_used)
+            return self.x, y
+        K = self._gain(self.P)
+        self.x = self.x + np.einsum("nij,nj->ni", K, y_used)
+        P_post = (np.eye(self.dim) - K @ self.H) @ self.P
+        self.P = np.where(keep[:, None, None], P_post, self.P)
+        return self.x, y
@@ -1,7 +1,25 @@
 from __future__ import annotations
 
+import cmath
 import math
-from typing import Iterable, List, Sequence, Tuple
+from array import array
+from functools import lru_cache
+from itertools import accumulate, compress, islice
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+DEMOD_METHODS = ("auto", "direct", "cumsum", "fft")
+
+# Arbitrary kernels up to this many multiply-adds stay on the direct path.
+_DIRECT_WORK_LIMIT = 1 << 15
+
+#: Reference phasors are recomputed exactly every this many samples.
+REFERENCE_RESYNC = 256
+#: Number of ``(n, ref_freq_hz, dt_s)`` reference tables kept in memory.
+REFERENCE_CACHE_SIZE = 32
+#: :class:`LockinDemodulator` consumes pushed chunks in blocks of this many samples.
+STREAM_BLOCK = 4096
+#: One-shot running sums restart every this many samples (or every window, if longer).
+PREFIX_BLOCK = 4096
 
 
 def _resolve_window(n: int, dt_s: float, window: int | None, window_s: float | None) -> int:
@@ -36,27 +54,471 @@ def _convolve_same(signal: Sequence[float], kernel: Sequence[float]) -> List[flo
     return output
 
 
+def _prefix_block(win: int) -> int:
+    return max(win, PREFIX_BLOCK)
+
+
+def _boxcar_from_prefix(prefix: Sequence[float], totals: Sequence[float], block: int, win: int, out) -> None:
+    """Fill ``out`` with same-mode boxcar means from block-local prefix sums.
+
+    ``prefix[k]`` is the sum from the start of block ``k // block`` up to
+    sample ``k`` and ``totals[b]`` is the sum of block ``b``. A window spans
+    at most two blocks because ``block >= win``, and every partial sum is
+    bounded by a block rather than the whole record, so large offsets do not
+    cancel away the precision of the window sums.
+    """
+
+    n = len(out)
+    half = win // 2
+    if not totals:
+        # Single (partial) block: plain prefix differences.
+        for i in range(n):
+            lo = min(max(i - half, 0), n)
+            hi = min(max(i - half + win, 0), n)
+            out[i] = (prefix[hi] - prefix[lo]) / win
+        return
+    for i in range(n):
+        lo = min(max(i - half, 0), n)
+        hi = min(max(i - half + win, 0), n)
+        b = lo // block
+        if hi // block == b:
+            out[i] = (prefix[hi] - prefix[lo]) / win
+        else:
+            out[i] = (totals[b] - prefix[lo] + prefix[hi]) / win
+
+
+def _boxcar_same(signal: Sequence[float], win: int) -> List[float]:
+    """Running-sum equivalent of ``_convolve_same(signal, [1/win] * win)``; O(n)."""
+
+    n = len(signal)
+    block = _prefix_block(win)
+    prefix = [0.0] * (n + 1)
+    totals: List[float] = []
+    for start in range(0, n, block):
+        acc = 0.0
+        stop = min(start + block, n)
+        for j in range(start, stop):
+            acc += signal[j]
+            prefix[j + 1] = acc
+        if stop - start == block:
+            totals.append(acc)
+            prefix[stop] = 0.0
+    output = [0.0] * n
+    _boxcar_from_prefix(prefix, totals, block, win, output)
+    return output
+
+
+def _fft(values: List[complex], invert: bool = False) -> None:
+    """In-place iterative radix-2 FFT; ``len(values)`` must be a power of two."""
+
+    n = len(values)
+    j = 0
+    for i in range(1, n):
+        bit = n >> 1
+        while j & bit:
+            j ^= bit
+            bit >>= 1
+        j |= bit
+        if i < j:
+            values[i], values[j] = values[j], values[i]
+    sign = 1.0 if invert else -1.0
+    table = [cmath.exp(sign * 2j * math.pi * k / n) for k in range(n // 2)]
+    size = 2
+    while size <= n:
+        half = size // 2
+        twiddles = table[:: n // size]
+        for start in range(0, n, size):
+            for k in range(half):
+                a = values[start + k]
+                b = values[start + k + half] * twiddles[k]
+                values[start + k] = a + b
+                values[start + k + half] = a - b
+        size <<= 1
+    if invert:
+        for i in range(n):
+            values[i] /= n
+
+
+def _convolve_same_fft(
+    signal_i: Sequence[float], signal_q: Sequence[float], kernel: Sequence[float]
+) -> Tuple[List[float], List[float]]:
+    """FFT version of ``_convolve_same`` applied to I and Q in a single pass.
+
+    I and Q are packed as ``I + jQ`` so one forward/inverse transform pair
+    serves both channels of the real-valued kernel.
+    """
+
+    n = len(signal_i)
+    m = len(kernel)
+    size = 1
+    while size < n + m - 1:
+        size <<= 1
+    packed = [complex(a, b) for a, b in zip(signal_i, signal_q)]
+    packed.extend([0j] * (size - n))
+    # "same" output is a correlation: convolve with the reversed kernel.
+    taps = [complex(k) for k in reversed(kernel)]
+    taps.extend([0j] * (size - m))
+    _fft(packed)
+    _fft(taps)
+    product = [a * b for a, b in zip(packed, taps)]
+    _fft(product, invert=True)
+    offset = m - 1 - m // 2
+    window = product[offset:offset + n]
+    return [v.real for v in window], [v.imag for v in window]
+
+
+def _choose_method(n: int, width: int, boxcar: bool) -> str:
+    if boxcar:
+        return "cumsum"
+    if n * width <= _DIRECT_WORK_LIMIT:
+        return "direct"
+    return "fft"
+
+
 def _elementwise_mul(a: Sequence[float], b: Sequence[float]) -> List[float]:
     return [x * y for x, y in zip(a, b)]
 
 
-def _demod_refs(n: int, ref_freq_hz: float, dt_s: float) -> Tuple[List[float], List[float]]:
-    t = [i * dt_s for i in range(n)]
-    refc = [math.cos(2.0 * math.pi * ref_freq_hz * ti) for ti in t]
-    refs = [math.sin(2.0 * math.pi * ref_freq_hz * ti) for ti in t]
+def _reference_span(ref_freq_hz: float, dt_s: float, start: int, stop: int) -> Tuple[array, array]:
+    """cos/sin reference samples for absolute indices ``[start, stop)``.
+
+    A rotating phasor advances one sample per complex multiply and is resynced
+    to exact ``math.cos``/``math.sin`` values every :data:`REFERENCE_RESYNC`
+    absolute indices, so rounding drift stays at a few ulps. A sample's value
+    depends only on its absolute index, never on where a span starts.
+    """
+
+    omega = 2.0 * math.pi * ref_freq_hz
+    step_c = math.cos(omega * dt_s)
+    step_s = math.sin(omega * dt_s)
+    refc = array("d")
+    refs = array("d")
+    block = start - start % REFERENCE_RESYNC
+    while block < stop:
+        ti = block * dt_s
+        c = math.cos(omega * ti)
+        s = math.sin(omega * ti)
+        end = min(block + REFERENCE_RESYNC, stop)
+        for k in range(block, end):
+            if k >= start:
+                refc.append(c)
+                refs.append(s)
+            c, s = c * step_c - s * step_s, s * step_c + c * step_s
+        block += REFERENCE_RESYNC
     return refc, refs
 
 
-def lockin_demod(signal: Iterable[float], ref_freq_hz, dt_s, *, window: int | None = None, window_s: float | None = 0.01):
-    """Boxcar low-pass of I/Q demod with a configurable averaging window."""
+@lru_cache(maxsize=REFERENCE_CACHE_SIZE)
+def _demod_refs(n: int, ref_freq_hz: float, dt_s: float) -> Tuple[memoryview, memoryview]:
+    """Memoized read-only reference tables shared by every call with these parameters."""
+
+    refc, refs = _reference_span(ref_freq_hz, dt_s, 0, n)
+    return memoryview(refc).toreadonly(), memoryview(refs).toreadonly()
+
+
+def clear_reference_cache() -> None:
+    """Drop all cached demodulation reference tables."""
+
+    _demod_refs.cache_clear()
+
+
+def lockin_demod(
+    signal: Iterable[float],
+    ref_freq_hz,
+    dt_s,
+    *,
+    window: int | None = None,
+    window_s: float | None = 0.01,
+    kernel: Optional[Sequence[float]] = None,
+    method: str = "auto",
+):
+    """Low-pass of I/Q demod with a configurable averaging window.
 
+    By default the low-pass is a boxcar of ``window`` samples (or
+    ``window_s`` seconds); pass ``kernel`` to use arbitrary FIR taps instead.
+    ``method`` selects the filter back end, all with the same "same"-mode
+    edge handling:
+
+    - ``"direct"``: nested-loop convolution, O(n * window).
+    - ``"cumsum"``: running-sum boxcar, O(n) for any window (boxcar only);
+      the sums restart every :data:`PREFIX_BLOCK` samples so long records
+      with a large DC component keep their precision.
+    - ``"fft"``: FFT convolution, O(n log n) for any kernel.
+    - ``"auto"``: ``"cumsum"`` for boxcars, otherwise ``"direct"`` for short
+      kernels and ``"fft"`` for long ones.
+    """
+
+    if method not in DEMOD_METHODS:
+        raise ValueError(f"method must be one of {DEMOD_METHODS}")
     data = list(signal)
     n = len(data)
     refc, refs = _demod_refs(n, ref_freq_hz, dt_s)
     i_raw = _elementwise_mul(data, refc)
     q_raw = _elementwise_mul(data, refs)
+    if kernel is not None:
+        taps = [float(k) for k in kernel]
+        if not taps:
+            raise ValueError("kernel must contain at least one tap")
+        if method == "cumsum":
+            raise ValueError("the cumsum back end only supports boxcar windows")
+        width = len(taps)
+    else:
+        win = _resolve_window(n, dt_s, window, window_s)
+        width = win
+    if method == "auto":
+        method = _choose_method(n, width, kernel is None)
+
+    if method == "cumsum":
+        return _boxcar_same(i_raw, win), _boxcar_same(q_raw, win)
+    if kernel is None:
+        taps = [1.0 / win] * win
+    if method == "fft":
+        if n == 0:
+            return [], []
+        return _convolve_same_fft(i_raw, q_raw, taps)
+    return _convolve_same(i_raw, taps), _convolve_same(q_raw, taps)
+
+
+def lockin_gated(
+    signal: Sequence[float],
+    ref_freq_hz,
+    dt_s,
+    mask: Sequence[bool],
+    *,
+    window: int | None = None,
+    window_s: float | None = 0.01,
+) -> Tuple[array, array, float, float]:
+    """Boxcar lock-in of the gated ``signal`` plus the masked output means.
+
+    Samples where ``mask`` is false or the value is NaN count as zero. Gating,
+    reference mixing and the running sums happen in one pass, and the filtered
+    outputs are written into preallocated ``array('d')`` buffers, so a call
+    allocates four n-length buffers regardless of the window. Returns
+    ``(i_lp, q_lp, i_mean, q_mean)``; the outputs equal
+    ``lockin_demod(gated, ..., method="cumsum")`` and the means equal
+    ``statistics.fmean`` of the outputs over ``mask`` (``0.0`` for an empty mask).
+    """
+
+    n = len(signal)
     win = _resolve_window(n, dt_s, window, window_s)
-    kernel = [1.0 / win] * win
-    i_lp = _convolve_same(i_raw, kernel)
-    q_lp = _convolve_same(q_raw, kernel)
-    return i_lp, q_lp
+    block = _prefix_block(win)
+    refc, refs = _demod_refs(n, ref_freq_hz, dt_s)
+    prefix_i = array("d", [0.0]) * (n + 1)
+    prefix_q = array("d", [0.0]) * (n + 1)
+    totals_i = array("d")
+    totals_q = array("d")
+    for start in range(0, n, block):
+        acc_i = 0.0
+        acc_q = 0.0
+        stop = min(start + block, n)
+        for j in range(start, stop):
+            value = signal[j]
+            # Zero inputs leave the running sums unchanged, so gated samples are skipped.
+            if mask[j] and value == value:
+                acc_i += value * refc[j]
+                acc_q += value * refs[j]
+            prefix_i[j + 1] = acc_i
+            prefix_q[j + 1] = acc_q
+        if stop - start == block:
+            totals_i.append(acc_i)
+            totals_q.append(acc_q)
+            prefix_i[stop] = 0.0
+            prefix_q[stop] = 0.0
+    i_lp = array("d", [0.0]) * n
+    q_lp = array("d", [0.0]) * n
+    _boxcar_from_prefix(prefix_i, totals_i, block, win, i_lp)
+    _boxcar_from_prefix(prefix_q, totals_q, block, win, q_lp)
+    total = sum(1 for flag in mask if flag)
+    if not total:
+        return i_lp, q_lp, 0.0, 0.0
+    return i_lp, q_lp, math.fsum(compress(i_lp, mask)) / total, math.fsum(compress(q_lp, mask)) / total
+
+
+def lockin_masked_mean(
+    signal: Sequence[float],
+    ref_freq_hz,
+    dt_s,
+    mask: Sequence[bool],
+    *,
+    window: int | None = None,
+    window_s: float | None = 0.01,
+    gated: bool = False,
+) -> Tuple[float, float]:
+    """Mean of the boxcar-filtered I/Q over ``mask`` without filtering the vector.
+
+    Equivalent to averaging ``lockin_demod(signal, ...)`` outputs at the
+    masked positions, but each input sample is weighted by the number of
+    masked outputs its window reaches, so only samples near the mask are
+    visited and no full-length filtered vectors are built. With
+    ``gated=True`` samples outside ``mask`` or NaN count as zero, as in
+    :func:`lockin_gated`.
+    """
+
+    n = len(signal)
+    win = _resolve_window(n, dt_s, window, window_s)
+    half = win // 2
+    counts = list(accumulate((1 if flag else 0 for flag in mask), initial=0))
+    total = counts[-1]
+    if total == 0:
+        return 0.0, 0.0
+    first = next(i for i, flag in enumerate(mask) if flag)
+    last = n - 1 - next(i for i, flag in enumerate(reversed(mask)) if flag)
+    refc, refs = _demod_refs(n, ref_freq_hz, dt_s)
+    acc_i = 0.0
+    acc_q = 0.0
+    # Output i averages inputs [i - half, i - half + win), so input j reaches
+    # outputs (j + half - win, j + half].
+    for j in range(max(0, first - (win - half - 1)), min(n, last + half + 1)):
+        value = signal[j]
+        if value == 0.0 or (gated and not (mask[j] and value == value)):
+            continue
+        weight = counts[min(j + half + 1, n)] - counts[max(j + half - win + 1, 0)]
+        if weight:
+            acc_i += weight * value * refc[j]
+            acc_q += weight * value * refs[j]
+    scale = 1.0 / (win * total)
+    return acc_i * scale, acc_q * scale
+
+
+class LockinDemodulator:
+    """Streaming lock-in demodulator with a boxcar low-pass.
+
+    Feed probe samples with :meth:`push` in chunks of any size; each call
+    returns the I/Q outputs that became final. The reference phase advances
+    continuously across chunks, and the filter keeps only the running sums that
+    a few blocks of outputs still need, so memory stays bounded for
+    arbitrarily long acquisitions.
+    Call :meth:`flush` once the acquisition ends to release the trailing
+    ``latency_samples`` outputs. The concatenated outputs equal
+    ``lockin_demod(full_signal, ...)`` with the same window to rounding. The
+    running sums live in ``array('d')`` buffers that are periodically trimmed
+    and re-anchored, so each sample costs O(1) however the stream is chunked
+    and precision does not degrade with the stream length.
+
+    The window must not depend on the total length, so either ``window`` or
+    ``window_s`` together with a positive ``dt_s`` is required.
+    """
+
+    def __init__(self, ref_freq_hz, dt_s, *, window: int | None = None, window_s: float | None = 0.01):
+        if window is None and (window_s is None or dt_s <= 0):
+            raise ValueError("streaming demodulation needs window or window_s with positive dt_s")
+        self.ref_freq_hz = ref_freq_hz
+        self.dt_s = dt_s
+        self.window = _resolve_window(0, dt_s, window, window_s)
+        omega = 2.0 * math.pi * ref_freq_hz
+        self._step = (math.cos(omega * dt_s), math.sin(omega * dt_s))
+        self.reset()
+
+    @property
+    def latency_samples(self) -> int:
+        """Number of pushed samples whose outputs wait for future input."""
+
+        return self.window - self.window // 2 - 1
+
+    @property
+    def samples_in(self) -> int:
+        return self._received
+
+    @property
+    def samples_out(self) -> int:
+        return self._next_out
+
+    def reset(self) -> None:
+        """Start a new acquisition at reference phase zero."""
+
+        self._received = 0
+        self._next_out = 0
+        self._phasor = (1.0, 0.0)
+        self._acc_i = 0.0
+        self._acc_q = 0.0
+        # _prefix_i[k] is P[_prefix_base + k] - P[_prefix_base]; P[0] = 0.
+        self._prefix_base = 0
+        self._prefix_i = array("d", [0.0])
+        self._prefix_q = array("d", [0.0])
+        self._closed = False
+
+    def push(self, chunk: Iterable[float]) -> Tuple[List[float], List[float]]:
+        """Consume ``chunk`` and return the I/Q outputs finalized by it."""
+
+        if self._closed:
+            raise RuntimeError("demodulator was flushed; call reset() to start a new acquisition")
+        half = self.window // 2
+        i_out: List[float] = []
+        q_out: List[float] = []
+        values = iter(chunk)
+        # Large chunks are consumed in blocks so the retained running sums
+        # stay bounded and re-anchored however much arrives in one call.
+        while True:
+            block = list(islice(values, STREAM_BLOCK))
+            if not block:
+                break
+            self._accumulate(block)
+            i_part, q_part = self._emit(self._received - self.window + half + 1)
+            i_out.extend(i_part)
+            q_out.extend(q_part)
+        return i_out, q_out
+
+    def flush(self) -> Tuple[List[float], List[float]]:
+        """Return all outputs still pending and close the acquisition."""
+
+        out = self._emit(self._received)
+        self._closed = True
+        return out
+
+    def _accumulate(self, block: List[float]) -> None:
+        # Same phasor recurrence as _reference_span, carried across chunks.
+        omega = 2.0 * math.pi * self.ref_freq_hz
+        step_c, step_s = self._step
+        dt_s = self.dt_s
+        c, s = self._phasor
+        k = self._received
+        acc_i = self._acc_i
+        acc_q = self._acc_q
+        append_i = self._prefix_i.append
+        append_q = self._prefix_q.append
+        for value in block:
+            if k % REFERENCE_RESYNC == 0:
+                ti = k * dt_s
+                c = math.cos(omega * ti)
+                s = math.sin(omega * ti)
+            acc_i += value * c
+            acc_q += value * s
+            append_i(acc_i)
+            append_q(acc_q)
+            c, s = c * step_c - s * step_s, s * step_c + c * step_s
+            k += 1
+        self._phasor = (c, s)
+        self._received = k
+        self._acc_i = acc_i
+        self._acc_q = acc_q
+
+    def _emit(self, stop: int) -> Tuple[List[float], List[float]]:
+        win = self.window
+        half = win // 2
+        n = self._received
+        base = self._prefix_base
+        prefix_i = self._prefix_i
+        prefix_q = self._prefix_q
+        i_out: List[float] = []
+        q_out: List[float] = []
+        for i in range(self._next_out, min(stop, n)):
+            lo = min(max(i - half, 0), n) - base
+            hi = min(max(i - half + win, 0), n) - base
+            i_out.append((prefix_i[hi] - prefix_i[lo]) / win)
+            q_out.append((prefix_q[hi] - prefix_q[lo]) / win)
+            self._next_out = i + 1
+        # Once at least as many sums are unreachable by later outputs as are
+        # still needed, drop them and re-anchor the rest at the oldest kept
+        # one. The sums then span a few blocks instead of the whole stream,
+        # where the differences above would cancel catastrophically, and the
+        # copy costs O(1) per sample amortized.
+        drop = max(self._next_out - half, 0) - base
+        if drop >= len(prefix_i) - drop:
+            off_i = prefix_i[drop]
+            off_q = prefix_q[drop]
+            self._prefix_i = array("d", [p - off_i for p in prefix_i[drop:]])
+            self._prefix_q = array("d", [p - off_q for p in prefix_q[drop:]])
+            self._acc_i -= off_i
+            self._acc_q -= off_q
+            self._prefix_base = base + drop
+        return i_out, q_out
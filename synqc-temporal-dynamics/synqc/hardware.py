@@ -1,4 +1,7 @@
 
+HARDWARE_FAMILIES = ("superconducting", "ion_trap", "neutral_atom", "photonic")
+
+
 class HardwareSignature:
     """Coarse hardware traits that affect DPD dynamics."""
     def __init__(self, family="superconducting", anharm=-2.0e6, base_freq=5.0e9,
@@ -25,3 +28,10 @@ class HardwareSignature:
     @classmethod
     def photonic(cls):
         return cls("photonic", anharm=-1e12, base_freq=2.0e14, t1=1e-3, t2=5e-4, probe_latency=5e-9)
+
+    @classmethod
+    def from_family(cls, family):
+        """Return the preset profile for a family name in ``HARDWARE_FAMILIES``."""
+        if family not in HARDWARE_FAMILIES:
+            raise ValueError(f"unknown hardware family {family!r}; expected one of {HARDWARE_FAMILIES}")
+        return getattr(cls, family)()
@@ -0,0 +1,163 @@
+"""Observer hooks for :func:`synqc.scheduler.run_dpd_sequence`.
+
+Observers come in two flavours. Post-hoc observers (the default) declare the
+sample ``stride`` they need and receive the recorded
+:class:`~synqc.scheduler.StateHistory` once the timeline is built, so the
+evolution loop pays nothing for them beyond keeping that history. Streaming
+observers set ``streaming = True`` and have :meth:`Observer.on_state` called
+from inside the loop for every ``stride``-th sample.
+"""
+
+from __future__ import annotations
+
+import math
+import warnings
+from dataclasses import dataclass
+from time import perf_counter
+from typing import TYPE_CHECKING, Dict, Optional, Sequence, Tuple
+
+from .probes import get_default_rng
+from .rng import RNG
+
+if TYPE_CHECKING:  # pragma: no cover - typing only
+    from .scheduler import StateHistory
+
+
+@dataclass(frozen=True)
+class RealTimeProfile:
+    """Profiling metadata and optimization trace for real-time capture."""
+
+    total_samples: int
+    expectation_time_s: float
+    noisy_time_s: float
+    kernel: str = "bulk"
+    avg_expectation_per_sample_s: float = 0.0
+    avg_noisy_per_sample_s: float = 0.0
+    optimizations: Tuple[str, ...] = ()
+
+
+@dataclass(frozen=True)
+class RealTimeObservations:
+    """Container for per-sample qubit observables captured during a DPD run."""
+
+    indices: Tuple[int, ...]
+    expectation: Dict[str, Tuple[float, ...]]
+    noisy: Optional[Dict[str, Tuple[float, ...]]] = None
+    profile: Optional[RealTimeProfile] = None
+
+
+class Observer:
+    """Base class for DPD observers; every hook is a no-op by default."""
+
+    #: Sample stride the observer needs (``1`` = every sample).
+    stride: int = 1
+    #: ``True`` to receive :meth:`on_state` calls during the evolution loop.
+    streaming: bool = False
+
+    def start(self, n_samples: int, dt_s: float) -> None:
+        """Called once before evolution with the timeline length and step."""
+
+    def on_state(self, index: int, state: Tuple[float, float, float]) -> None:
+        """Streaming hook: the state after timeline sample ``index``."""
+
+    def finish(self, history: "StateHistory") -> None:
+        """Called once after evolution with a history whose stride divides ``stride``."""
+
+
+def _warn_optimize_ignored(**options) -> None:
+    """Warn about deprecated real-time optimizer options that were passed."""
+
+    passed = [name for name, value in options.items() if value is not None]
+    if passed:
+        warnings.warn(
+            f"deprecated real-time optimizer options are ignored ({', '.join(passed)}); "
+            "expectations are always sliced in bulk from the history",
+            DeprecationWarning,
+            stacklevel=3,
+        )
+
+
+def _column(history: "StateHistory", axis: str):
+    if axis == "x":
+        return history.x
+    if axis == "y":
+        return history.y
+    return history.z
+
+
+class RealTimeObserver(Observer):
+    """Extract per-axis expectations (and optional noisy readouts) post hoc.
+
+    Expectations are strided slices of the recorded history columns. Noisy
+    readouts add one bulk draw of ``len(indices) * len(axes)`` Gaussian
+    samples, consumed sample-major and axis-minor, i.e. in the order per-sample
+    :func:`synqc.probes.probe` calls would consume them. With ``profile=True``
+    the column slicing and the noisy draw are timed. The result is available
+    as :attr:`result` after the run.
+
+    ``optimize``, ``optimize_threshold`` and ``optimize_warmup`` are
+    deprecated and ignored; passing any of them emits a
+    :class:`DeprecationWarning`.
+    """
+
+    def __init__(
+        self,
+        axes: Sequence[str],
+        *,
+        stride: int = 1,
+        shots: int = 0,
+        meas_noise: float = 0.0,
+        rng: Optional[RNG] = None,
+        profile: bool = False,
+        optimize: Optional[bool] = None,
+        optimize_threshold: Optional[float] = None,
+        optimize_warmup: Optional[int] = None,
+    ):
+        _warn_optimize_ignored(
+            optimize=optimize, optimize_threshold=optimize_threshold, optimize_warmup=optimize_warmup
+        )
+        self.axes = tuple(dict.fromkeys(axes))
+        self.stride = max(1, int(stride))
+        self.shots = shots
+        self.meas_noise = meas_noise
+        self.rng = rng
+        self.profile = profile
+        self.result: Optional[RealTimeObservations] = None
+
+    def finish(self, history: "StateHistory") -> None:
+        step = self.stride // history.stride
+        count = len(range(0, len(history), step))
+        t0 = perf_counter()
+        expectation = {axis: _column(history, axis)[::step] for axis in self.axes}
+        expectation_time = perf_counter() - t0
+
+        noisy = None
+        noisy_time = 0.0
+        if self.shots > 0:
+            noisy_start = perf_counter()
+            generator = self.rng if self.rng is not None else get_default_rng()
+            sigma = self.meas_noise / math.sqrt(max(1, self.shots))
+            naxes = len(self.axes)
+            draws = generator.normal(0.0, sigma, size=count * naxes)
+            noisy = {
+                axis: tuple(e + d for e, d in zip(expectation[axis], draws[j::naxes]))
+                for j, axis in enumerate(self.axes)
+            }
+            noisy_time = perf_counter() - noisy_start
+
+        profile = None
+        if self.profile:
+            profile = RealTimeProfile(
+                total_samples=count,
+                expectation_time_s=expectation_time,
+                noisy_time_s=noisy_time,
+                avg_expectation_per_sample_s=expectation_time / count if count else 0.0,
+                avg_noisy_per_sample_s=noisy_time / count if count else 0.0,
+                optimizations=("bulk-axis",) if len(self.axes) > 1 else (),
+            )
+        self.result = RealTimeObservations(
+            indices=tuple(range(0, count * self.stride, self.stride)),
+            expectation={axis: tuple(values) for axis, values in expectation.items()},
+            noisy=noisy,
+            profile=profile,
+        )
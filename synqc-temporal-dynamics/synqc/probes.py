@@ -1,13 +1,59 @@
 from __future__ import annotations
 
 import math
-from typing import Optional
+import operator
+from array import array
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Callable, Optional, Sequence, Tuple, Union
 
-from .mathkern import bloch_update, t1_t2_relax, measurement_signal
+from .mathkern import (
+    AffineOp,
+    affine_distance,
+    apply_affine,
+    bloch_exact_operator,
+    bloch_step_operator,
+    bloch_update,
+    compose_affine_sequence,
+    magnus4_operator,
+    measurement_signal,
+    power_affine,
+    rotation_operator,
+    t1_t2_relax,
+)
 from .rng import RNG, default_rng
 
 _DEFAULT_RNG: RNG = default_rng()
 
+PROPAGATOR_CACHE_SIZE = 256
+ENVELOPE_CACHE_SIZE = 64
+ENVELOPE_METHODS = ("piecewise", "magnus")
+DRIVE_METHODS = ("split", "exact")
+
+_GAUSS_OFFSET = math.sqrt(3.0) / 6.0
+
+#: Default absolute Bloch-vector tolerance for ``substeps="auto"``.
+DRIVE_ATOL = 1e-6
+#: Upper bound on the sub-step count chosen by ``substeps="auto"``.
+MAX_SUBSTEPS = 4096
+
+
+@dataclass(frozen=True)
+class SubstepStats:
+    """Outcome of an adaptive sub-step selection.
+
+    ``error_estimate`` bounds the Bloch-vector error of the chosen split-step
+    propagator over the whole span; ``evaluations`` counts the candidate
+    propagators built and ``converged`` is ``False`` when ``max_substeps``
+    was reached before meeting ``atol``.
+    """
+
+    substeps: int
+    error_estimate: float
+    atol: float
+    evaluations: int
+    converged: bool
+
 
 def seed_default_rng(seed: Optional[int] = None) -> RNG:
     """Seed and return the module-level default RNG used by :func:`probe`."""
@@ -33,11 +79,41 @@ def get_default_rng() -> RNG:
     return _DEFAULT_RNG
 
 
-def drive(state, detuning_hz, omega_hz, duration_s, hw, substeps: int = 1):
-    """Integrate a constant drive segment, optionally with sub-stepping."""
+def drive(
+    state,
+    detuning_hz,
+    omega_hz,
+    duration_s,
+    hw,
+    substeps: Union[int, str] = 1,
+    *,
+    method: str = "split",
+    atol: float = DRIVE_ATOL,
+    return_stats: bool = False,
+):
+    """Integrate a constant drive segment, optionally with sub-stepping.
+
+    ``method="split"`` rotates and then relaxes each of ``substeps`` steps.
+    ``method="exact"`` solves the joint Bloch equations in one step of any
+    length (:func:`synqc.mathkern.bloch_exact_operator`) and ignores
+    ``substeps``. ``substeps="auto"`` picks the split-step count with
+    :func:`adaptive_substeps` so the error stays within ``atol``;
+    ``return_stats=True`` returns ``(state, SubstepStats)`` instead of the
+    state alone.
+    """
 
-    if substeps < 1:
-        raise ValueError("substeps must be >= 1")
+    _check_method(method)
+    if method == "exact":
+        op = bloch_exact_operator(2.0 * math.pi * detuning_hz, 2.0 * math.pi * omega_hz, duration_s, hw.t1, hw.t2)
+        state = apply_affine(op, state)
+        return (state, SubstepStats(1, 0.0, atol, 1, True)) if return_stats else state
+
+    stats = None
+    if substeps == "auto":
+        stats = adaptive_substeps(detuning_hz, omega_hz, duration_s, hw, atol=atol)
+        substeps = stats.substeps
+    else:
+        substeps = _check_substeps(substeps)
 
     det = 2.0 * math.pi * detuning_hz
     omg = 2.0 * math.pi * omega_hz
@@ -46,9 +122,289 @@ def drive(state, detuning_hz, omega_hz, duration_s, hw, substeps: int = 1):
     for _ in range(substeps):
         x, y, z = bloch_update((x, y, z), det, omg, sub_dt)
         x, y, z = t1_t2_relax((x, y, z), sub_dt, hw.t1, hw.t2)
+    if return_stats:
+        if stats is None:
+            stats = SubstepStats(substeps, math.nan, math.nan, 0, True)
+        return (x, y, z), stats
     return (x, y, z)
 
 
+def _check_method(method: str) -> None:
+    if method not in DRIVE_METHODS:
+        raise ValueError(f"method must be one of {DRIVE_METHODS}")
+
+
+def _check_substeps(substeps) -> int:
+    """Return ``substeps`` as an ``int``; integer-like values (e.g. NumPy ints) pass, bools do not."""
+
+    if not isinstance(substeps, bool):
+        try:
+            count = operator.index(substeps)
+        except TypeError:
+            pass
+        else:
+            if count >= 1:
+                return count
+    raise ValueError("substeps must be a positive int or 'auto'")
+
+
+def _build_propagator(detuning_hz, omega_hz, dt_s, t1, t2, substeps, method="split") -> AffineOp:
+    if method == "exact":
+        return bloch_exact_operator(2.0 * math.pi * detuning_hz, 2.0 * math.pi * omega_hz, dt_s, t1, t2)
+    sub_dt = dt_s / substeps if substeps > 1 else dt_s
+    step = bloch_step_operator(2.0 * math.pi * detuning_hz, 2.0 * math.pi * omega_hz, sub_dt, t1, t2)
+    return power_affine(step, substeps) if substeps > 1 else step
+
+
+_drive_propagator = lru_cache(maxsize=PROPAGATOR_CACHE_SIZE)(_build_propagator)
+
+
+@lru_cache(maxsize=PROPAGATOR_CACHE_SIZE)
+def _drive_jump(detuning_hz, omega_hz, dt_s, t1, t2, substeps, steps, method="split") -> AffineOp:
+    return power_affine(_drive_propagator(detuning_hz, omega_hz, dt_s, t1, t2, substeps, method), steps)
+
+
+@lru_cache(maxsize=PROPAGATOR_CACHE_SIZE)
+def _adaptive_substeps(detuning_hz, omega_hz, dt_s, t1, t2, steps, atol, max_substeps) -> SubstepStats:
+    # Candidates are built uncached so a search does not evict the step
+    # propagators that runs actually reuse; only the outcome is memoized.
+    exact = power_affine(_build_propagator(detuning_hz, omega_hz, dt_s, t1, t2, 1, "exact"), steps)
+    substeps = 1
+    evaluations = 1
+    while True:
+        split = power_affine(_build_propagator(detuning_hz, omega_hz, dt_s, t1, t2, substeps), steps)
+        evaluations += 1
+        error = affine_distance(split, exact)
+        if error <= atol:
+            return SubstepStats(substeps, error, atol, evaluations, True)
+        if 2 * substeps > max_substeps:
+            return SubstepStats(substeps, error, atol, evaluations, False)
+        substeps *= 2
+
+
+def adaptive_substeps(
+    detuning_hz,
+    omega_hz,
+    dt_s,
+    hw,
+    *,
+    steps: int = 1,
+    atol: float = DRIVE_ATOL,
+    max_substeps: int = MAX_SUBSTEPS,
+) -> SubstepStats:
+    """Pick the smallest power-of-two split-step sub-step count meeting ``atol``.
+
+    The segment propagator of ``steps`` consecutive drive steps of ``dt_s``
+    with ``n`` sub-steps is compared against the exact joint solution
+    (``method="exact"``), so ``error_estimate`` is the actual worst-case
+    Bloch-vector error of the split result. Long-coherence profiles (ion
+    traps) settle on a single sub-step; fast, strongly relaxing drives get
+    more. Only the resulting statistics are memoized; the candidate
+    propagators bypass the shared propagator cache.
+    """
+
+    if atol <= 0:
+        raise ValueError("atol must be > 0")
+    if max_substeps < 1:
+        raise ValueError("max_substeps must be >= 1")
+    return _adaptive_substeps(
+        detuning_hz, omega_hz, dt_s, hw.t1, hw.t2, max(1, int(steps)), atol, max_substeps
+    )
+
+
+def drive_propagator(detuning_hz, omega_hz, dt_s, hw, substeps: int = 1, *, method: str = "split") -> AffineOp:
+    """Return the cached affine map for one :func:`drive` step of ``dt_s``.
+
+    Maps are memoized by ``(detuning, omega, dt, t1, t2, substeps, method)``
+    in a process-wide LRU cache of :data:`PROPAGATOR_CACHE_SIZE` entries, so
+    tracking loops that revisit the same segment parameters reuse them.
+    """
+
+    _check_method(method)
+    if method == "exact":
+        substeps = 1
+    else:
+        substeps = _check_substeps(substeps)
+    return _drive_propagator(detuning_hz, omega_hz, dt_s, hw.t1, hw.t2, substeps, method)
+
+
+def drive_segment(
+    state,
+    detuning_hz,
+    omega_hz,
+    dt_s,
+    steps: int,
+    hw,
+    substeps: Union[int, str] = 1,
+    *,
+    method: str = "split",
+    atol: float = DRIVE_ATOL,
+    on_step: Optional[Callable[[Tuple[float, float, float]], None]] = None,
+    return_stats: bool = False,
+):
+    """Advance ``state`` through ``steps`` constant drive steps of ``dt_s``.
+
+    Each step applies the cached :func:`drive_propagator`. When ``on_step`` is
+    given it receives the state after every step; otherwise the segment is
+    fast-forwarded with O(log steps) operator squarings. ``substeps="auto"``
+    sizes the sub-steps so the whole segment stays within ``atol`` (see
+    :func:`adaptive_substeps`); ``method="exact"`` needs no sub-steps at all,
+    so ``dt_s`` can be as coarse as the recording resolution allows.
+    ``return_stats=True`` returns ``(state, SubstepStats)`` as :func:`drive`
+    does, with ``None`` stats for an empty segment.
+    """
+
+    _check_method(method)
+    if steps <= 0:
+        return (tuple(state), None) if return_stats else tuple(state)
+    if method == "exact":
+        substeps = 1
+        stats = SubstepStats(1, 0.0, atol, 1, True)
+    elif substeps == "auto":
+        stats = adaptive_substeps(detuning_hz, omega_hz, dt_s, hw, steps=steps, atol=atol)
+        substeps = stats.substeps
+    else:
+        substeps = _check_substeps(substeps)
+        stats = SubstepStats(substeps, math.nan, math.nan, 0, True)
+    if on_step is None:
+        op = _drive_jump(detuning_hz, omega_hz, dt_s, hw.t1, hw.t2, substeps, steps, method)
+        state = apply_affine(op, state)
+    else:
+        op = drive_propagator(detuning_hz, omega_hz, dt_s, hw, substeps, method=method)
+        for _ in range(steps):
+            state = apply_affine(op, state)
+            on_step(state)
+    return (state, stats) if return_stats else state
+
+
+def _envelope_column(values, n: int, name: str) -> Tuple[float, ...]:
+    if values is None:
+        return (0.0,) * n
+    if isinstance(values, (int, float)):
+        return (float(values),) * n
+    column = tuple(float(v) for v in values)
+    if len(column) != n:
+        raise ValueError(f"{name} must be a scalar or have the same length as omega_hz")
+    return column
+
+
+@lru_cache(maxsize=ENVELOPE_CACHE_SIZE)
+def _envelope_ops(omega_i, omega_q, detuning, dt_s, t1, t2, method) -> Tuple[Tuple[AffineOp, ...], AffineOp]:
+    two_pi = 2.0 * math.pi
+    if method == "piecewise":
+        ops = tuple(
+            rotation_operator(two_pi * wi, two_pi * wq, two_pi * det, dt_s, t1, t2)
+            for wi, wq, det in zip(omega_i, omega_q, detuning)
+        )
+    else:
+        edges = [(two_pi * wi, two_pi * wq, two_pi * det) for wi, wq, det in zip(omega_i, omega_q, detuning)]
+        ops = tuple(
+            magnus4_operator(*_gauss_node_values(edges, k), dt_s, t1, t2) for k in range(len(edges) - 1)
+        )
+    return ops, compose_affine_sequence(ops)
+
+
+def _lagrange_weights(size: int, x: float) -> Tuple[float, ...]:
+    weights = []
+    for i in range(size):
+        w = 1.0
+        for j in range(size):
+            if j != i:
+                w *= (x - j) / (i - j)
+        weights.append(w)
+    return tuple(weights)
+
+
+def _gauss_node_values(edges, k: int):
+    """Cubic (or lower, for short pulses) interpolation of step ``k``'s Gauss nodes."""
+
+    size = min(4, len(edges))
+    lo = min(max(k - 1, 0), len(edges) - size)
+    stencil = edges[lo:lo + size]
+    nodes = []
+    for offset in (-_GAUSS_OFFSET, _GAUSS_OFFSET):
+        weights = _lagrange_weights(size, k + 0.5 + offset - lo)
+        nodes.append(tuple(sum(w * p[axis] for w, p in zip(weights, stencil)) for axis in range(3)))
+    return nodes
+
+
+def envelope_propagators(
+    omega_hz: Sequence[float],
+    dt_s,
+    hw,
+    *,
+    detuning_hz: Union[float, Sequence[float]] = 0.0,
+    quadrature_hz: Optional[Sequence[float]] = None,
+    method: str = "piecewise",
+) -> Tuple[Tuple[AffineOp, ...], AffineOp]:
+    """Return the per-step maps of a shaped drive and their composition.
+
+    ``method="piecewise"`` holds sample ``k`` of the envelope constant over
+    step ``k`` (``len(omega_hz)`` steps). ``method="magnus"`` treats the
+    samples as values at step edges (``len(omega_hz) - 1`` steps), recovers
+    each step's Gauss–Legendre node values by cubic interpolation and takes a
+    fourth-order Magnus step, so smooth pulses reach the same accuracy with a
+    several times coarser ``dt_s``. ``quadrature_hz`` is the out-of-phase
+    (``y``) drive component, e.g. a DRAG correction; ``detuning_hz`` is a
+    constant or a per-sample array. Results are memoized by envelope content
+    in an LRU cache of :data:`ENVELOPE_CACHE_SIZE` entries.
+    """
+
+    if method not in ENVELOPE_METHODS:
+        raise ValueError(f"method must be one of {ENVELOPE_METHODS}")
+    omega_i = tuple(float(v) for v in omega_hz)
+    n = len(omega_i)
+    return _envelope_ops(
+        omega_i,
+        _envelope_column(quadrature_hz, n, "quadrature_hz"),
+        _envelope_column(detuning_hz, n, "detuning_hz"),
+        dt_s,
+        hw.t1,
+        hw.t2,
+        method,
+    )
+
+
+def drive_envelope(
+    state,
+    omega_hz: Sequence[float],
+    dt_s,
+    hw,
+    *,
+    detuning_hz: Union[float, Sequence[float]] = 0.0,
+    quadrature_hz: Optional[Sequence[float]] = None,
+    method: str = "piecewise",
+    on_step: Optional[Callable[[Tuple[float, float, float]], None]] = None,
+):
+    """Advance ``state`` through a shaped drive envelope.
+
+    See :func:`envelope_propagators` for the envelope conventions. Without
+    ``on_step`` the whole pulse is applied as one composed affine map;
+    otherwise the per-step maps are applied in turn and ``on_step`` receives
+    the state after each.
+    """
+
+    ops, total = envelope_propagators(
+        omega_hz, dt_s, hw, detuning_hz=detuning_hz, quadrature_hz=quadrature_hz, method=method
+    )
+    if on_step is None:
+        return apply_affine(total, state)
+    state = tuple(state)
+    for op in ops:
+        state = apply_affine(op, state)
+        on_step(state)
+    return state
+
+
+def clear_propagator_cache() -> None:
+    """Drop all cached drive propagators."""
+
+    _drive_propagator.cache_clear()
+    _drive_jump.cache_clear()
+    _adaptive_substeps.cache_clear()
+    _envelope_ops.cache_clear()
+
+
 def probe(
     state,
     axis="z",
@@ -69,15 +425,17 @@ def probe(
 
 
 def add_readout_latency(samples, latency_s, dt_s):
-    """Shift samples by integer bins of latency; preserve length."""
+    """Shift samples by integer bins of latency; preserve length.
+
+    ``array`` inputs return an ``array`` of the same typecode, anything else a list.
+    """
 
     n = len(samples)
     bins = int(round(latency_s / dt_s))
+    out = samples[:] if isinstance(samples, array) else list(samples)
     if bins <= 0 or bins >= n:
-        return list(samples)
-    out = list(samples)
+        return out
+    out[bins:] = samples[: n - bins]
     for i in range(bins):
         out[i] = 0.0
-    for i in range(bins, n):
-        out[i] = samples[i - bins]
     return out
@@ -0,0 +1,63 @@
+"""Sampled pulse envelopes for :func:`synqc.probes.drive_envelope`."""
+
+from __future__ import annotations
+
+import math
+from typing import List, Optional, Tuple
+
+
+def _sample_times(duration_s: float, dt_s: float, edges: bool) -> List[float]:
+    if dt_s <= 0:
+        raise ValueError("dt_s must be positive")
+    steps = max(1, math.ceil(duration_s / dt_s - 1e-9))
+    if edges:
+        return [k * dt_s for k in range(steps + 1)]
+    return [(k + 0.5) * dt_s for k in range(steps)]
+
+
+def gaussian_envelope(
+    duration_s: float,
+    dt_s: float,
+    amplitude_hz: float,
+    sigma_s: float,
+    *,
+    center_s: Optional[float] = None,
+    edges: bool = False,
+) -> List[float]:
+    """Gaussian Rabi-rate envelope ``amplitude * exp(-(t - center)**2 / (2 sigma**2))``.
+
+    Samples sit at step midpoints (for ``method="piecewise"``) or, with
+    ``edges=True``, at the ``n + 1`` step edges (for ``method="magnus"``).
+    ``center_s`` defaults to the middle of the pulse.
+    """
+
+    if sigma_s <= 0:
+        raise ValueError("sigma_s must be positive")
+    center = 0.5 * duration_s if center_s is None else center_s
+    inv = 1.0 / (2.0 * sigma_s * sigma_s)
+    return [amplitude_hz * math.exp(-((t - center) ** 2) * inv) for t in _sample_times(duration_s, dt_s, edges)]
+
+
+def drag_envelope(
+    duration_s: float,
+    dt_s: float,
+    amplitude_hz: float,
+    sigma_s: float,
+    beta_s: float,
+    *,
+    center_s: Optional[float] = None,
+    edges: bool = False,
+) -> Tuple[List[float], List[float]]:
+    """Gaussian in-phase envelope plus its DRAG quadrature ``beta * dI/dt``.
+
+    Returns ``(omega_hz, quadrature_hz)``. A common choice is
+    ``beta_s = -1 / (2 * pi * anharm_hz)``.
+    """
+
+    center = 0.5 * duration_s if center_s is None else center_s
+    in_phase = gaussian_envelope(duration_s, dt_s, amplitude_hz, sigma_s, center_s=center, edges=edges)
+    times = _sample_times(duration_s, dt_s, edges)
+    quadrature = [
+        beta_s * (-(t - center) / (sigma_s * sigma_s)) * value for t, value in zip(times, in_phase)
+    ]
+    return in_phase, quadrature
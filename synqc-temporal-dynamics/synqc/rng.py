@@ -2,39 +2,172 @@
 
 from __future__ import annotations
 
+import hashlib
+import operator
 import random
-from typing import Optional
+import secrets
+from array import array
+from typing import List, MutableSequence, Optional, Tuple, Union
+
+Seed = Union[int, float, str, bytes, bytearray]
+
+
+def _derive_seed(root: int, key: Tuple[int, ...]) -> int:
+    """Map a root seed and a substream key to an independent 128-bit seed."""
+
+    if not key:
+        return root
+    material = ":".join(str(part) for part in (root, *key)).encode("ascii")
+    return int.from_bytes(hashlib.sha256(material).digest()[:16], "little")
+
+
+def _root_seed(value: Optional[Seed]) -> int:
+    """Integer root for ``value``; non-integer seeds are hashed to 128 bits."""
+
+    if value is None:
+        return secrets.randbits(128)
+    try:
+        return operator.index(value)
+    except TypeError:
+        pass
+    if isinstance(value, str):
+        material = b"str:" + value.encode("utf-8")
+    elif isinstance(value, (bytes, bytearray)):
+        material = b"bytes:" + bytes(value)
+    elif isinstance(value, float):
+        material = b"float:" + value.hex().encode("ascii")
+    else:
+        raise TypeError(f"seed must be None, an int, a float, a str or bytes, not {type(value).__name__}")
+    return int.from_bytes(hashlib.sha256(material).digest()[:16], "little")
 
 
 class RNG:
-    """Wrapper around :class:`random.Random` providing a NumPy-like API subset."""
+    """Wrapper around :class:`random.Random` providing a NumPy-like API subset.
+
+    Draws are scalar by default; pass ``size`` (or a preallocated ``out``
+    buffer) for bulk draws, which produce exactly the values the same number
+    of scalar calls would. :meth:`spawn` and :meth:`substream` derive
+    reproducible, independent child streams from the root seed, so chunked or
+    parallel runs can reproduce a serial run.
+    """
 
-    __slots__ = ("_rng",)
+    __slots__ = ("_rng", "_root", "_key", "_spawned")
 
-    def __init__(self, seed: Optional[int] = None):
+    def __init__(self, seed: Optional[Seed] = None, *, key: Tuple[int, ...] = ()):
         self._rng = random.Random()
-        if seed is not None:
-            self._rng.seed(seed)
-        else:
-            self._rng.seed()
+        self._key = tuple(int(part) for part in key)
+        self.seed(seed)
+
+    @property
+    def root_seed(self) -> int:
+        """Seed of the stream family; drawn from OS entropy when unseeded."""
+
+        return self._root
+
+    @property
+    def key(self) -> Tuple[int, ...]:
+        """Substream path below :attr:`root_seed` (empty for the root stream)."""
+
+        return self._key
+
+    def normal(
+        self,
+        mean: float = 0.0,
+        stddev: float = 1.0,
+        size: Optional[int] = None,
+        *,
+        out: Optional[MutableSequence[float]] = None,
+    ):
+        """Return normally distributed samples with the given mean and stddev.
+
+        Without ``size``/``out`` a single float is returned. ``size`` returns
+        an ``array('d')``; ``out`` fills a caller-supplied buffer (list,
+        ``array`` or NumPy array) in place and returns it.
+        """
+
+        gauss = self._rng.gauss
+        if size is None and out is None:
+            return gauss(mean, stddev)
+        n = _fill_length(size, out)
+        # Call the bound method directly: a per-sample wrapper would make the
+        # bulk path slower than the scalar calls it replaces.
+        if out is None:
+            return array("d", [gauss(mean, stddev) for _ in range(n)])
+        for i in range(n):
+            out[i] = gauss(mean, stddev)
+        return out
+
+    def uniform(
+        self,
+        a: float = 0.0,
+        b: float = 1.0,
+        size: Optional[int] = None,
+        *,
+        out: Optional[MutableSequence[float]] = None,
+    ):
+        """Return uniformly distributed samples in ``[a, b)``; see :meth:`normal`."""
+
+        uniform = self._rng.uniform
+        if size is None and out is None:
+            return uniform(a, b)
+        n = _fill_length(size, out)
+        if out is None:
+            return array("d", [uniform(a, b) for _ in range(n)])
+        for i in range(n):
+            out[i] = uniform(a, b)
+        return out
+
+    def seed(self, value: Optional[Seed]) -> None:
+        """Seed the underlying PRNG and restart the substream counter.
+
+        Integer (and integer-like) seeds are used as :attr:`root_seed`
+        directly. ``float``, ``str`` and ``bytes`` seeds are hashed into a
+        128-bit root, so distinct seeds give distinct streams; other types
+        raise :class:`TypeError`.
+        """
+
+        self._root = _root_seed(value)
+        self._spawned = 0
+        self._rng.seed(_derive_seed(self._root, self._key))
+
+    def spawn(self, n: int) -> List["RNG"]:
+        """Return ``n`` new independent child streams.
+
+        Children are numbered consecutively across calls, so the ``k``-th
+        child ever spawned equals ``substream(k)``.
+        """
+
+        if n < 0:
+            raise ValueError("n must be non-negative")
+        start = self._spawned
+        self._spawned += n
+        return [self.substream(start + i) for i in range(n)]
 
-    def normal(self, mean: float = 0.0, stddev: float = 1.0) -> float:
-        """Return a normally distributed sample with the given mean and stddev."""
+    def substream(self, index: int) -> "RNG":
+        """Return child stream ``index`` without consuming spawn slots.
 
-        return self._rng.gauss(mean, stddev)
+        This gives random access to substreams, e.g. the noise for chunk
+        ``index`` of a long run, independent of the parent's draw position.
+        """
 
-    def uniform(self, a: float = 0.0, b: float = 1.0) -> float:
-        """Return a uniformly distributed sample in ``[a, b)``."""
+        if index < 0:
+            raise ValueError("index must be non-negative")
+        return RNG(self._root, key=self._key + (index,))
 
-        return self._rng.uniform(a, b)
 
-    def seed(self, value: Optional[int]) -> None:
-        """Seed the underlying PRNG."""
+def _fill_length(size: Optional[int], out: Optional[MutableSequence[float]]) -> int:
+    """Validate a bulk request and return the number of samples to draw."""
 
-        self._rng.seed(value)
+    if out is None:
+        if size < 0:
+            raise ValueError("size must be non-negative")
+        return size
+    if size is not None and size != len(out):
+        raise ValueError("size does not match len(out)")
+    return len(out)
 
 
-def default_rng(seed: Optional[int] = None) -> RNG:
+def default_rng(seed: Optional[Seed] = None) -> RNG:
     """Create a new :class:`RNG` seeded with ``seed``."""
 
     return RNG(seed)
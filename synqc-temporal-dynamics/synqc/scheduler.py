@@ -1,55 +1,347 @@
 from __future__ import annotations
 
 import math
-import statistics
-from time import perf_counter
-from dataclasses import dataclass
-from typing import Dict, List, Optional, Sequence, Tuple
+from array import array
+from collections.abc import Sequence as SequenceABC
+from itertools import compress
+from typing import Dict, List, Optional, Sequence, Tuple, Union
 
-from .probes import drive, probe, add_readout_latency
-from .demod import lockin_demod
+from .mathkern import measurement_signal
+from .probes import DRIVE_ATOL, SubstepStats, drive_segment, get_default_rng, add_readout_latency
+from .demod import lockin_gated, lockin_masked_mean
 from .rng import RNG
-from .mathkern import measurement_signal, measurement_signals
+from .observers import (  # noqa: F401 - RealTimeProfile re-exported for compatibility
+    Observer,
+    RealTimeObservations,
+    RealTimeObserver,
+    RealTimeProfile,
+    _warn_optimize_ignored,
+)
+
+
+class StateHistory(SequenceABC):
+    """Columnar Bloch-vector history recorded every ``stride`` samples.
+
+    Components are stored in three ``array('d')`` columns (24 bytes per
+    recorded state) and read back as ``(x, y, z)`` tuples. Entry ``k`` is the
+    state after timeline sample ``k * stride``.
+    """
+
+    __slots__ = ("x", "y", "z", "stride")
+
+    def __init__(self, stride: int = 1):
+        self.x = array("d")
+        self.y = array("d")
+        self.z = array("d")
+        self.stride = stride
+
+    def append(self, state: Tuple[float, float, float]) -> None:
+        x, y, z = state
+        self.x.append(x)
+        self.y.append(y)
+        self.z.append(z)
+
+    def append_repeat(self, state: Tuple[float, float, float], count: int) -> None:
+        """Append ``count`` copies of ``state`` with one block fill per column."""
+
+        if count <= 0:
+            return
+        x, y, z = state
+        self.x.extend(array("d", [x]) * count)
+        self.y.extend(array("d", [y]) * count)
+        self.z.extend(array("d", [z]) * count)
+
+    @property
+    def indices(self) -> range:
+        """Timeline sample index of every recorded state."""
+
+        return range(0, len(self.x) * self.stride, self.stride) if self.stride else range(0)
+
+    def __len__(self) -> int:
+        return len(self.x)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self.x)))]
+        return (self.x[index], self.y[index], self.z[index])
+
+    def thinned(self, factor: int) -> "StateHistory":
+        """Return every ``factor``-th entry as a history with ``stride * factor``."""
+
+        out = StateHistory(self.stride * factor)
+        out.x = self.x[::factor]
+        out.y = self.y[::factor]
+        out.z = self.z[::factor]
+        return out
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, StateHistory):
+            return NotImplemented
+        return (self.stride, self.x, self.y, self.z) == (other.stride, other.x, other.y, other.z)
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return f"StateHistory(len={len(self.x)}, stride={self.stride})"
+
+
+class _DemodPlan:
+    """Everything needed to demodulate a DPD signal, evaluated on demand."""
+
+    __slots__ = ("signal", "probe_mask", "ref_freq_hz", "dt_s", "window", "window_s")
+
+    def __init__(self, signal, probe_mask, ref_freq_hz, dt_s, window, window_s):
+        self.signal = signal
+        self.probe_mask = probe_mask
+        self.ref_freq_hz = ref_freq_hz
+        self.dt_s = dt_s
+        self.window = window
+        self.window_s = window_s
+
+    def demodulate(self) -> Tuple[array, array, float, float]:
+        """Filtered I/Q plus their probe-window means in one fused pass."""
+
+        return lockin_gated(
+            self.signal,
+            self.ref_freq_hz,
+            self.dt_s,
+            self.probe_mask,
+            window=self.window,
+            window_s=self.window_s,
+        )
+
+    def phase_amp(self) -> Tuple[float, float]:
+        """Phase/amplitude straight from the probe samples (no filtered vectors)."""
+
+        if not any(self.probe_mask):
+            return 0.0, 0.0
+        i_mean, q_mean = lockin_masked_mean(
+            self.signal,
+            self.ref_freq_hz,
+            self.dt_s,
+            self.probe_mask,
+            window=self.window,
+            window_s=self.window_s,
+            gated=True,
+        )
+        return _phase_amp(i_mean, q_mean)
+
+
+def _phase_amp(i_mean: float, q_mean: float) -> Tuple[float, float]:
+    return float(math.atan2(q_mean, i_mean)), float(math.hypot(i_mean, q_mean))
+
+
+def _masked_phase_amp(i_lp, q_lp, probe_mask) -> Tuple[float, float]:
+    total = sum(1 for flag in probe_mask if flag)
+    if not total:
+        return 0.0, 0.0
+    return _phase_amp(math.fsum(compress(i_lp, probe_mask)) / total, math.fsum(compress(q_lp, probe_mask)) / total)
 
 
-@dataclass(frozen=True)
 class DPDResult:
-    t: Sequence[float]
-    signal: Sequence[float]
-    i_lp: Sequence[float]
-    q_lp: Sequence[float]
-    phase: float
-    amp: float
-    states: List[Tuple[float, float, float]]
-    probe_mask: Sequence[bool]
-    realtime: Optional["RealTimeObservations"] = None
+    """Outcome of :func:`run_dpd_sequence`.
+
+    With ``lazy_demod=True`` the timebase ``t``, the filtered ``i_lp``/``q_lp``
+    vectors and ``phase``/``amp`` are computed on first access and cached.
+    ``phase``/``amp`` read before ``i_lp``/``q_lp`` come from the phase-only
+    path, which weights the probe samples directly instead of building the
+    filtered vectors; both paths agree to floating-point rounding.
+
+    ``substep_stats`` holds the :class:`~synqc.probes.SubstepStats` of the two
+    drive segments (``None`` for an empty segment), so ``drive_substeps="auto"``
+    runs report the chosen sub-step counts and error estimates.
+
+    ``probe_mask`` is a list of bools built on first access from a compact
+    byte column.
+
+    Results compare equal when every public field does; deferred fields are
+    computed first (filtered vectors before ``phase``/``amp``) and NaN samples
+    match NaN. ``DPDResult`` is not a dataclass; :attr:`FIELDS`,
+    :meth:`replace` and :meth:`asdict` stand in for ``dataclasses.fields``,
+    ``dataclasses.replace`` and ``dataclasses.asdict``.
+    """
+
+    __slots__ = (
+        "signal", "states", "realtime", "substep_stats",
+        "_t", "_i_lp", "_q_lp", "_phase", "_amp", "_mask", "_probe_mask", "_plan",
+    )
+
+    #: Public field names, in constructor order.
+    FIELDS = (
+        "t", "signal", "i_lp", "q_lp", "phase", "amp",
+        "states", "probe_mask", "realtime", "substep_stats",
+    )
+
+    def __init__(
+        self,
+        t: Optional[Sequence[float]],
+        signal: Sequence[float],
+        i_lp: Optional[Sequence[float]],
+        q_lp: Optional[Sequence[float]],
+        phase: Optional[float],
+        amp: Optional[float],
+        states: StateHistory,
+        probe_mask: Sequence[bool],
+        realtime: Optional["RealTimeObservations"] = None,
+        substep_stats: Tuple[Optional[SubstepStats], ...] = (),
+        *,
+        plan: Optional[_DemodPlan] = None,
+    ):
+        if plan is None and None in (t, i_lp, q_lp, phase, amp):
+            raise ValueError("deferred DPDResult fields require a demodulation plan")
+        for name, value in (
+            ("signal", signal), ("states", states), ("realtime", realtime),
+            ("substep_stats", tuple(substep_stats)), ("_t", t), ("_i_lp", i_lp), ("_q_lp", q_lp),
+            ("_phase", phase), ("_amp", amp), ("_mask", probe_mask),
+            ("_probe_mask", probe_mask if isinstance(probe_mask, list) else None), ("_plan", plan),
+        ):
+            object.__setattr__(self, name, value)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("DPDResult is immutable")
+
+    @property
+    def t(self) -> Sequence[float]:
+        if self._t is None:
+            dt_s = self._plan.dt_s
+            object.__setattr__(self, "_t", array("d", [dt_s * (i + 1) for i in range(len(self.signal))]))
+        return self._t
+
+    @property
+    def probe_mask(self) -> List[bool]:
+        if self._probe_mask is None:
+            object.__setattr__(self, "_probe_mask", [bool(flag) for flag in self._mask])
+        return self._probe_mask
+
+    @property
+    def i_lp(self) -> Sequence[float]:
+        if self._i_lp is None:
+            self._filter()
+        return self._i_lp
+
+    @property
+    def q_lp(self) -> Sequence[float]:
+        if self._q_lp is None:
+            self._filter()
+        return self._q_lp
+
+    @property
+    def phase(self) -> float:
+        if self._phase is None:
+            self._phase_amp()
+        return self._phase
 
+    @property
+    def amp(self) -> float:
+        if self._amp is None:
+            self._phase_amp()
+        return self._amp
 
-@dataclass(frozen=True)
-class RealTimeProfile:
-    """Profiling metadata and optimization trace for real-time capture."""
+    def _filter(self) -> None:
+        i_lp, q_lp, i_mean, q_mean = self._plan.demodulate()
+        object.__setattr__(self, "_i_lp", i_lp)
+        object.__setattr__(self, "_q_lp", q_lp)
+        if self._phase is None:
+            phase, amp = _phase_amp(i_mean, q_mean) if any(self._mask) else (0.0, 0.0)
+            object.__setattr__(self, "_phase", phase)
+            object.__setattr__(self, "_amp", amp)
 
-    total_samples: int
-    expectation_time_s: float
-    noisy_time_s: float
-    kernel: str = "scalar"
-    avg_expectation_per_sample_s: float = 0.0
-    avg_noisy_per_sample_s: float = 0.0
-    optimizations: Tuple[str, ...] = ()
+    def _phase_amp(self) -> None:
+        if self._i_lp is not None:
+            phase, amp = _masked_phase_amp(self._i_lp, self._q_lp, self._mask)
+        else:
+            phase, amp = self._plan.phase_amp()
+        object.__setattr__(self, "_phase", phase)
+        object.__setattr__(self, "_amp", amp)
 
+    def asdict(self) -> Dict[str, object]:
+        """Shallow ``{field: value}`` mapping of :attr:`FIELDS`, deferred fields computed."""
 
-@dataclass(frozen=True)
-class RealTimeObservations:
-    """Container for per-sample qubit observables captured during a DPD run."""
+        return {name: getattr(self, name) for name in self.FIELDS}
 
-    indices: Tuple[int, ...]
-    expectation: Dict[str, Tuple[float, ...]]
-    noisy: Optional[Dict[str, Tuple[float, ...]]] = None
-    profile: Optional[RealTimeProfile] = None
+    def replace(self, **changes) -> "DPDResult":
+        """Return a copy with ``changes`` applied, like ``dataclasses.replace``.
 
+        Deferred fields are computed first, so the copy holds plain values.
+        """
 
-def _mean(values: Sequence[float]) -> float:
-    return statistics.fmean(values) if values else 0.0
+        unknown = sorted(set(changes) - set(self.FIELDS))
+        if unknown:
+            raise TypeError(f"unknown DPDResult fields: {', '.join(unknown)}")
+        values = self.asdict()
+        values.update(changes)
+        return DPDResult(**values)
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, DPDResult):
+            return NotImplemented
+        if other is self:
+            return True
+        return all(_same_values(getattr(self, name), getattr(other, name)) for name in self.FIELDS)
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return (
+            f"DPDResult(samples={len(self.signal)}, phase={self.phase!r}, amp={self.amp!r}, "
+            f"states={self.states!r}, realtime={self.realtime!r})"
+        )
+
+
+def _same_values(a, b) -> bool:
+    """``a == b`` with NaN equal to NaN (timelines hold NaN outside the probe window)."""
+
+    if isinstance(a, float) and isinstance(b, float):
+        return a == b or (a != a and b != b)
+    if isinstance(a, (array, list)) and isinstance(b, (array, list)):
+        return len(a) == len(b) and all(x == y or (x != x and y != y) for x, y in zip(a, b))
+    return a == b
+
+
+def _assemble_result(
+    meas,
+    states: StateHistory,
+    hw,
+    dt_s: float,
+    ref_freq_hz: float,
+    demod_window: Optional[int],
+    demod_window_s: Optional[float],
+    lazy_demod: bool,
+    realtime: Optional["RealTimeObservations"] = None,
+    substep_stats: Tuple[Optional[SubstepStats], ...] = (),
+) -> DPDResult:
+    """Latency-shift, mask and demodulate a probe record into a :class:`DPDResult`.
+
+    The probe mask comes from the unshifted record; demodulation gates the
+    shifted signal with it (:func:`synqc.demod.lockin_gated`), so NaN and
+    out-of-window samples never get copied into a separate demod input.
+    """
+
+    # Build signal and apply latency preserving length
+    signal = add_readout_latency(meas, hw.probe_latency, dt_s)
+    probe_mask = array("b", [x == x for x in meas])
+    plan = _DemodPlan(signal, probe_mask, ref_freq_hz, dt_s, demod_window, demod_window_s)
+    if lazy_demod:
+        t = i_lp = q_lp = phase = amp = None
+    else:
+        t = array("d", [dt_s * (i + 1) for i in range(len(meas))])
+        i_lp, q_lp, i_mean, q_mean = plan.demodulate()
+        phase, amp = _phase_amp(i_mean, q_mean) if any(probe_mask) else (0.0, 0.0)
+    return DPDResult(
+        t, signal, i_lp, q_lp, phase, amp, states, probe_mask, realtime, substep_stats, plan=plan
+    )
+
+
+def _resolve_record_stride(record_states: Union[str, int]) -> int:
+    """Map ``record_states`` to a recording stride (0 disables recording)."""
+
+    if record_states == "full":
+        return 1
+    if record_states == "none":
+        return 0
+    if isinstance(record_states, int) and not isinstance(record_states, bool) and record_states >= 1:
+        return record_states
+    raise ValueError("record_states must be 'full', 'none', or a positive int stride")
 
 
 def run_dpd_sequence(
@@ -68,18 +360,56 @@ def run_dpd_sequence(
     rng: Optional[RNG] = None,
     demod_window: Optional[int] = None,
     demod_window_s: Optional[float] = 0.01,
-    drive_substeps: int = 1,
+    drive_substeps: Union[int, str] = 1,
+    drive_atol: float = DRIVE_ATOL,
+    drive_method: str = "split",
+    record_states: Union[str, int] = "full",
+    lazy_demod: bool = False,
     real_time_axes: Sequence[str] = (),
     real_time_shots: Optional[int] = None,
     real_time_meas_noise: Optional[float] = None,
     real_time_rng: Optional[RNG] = None,
     real_time_stride: int = 1,
     real_time_profile: bool = False,
-    real_time_optimize: bool = True,
-    real_time_optimize_threshold: float = 5e-06,
-    real_time_optimize_warmup: int = 4,
+    real_time_optimize: Optional[bool] = None,
+    real_time_optimize_threshold: Optional[float] = None,
+    real_time_optimize_warmup: Optional[int] = None,
+    observers: Sequence[Observer] = (),
 ):
-    """Simulate a fixed-length drive–probe–drive (DPD) experiment timeline."""
+    """Simulate a fixed-length drive–probe–drive (DPD) experiment timeline.
+
+    ``record_states`` controls the Bloch-vector history kept in
+    ``DPDResult.states``: ``"full"`` (every sample), an int ``k`` (every
+    ``k``-th sample) or ``"none"``. Without a history or observers, drive
+    segments are fast-forwarded instead of stepped sample by sample.
+
+    ``observers`` are :class:`synqc.observers.Observer` instances. Post-hoc
+    observers are handed the state history (recorded at the gcd of their
+    strides and ``record_states``) after evolution; streaming ones are called
+    per sample. The ``real_time_*`` options build a
+    :class:`~synqc.observers.RealTimeObserver` whose output lands in
+    ``DPDResult.realtime``; its noisy readouts are drawn in one block after
+    the probe window, so with a shared ``rng`` they follow the probe draws.
+    The ``real_time_optimize*`` options are deprecated and ignored.
+
+    ``drive_substeps="auto"`` sizes each drive segment's sub-steps by
+    comparing against the exact propagator so its Bloch vector stays within
+    ``drive_atol`` (see :func:`synqc.probes.adaptive_substeps`).
+    ``drive_method="exact"`` uses that exact joint rotation/relaxation step
+    directly, which keeps drive segments accurate at coarse ``dt_s``. The
+    per-segment step statistics land in ``DPDResult.substep_stats``.
+
+    ``lazy_demod=True`` defers the timebase and demodulation until the result
+    fields are read; loops that only consume ``phase``/``amp`` then skip the
+    filtered I/Q vectors entirely.
+    """
+
+    _warn_optimize_ignored(
+        real_time_optimize=real_time_optimize,
+        real_time_optimize_threshold=real_time_optimize_threshold,
+        real_time_optimize_warmup=real_time_optimize_warmup,
+    )
+    record_stride = _resolve_record_stride(record_states)
 
     n1 = max(0, math.ceil(d1_s / dt_s))
     nP = max(0, math.ceil(probe_s / dt_s))
@@ -87,86 +417,73 @@ def run_dpd_sequence(
     nT = max(1, n1 + nP + n2)
 
     # Timebase
-    t = [dt_s * (i + 1) for i in range(nT)]
-    meas = [math.nan] * nT
-    states: List[Tuple[float, float, float]] = []
-
-    axes = tuple(dict.fromkeys(real_time_axes))
-    realtime_expectation: Dict[str, List[float]] = {axis: [] for axis in axes}
-    realtime_noisy: Optional[Dict[str, List[float]]] = None
-    rt_stride = max(1, int(real_time_stride))
-    if axes:
-        rt_shots = shots if real_time_shots is None else real_time_shots
-        rt_noise = meas_noise if real_time_meas_noise is None else real_time_meas_noise
-        if rt_shots > 0:
-            realtime_noisy = {axis: [] for axis in axes}
-        realtime_rng = real_time_rng if real_time_rng is not None else rng
-        realtime_indices: List[int] = []
-        profile_expectation_time = 0.0
-        profile_noisy_time = 0.0
-        profile_samples = 0
+    meas = array("d", [math.nan]) * nT
+
+    observer_list = list(observers)
+    realtime_observer = None
+    if real_time_axes:
+        realtime_observer = RealTimeObserver(
+            real_time_axes,
+            stride=real_time_stride,
+            shots=shots if real_time_shots is None else real_time_shots,
+            meas_noise=meas_noise if real_time_meas_noise is None else real_time_meas_noise,
+            rng=real_time_rng if real_time_rng is not None else rng,
+            profile=real_time_profile,
+        )
+        observer_list.append(realtime_observer)
+    streaming = [obs for obs in observer_list if obs.streaming]
+
+    # Post-hoc observers read a history recorded at the gcd of all strides.
+    history_stride = record_stride
+    for obs in observer_list:
+        if not obs.streaming:
+            history_stride = math.gcd(history_stride, max(1, int(obs.stride)))
+    history = StateHistory(history_stride)
+    for obs in observer_list:
+        obs.start(nT, dt_s)
+
+    # ``record_repeat(state, count)`` records a frozen state for ``count``
+    # consecutive samples (the probe window) without a per-sample call.
+    if streaming:
         sample_index = 0
-        kernel_mode = "scalar"
-        optimizations: List[str] = []
-        warmup_target = max(1, int(real_time_optimize_warmup))
 
         def record_state(current_state: Tuple[float, float, float]):
-            nonlocal profile_expectation_time, profile_noisy_time, profile_samples, sample_index, kernel_mode
-            states.append(current_state)
-            if sample_index % rt_stride == 0:
-                profile_samples += 1
-                realtime_indices.append(sample_index)
-                expectation_cache: Dict[str, float]
-                expectation_start = perf_counter() if real_time_profile else None
-                if kernel_mode == "bulk":
-                    values = measurement_signals(current_state, axes)
-                    expectation_cache = dict(zip(axes, values))
-                    for axis, val in zip(axes, values):
-                        realtime_expectation[axis].append(val)
-                else:
-                    expectation_cache = {}
-                    for axis in axes:
-                        val = measurement_signal(current_state, axis=axis)
-                        expectation_cache[axis] = val
-                        realtime_expectation[axis].append(val)
-                if expectation_start is not None:
-                    profile_expectation_time += perf_counter() - expectation_start
-                    if (
-                        real_time_optimize
-                        and kernel_mode == "scalar"
-                        and len(axes) > 1
-                        and profile_samples >= warmup_target
-                    ):
-                        per_axis_time = profile_expectation_time / (profile_samples * len(axes))
-                        if per_axis_time >= real_time_optimize_threshold:
-                            kernel_mode = "bulk"
-                            optimizations.append("bulk-axis")
-                if realtime_noisy is not None:
-                    noisy_start = perf_counter() if real_time_profile else None
-                    for axis, ideal in expectation_cache.items():
-                        realtime_noisy[axis].append(
-                            probe(
-                                current_state,
-                                axis=axis,
-                                shots=rt_shots,
-                                meas_noise=rt_noise,
-                                rng=realtime_rng,
-                                ideal=ideal,
-                            )
-                        )
-                    if noisy_start is not None:
-                        profile_noisy_time += perf_counter() - noisy_start
+            nonlocal sample_index
+            if history_stride and sample_index % history_stride == 0:
+                history.append(current_state)
+            for obs in streaming:
+                if sample_index % obs.stride == 0:
+                    obs.on_state(sample_index, current_state)
             sample_index += 1
 
-    else:
+        def record_repeat(current_state: Tuple[float, float, float], count: int):
+            for _ in range(count):
+                record_state(current_state)
+
+    elif history_stride == 1:
+        record_state = history.append
+        record_repeat = history.append_repeat
+
+    elif history_stride:
 
         sample_index = 0
 
         def record_state(current_state: Tuple[float, float, float]):
             nonlocal sample_index
-            states.append(current_state)
+            if sample_index % history_stride == 0:
+                history.append(current_state)
             sample_index += 1
 
+        def record_repeat(current_state: Tuple[float, float, float], count: int):
+            nonlocal sample_index
+            first = -(-sample_index // history_stride) * history_stride
+            history.append_repeat(current_state, len(range(first, sample_index + count, history_stride)))
+            sample_index += count
+
+    else:
+        record_state = None
+        record_repeat = None
+
     # Reference for demod
     if ref_freq_hz is None:
         ref_freq_hz = detuning_hz if abs(detuning_hz) > 1.0 else 1.0e5
@@ -175,76 +492,48 @@ def run_dpd_sequence(
     state = (0.0, 0.0, 1.0)
 
     # Drive 1
-    for _ in range(n1):
-        state = drive(state, detuning_hz, omega_hz, dt_s, hw, substeps=drive_substeps)
-        record_state(state)
+    state, stats1 = drive_segment(
+        state, detuning_hz, omega_hz, dt_s, n1, hw, drive_substeps,
+        method=drive_method, atol=drive_atol, on_step=record_state, return_stats=True
+    )
 
-    # Probe
+    # Probe: the state is frozen, so the window is one ideal value plus a
+    # bulk noise draw (the same values per-sample ``probe`` calls would give).
     startP = n1
     endP = min(n1 + nP, nT)
-    for k in range(startP, endP):
-        meas[k] = probe(state, axis=readout_axis, shots=shots, meas_noise=meas_noise, rng=rng)
-        record_state(state)
+    if endP > startP:
+        generator = rng if rng is not None else get_default_rng()
+        ideal = measurement_signal(state, axis=readout_axis)
+        noise_sigma = meas_noise / math.sqrt(max(1, shots))
+        meas[startP:endP] = generator.normal(ideal, noise_sigma, size=endP - startP)
+        if record_repeat is not None:
+            record_repeat(state, endP - startP)
 
     # Drive 2
-    for _ in range(endP, nT):
-        state = drive(state, detuning_hz, omega_hz, dt_s, hw, substeps=drive_substeps)
-        record_state(state)
-
-    # Build signal and apply latency preserving length
-    signal = list(meas)
-    signal = add_readout_latency(signal, hw.probe_latency, dt_s)
-
-    # Demodulation over the full vector with zeros outside probe
-    probe_mask = [not math.isnan(x) for x in meas]
-    demod_input = [signal[i] if probe_mask[i] and not math.isnan(signal[i]) else 0.0 for i in range(nT)]
-    i_lp, q_lp = lockin_demod(
-        demod_input,
-        ref_freq_hz,
-        dt_s,
-        window=demod_window,
-        window_s=demod_window_s,
+    state, stats2 = drive_segment(
+        state, detuning_hz, omega_hz, dt_s, nT - endP, hw, drive_substeps,
+        method=drive_method, atol=drive_atol, on_step=record_state, return_stats=True
     )
 
-    if any(probe_mask):
-        masked_i = [i_lp[i] for i in range(nT) if probe_mask[i]]
-        masked_q = [q_lp[i] for i in range(nT) if probe_mask[i]]
-        i_mean = float(_mean(masked_i))
-        q_mean = float(_mean(masked_q))
-        phase = float(math.atan2(q_mean, i_mean))
-        amp = float(math.hypot(i_mean, q_mean))
+    for obs in observer_list:
+        obs.finish(history)
+    if history_stride == record_stride:
+        states = history
+    elif record_stride:
+        states = history.thinned(record_stride // history_stride)
     else:
-        phase = 0.0
-        amp = 0.0
-
-    realtime_result = None
-    if axes:
-        expectation = {axis: tuple(values) for axis, values in realtime_expectation.items()}
-        noisy = (
-            {axis: tuple(values) for axis, values in realtime_noisy.items()}
-            if realtime_noisy is not None
-            else None
-        )
-        profile_data = None
-        if real_time_profile:
-            avg_expect = (
-                profile_expectation_time / profile_samples if profile_samples else 0.0
-            )
-            avg_noisy = profile_noisy_time / profile_samples if profile_samples else 0.0
-            profile_data = RealTimeProfile(
-                total_samples=profile_samples,
-                expectation_time_s=profile_expectation_time,
-                noisy_time_s=profile_noisy_time,
-                kernel=kernel_mode,
-                avg_expectation_per_sample_s=avg_expect,
-                avg_noisy_per_sample_s=avg_noisy,
-                optimizations=tuple(optimizations),
-            )
-        realtime_result = RealTimeObservations(
-            indices=tuple(realtime_indices),
-            expectation=expectation,
-            noisy=noisy,
-            profile=profile_data,
-        )
+        states = StateHistory(0)
+    realtime_result = realtime_observer.result if realtime_observer is not None else None
 
-    return DPDResult(t, signal, i_lp, q_lp, phase, amp, states, probe_mask, realtime_result)
+    return _assemble_result(
+        meas,
+        states,
+        hw,
+        dt_s,
+        ref_freq_hz,
+        demod_window,
+        demod_window_s,
+        lazy_demod,
+        realtime_result,
+        (stats1, stats2),
+    )
@@ -0,0 +1,292 @@
+"""Chunked on-disk store for DPD run results.
+
+A store is a directory holding:
+
+- ``meta.json`` — format version and the stored vector fields.
+- ``chunks/NNNNN.<field>.npy`` — one flat float64 array per field and chunk,
+  the runs of that chunk concatenated back to back.
+- ``index.jsonl`` — one JSON line per run with its id, chunk, offset, length,
+  ``phase``/``amp`` and the caller's parameters.
+
+A single :class:`ResultWriter` buffers runs in memory and writes a chunk once
+``chunk_runs`` runs have accumulated: every field file is written to a
+temporary name and atomically renamed, and only then are the runs' index lines
+appended. Readers therefore never see a run whose data is incomplete, and any
+number of :class:`ResultStore` readers (in any process) can open the store
+while it is being written, picking up new runs with :meth:`ResultStore.refresh`.
+Vectors are read through read-only memory maps, so random access by parameter
+never loads more than the requested slice.
+
+Unlike the scalar core this module requires NumPy; it is not imported by
+``synqc/__init__.py`` so the scalar path keeps working without it.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import tempfile
+from collections.abc import Mapping
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Union
+
+import numpy as np
+
+STORE_FORMAT = 1
+STORE_FIELDS = ("signal", "i_lp", "q_lp")
+
+_META = "meta.json"
+_INDEX = "index.jsonl"
+_CHUNKS = "chunks"
+_LOCK = ".writer.lock"
+
+
+def _chunk_path(root: Path, chunk: int, field: str) -> Path:
+    return root / _CHUNKS / f"{chunk:05d}.{field}.npy"
+
+
+def _atomic_write(path: Path, write) -> None:
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as fh:
+            write(fh)
+            fh.flush()
+            os.fsync(fh.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.unlink(tmp)
+        raise
+
+
+def _read_meta(root: Path) -> Dict[str, Any]:
+    meta = json.loads((root / _META).read_text(encoding="utf-8"))
+    if meta.get("format") != STORE_FORMAT:
+        raise ValueError(f"unsupported result store format {meta.get('format')!r} in {root}")
+    return meta
+
+
+class ResultWriter:
+    """Append DPD results to a store directory, one chunk at a time.
+
+    ``append`` accepts a :class:`~synqc.scheduler.DPDResult` (or any object or
+    mapping exposing ``phase``, ``amp`` and the vector ``fields``) plus a
+    mapping of JSON-serializable parameters. Opening an existing store
+    appends to it. Only one writer may hold a store at a time.
+    """
+
+    def __init__(
+        self,
+        path: Union[str, os.PathLike],
+        *,
+        chunk_runs: int = 256,
+        fields: Sequence[str] = STORE_FIELDS,
+    ):
+        if chunk_runs < 1:
+            raise ValueError("chunk_runs must be >= 1")
+        self.path = Path(path)
+        (self.path / _CHUNKS).mkdir(parents=True, exist_ok=True)
+        try:
+            self._lock = os.open(self.path / _LOCK, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+        except FileExistsError as exc:
+            raise RuntimeError(
+                f"{self.path} is already open for writing (remove {_LOCK} if a writer crashed)"
+            ) from exc
+        try:
+            if (self.path / _META).exists():
+                meta = _read_meta(self.path)
+                if tuple(meta["fields"]) != tuple(fields):
+                    raise ValueError(f"store fields are {meta['fields']}, not {list(fields)}")
+            else:
+                meta = {"format": STORE_FORMAT, "fields": list(fields)}
+                payload = json.dumps(meta).encode("utf-8")
+                _atomic_write(self.path / _META, lambda fh: fh.write(payload))
+        except BaseException:
+            self._release()
+            raise
+        self.fields = tuple(fields)
+        self.chunk_runs = chunk_runs
+        existing = ResultStore(self.path)
+        self._next_run = len(existing)
+        self._next_chunk = existing._last_chunk + 1
+        self._pending: List[Dict[str, Any]] = []
+        self._pending_data: Dict[str, List[np.ndarray]] = {field: [] for field in self.fields}
+        self._pending_length = 0
+
+    def __enter__(self) -> "ResultWriter":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    @property
+    def runs_written(self) -> int:
+        """Runs visible to readers (excludes the buffered, unflushed ones)."""
+
+        return self._next_run - len(self._pending)
+
+    def append(self, params: Mapping[str, Any], result) -> int:
+        """Buffer one run and return its run id; flushes full chunks."""
+
+        if self._lock is None:
+            raise RuntimeError("writer is closed")
+
+        def get(name):
+            return result[name] if isinstance(result, Mapping) else getattr(result, name)
+
+        vectors = [np.asarray(get(field), dtype=np.float64).ravel() for field in self.fields]
+        length = len(vectors[0]) if vectors else 0
+        if any(len(v) != length for v in vectors):
+            raise ValueError("all stored fields of a run must have the same length")
+        run = self._next_run
+        self._pending.append({
+            "run": run,
+            "chunk": self._next_chunk,
+            "offset": self._pending_length,
+            "length": length,
+            "phase": float(get("phase")),
+            "amp": float(get("amp")),
+            "params": dict(params),
+        })
+        for field, values in zip(self.fields, vectors):
+            self._pending_data[field].append(values)
+        self._pending_length += length
+        self._next_run += 1
+        if len(self._pending) >= self.chunk_runs:
+            self.flush()
+        return run
+
+    def flush(self) -> None:
+        """Write buffered runs as a new chunk and publish them in the index."""
+
+        if not self._pending:
+            return
+        chunk = self._next_chunk
+        for field in self.fields:
+            data = np.concatenate(self._pending_data[field])
+            _atomic_write(_chunk_path(self.path, chunk, field), lambda fh, d=data: np.save(fh, d))
+        lines = "".join(json.dumps(entry, separators=(",", ":")) + "\n" for entry in self._pending)
+        with open(self.path / _INDEX, "a", encoding="utf-8") as fh:
+            fh.write(lines)
+            fh.flush()
+            os.fsync(fh.fileno())
+        self._next_chunk += 1
+        self._pending.clear()
+        self._pending_data = {field: [] for field in self.fields}
+        self._pending_length = 0
+
+    def close(self) -> None:
+        """Flush remaining runs and release the writer lock."""
+
+        if self._lock is None:
+            return
+        try:
+            self.flush()
+        finally:
+            self._release()
+
+    def _release(self) -> None:
+        os.close(self._lock)
+        self._lock = None
+        try:
+            os.unlink(self.path / _LOCK)
+        except FileNotFoundError:  # pragma: no cover - removed externally
+            pass
+
+
+class ResultStore:
+    """Read-only view of a result store; safe to share across processes.
+
+    Runs are addressed by integer id (append order). :meth:`find` looks runs
+    up by exact parameter values through an in-memory parameter index, and
+    :meth:`read` returns a memory-mapped slice of one vector field.
+    """
+
+    def __init__(self, path: Union[str, os.PathLike]):
+        self.path = Path(path)
+        meta = _read_meta(self.path)
+        self.fields = tuple(meta["fields"])
+        self._entries: List[Dict[str, Any]] = []
+        self._by_param: Dict[str, Dict[Any, List[int]]] = {}
+        self._maps: Dict[tuple, np.ndarray] = {}
+        self._index_pos = 0
+        self._last_chunk = -1
+        self.refresh()
+
+    def refresh(self) -> int:
+        """Load index lines published since the last call; returns how many."""
+
+        index = self.path / _INDEX
+        if not index.exists():
+            return 0
+        with open(index, "rb") as fh:
+            fh.seek(self._index_pos)
+            blob = fh.read()
+        # A writer may be mid-append; only consume complete lines.
+        complete = blob[: blob.rfind(b"\n") + 1]
+        self._index_pos += len(complete)
+        added = 0
+        for line in complete.splitlines():
+            entry = json.loads(line)
+            self._entries.append(entry)
+            self._last_chunk = max(self._last_chunk, entry["chunk"])
+            for name, value in entry["params"].items():
+                self._by_param.setdefault(name, {}).setdefault(_key(value), []).append(entry["run"])
+            added += 1
+        return added
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def params(self, run: int) -> Dict[str, Any]:
+        return dict(self._entries[run]["params"])
+
+    def phase(self, run: int) -> float:
+        return self._entries[run]["phase"]
+
+    def amp(self, run: int) -> float:
+        return self._entries[run]["amp"]
+
+    def column(self, name: str) -> List[Any]:
+        """Per-run values of ``phase``, ``amp``, ``length`` or a parameter."""
+
+        if name in ("phase", "amp", "length"):
+            return [entry[name] for entry in self._entries]
+        return [entry["params"].get(name) for entry in self._entries]
+
+    def find(self, **params) -> List[int]:
+        """Run ids whose parameters equal every given ``name=value``."""
+
+        matches: Optional[set] = None
+        for name, value in params.items():
+            ids = set(self._by_param.get(name, {}).get(_key(value), ()))
+            matches = ids if matches is None else matches & ids
+            if not matches:
+                return []
+        return sorted(matches) if matches is not None else list(range(len(self._entries)))
+
+    def read(self, run: int, field: str = "signal") -> np.ndarray:
+        """Return ``field`` of ``run`` as a read-only memory-mapped view."""
+
+        if field not in self.fields:
+            raise KeyError(f"field {field!r} is not stored; available: {self.fields}")
+        entry = self._entries[run]
+        key = (entry["chunk"], field)
+        data = self._maps.get(key)
+        if data is None:
+            data = self._maps[key] = np.load(_chunk_path(self.path, *key), mmap_mode="r")
+        return data[entry["offset"]: entry["offset"] + entry["length"]]
+
+
+def _key(value):
+    """Hashable form of a JSON parameter value, as stored or as passed to ``find``.
+
+    Lists/tuples become tuples and dicts become sorted ``(key, value)``
+    tuples, recursively; dict keys are compared as strings, as JSON stores them.
+    """
+
+    if isinstance(value, (list, tuple)):
+        return tuple(_key(v) for v in value)
+    if isinstance(value, dict):
+        return ("__dict__",) + tuple(sorted((str(k), _key(v)) for k, v in value.items()))
+    return value
@@ -0,0 +1,199 @@
+"""Process-parallel DPD parameter sweeps with deterministic seeding.
+
+Each grid point runs :func:`synqc.scheduler.run_dpd_sequence` with its own
+RNG substream, ``RNG(root_seed).substream(index)``, so results depend only on
+the root seed and the point's position in the grid, never on how many
+workers ran the sweep or in which order chunks finished.
+"""
+
+from __future__ import annotations
+
+import itertools
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from .hardware import HardwareSignature
+from .rng import RNG
+from .scheduler import run_dpd_sequence
+
+SWEEP_COLUMNS = (
+    "index",
+    "detuning_hz",
+    "omega_hz",
+    "d1_s",
+    "probe_s",
+    "d2_s",
+    "family",
+    "phase",
+    "amp",
+)
+
+
+_POINT_FIELDS = ("detuning_hz", "omega_hz", "d1_s", "probe_s", "d2_s", "family")
+
+
+@dataclass(frozen=True)
+class SweepPoint:
+    """One DPD configuration in a sweep grid."""
+
+    detuning_hz: float
+    omega_hz: float
+    d1_s: float
+    probe_s: float
+    d2_s: float
+    family: str = "superconducting"
+
+
+@dataclass(frozen=True)
+class SweepTable:
+    """Columnar sweep results; row ``k`` belongs to grid point ``k``."""
+
+    columns: Dict[str, Tuple[Any, ...]]
+
+    def __len__(self) -> int:
+        return len(self.columns["index"])
+
+    def __getitem__(self, name: str) -> Tuple[Any, ...]:
+        return self.columns[name]
+
+    def rows(self) -> List[Dict[str, Any]]:
+        names = list(self.columns)
+        return [dict(zip(names, values)) for values in zip(*self.columns.values())]
+
+    def to_dataframe(self):
+        """Return the table as a pandas DataFrame (requires pandas)."""
+
+        try:
+            import pandas as pd  # type: ignore
+        except ModuleNotFoundError as exc:  # pragma: no cover - environment-specific
+            raise RuntimeError("pandas is required for SweepTable.to_dataframe().") from exc
+        return pd.DataFrame({name: list(values) for name, values in self.columns.items()})
+
+
+def _as_tuple(values) -> Tuple[Any, ...]:
+    if isinstance(values, (str, bytes)) or not isinstance(values, Iterable):
+        return (values,)
+    return tuple(values)
+
+
+def sweep_grid(detuning_hz, omega_hz, d1_s, probe_s, d2_s, family="superconducting") -> List[SweepPoint]:
+    """Cartesian product of scalar-or-sequence parameters, detuning varying fastest."""
+
+    axes = [_as_tuple(v) for v in (family, d2_s, probe_s, d1_s, omega_hz, detuning_hz)]
+    return [
+        SweepPoint(det, omg, d1, pr, d2, fam)
+        for fam, d2, pr, d1, omg, det in itertools.product(*axes)
+    ]
+
+
+def _run_chunk(
+    start: int,
+    points: Sequence[SweepPoint],
+    root_seed: int,
+    run_kwargs: Dict[str, Any],
+    vectors: Sequence[str] = (),
+) -> Tuple[int, List[Tuple[Any, ...]]]:
+    hardware: Dict[str, HardwareSignature] = {}
+    out: List[Tuple[Any, ...]] = []
+    for offset, point in enumerate(points):
+        hw = hardware.get(point.family)
+        if hw is None:
+            hw = hardware[point.family] = HardwareSignature.from_family(point.family)
+        res = run_dpd_sequence(
+            hw,
+            point.detuning_hz,
+            point.omega_hz,
+            point.d1_s,
+            point.probe_s,
+            point.d2_s,
+            rng=RNG(root_seed, key=(start + offset,)),
+            **run_kwargs,
+        )
+        out.append((res.phase, res.amp, *(getattr(res, name) for name in vectors)))
+    return start, out
+
+
+def run_sweep(
+    points: Sequence[SweepPoint],
+    *,
+    root_seed: int = 0,
+    workers: Optional[int] = None,
+    chunksize: Optional[int] = None,
+    progress: Optional[Callable[[int, int], None]] = None,
+    store=None,
+    **run_kwargs,
+) -> SweepTable:
+    """Run ``run_dpd_sequence`` for every point and gather a :class:`SweepTable`.
+
+    Points are submitted to a :class:`~concurrent.futures.ProcessPoolExecutor`
+    in chunks of ``chunksize`` (default: about four chunks per worker).
+    ``workers`` defaults to ``os.cpu_count()``; ``workers=1`` runs serially in
+    the calling process. ``progress(done, total)`` is called as chunks
+    finish. Remaining keyword arguments are forwarded to ``run_dpd_sequence``;
+    by default no state history is kept and demodulation is phase-only.
+
+    ``store`` takes a :class:`synqc.store.ResultWriter`; each point's vectors
+    are then appended as its chunk completes (parameters plus the grid
+    ``index``), so the vectors never accumulate in memory. The caller closes
+    the writer.
+    """
+
+    points = list(points)
+    total = len(points)
+    for point in points:
+        HardwareSignature.from_family(point.family)
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers < 1:
+        raise ValueError("workers must be >= 1")
+    if chunksize is None:
+        chunksize = max(1, -(-total // (workers * 4)))
+    if chunksize < 1:
+        raise ValueError("chunksize must be >= 1")
+    run_kwargs.setdefault("record_states", "none")
+    run_kwargs.setdefault("lazy_demod", True)
+
+    vectors = tuple(store.fields) if store is not None else ()
+    outcomes: List[Optional[Tuple[float, float]]] = [None] * total
+    chunks = [(start, points[start:start + chunksize]) for start in range(0, total, chunksize)]
+    done = 0
+
+    def _collect(start: int, values: List[Tuple[Any, ...]]) -> None:
+        nonlocal done
+        for offset, (phase, amp, *arrays) in enumerate(values):
+            index = start + offset
+            outcomes[index] = (phase, amp)
+            if store is not None:
+                point = points[index]
+                params = {"index": index, **{f: getattr(point, f) for f in _POINT_FIELDS}}
+                store.append(params, {"phase": phase, "amp": amp, **dict(zip(vectors, arrays))})
+        done += len(values)
+        if progress is not None:
+            progress(done, total)
+
+    if workers == 1 or len(chunks) <= 1:
+        for start, chunk in chunks:
+            _collect(*_run_chunk(start, chunk, root_seed, run_kwargs, vectors))
+    else:
+        with ProcessPoolExecutor(max_workers=min(workers, len(chunks))) as pool:
+            futures = [
+                pool.submit(_run_chunk, start, chunk, root_seed, run_kwargs, vectors)
+                for start, chunk in chunks
+            ]
+            for future in as_completed(futures):
+                _collect(*future.result())
+
+    columns: Dict[str, Tuple[Any, ...]] = {
+        "index": tuple(range(total)),
+        "detuning_hz": tuple(p.detuning_hz for p in points),
+        "omega_hz": tuple(p.omega_hz for p in points),
+        "d1_s": tuple(p.d1_s for p in points),
+        "probe_s": tuple(p.probe_s for p in points),
+        "d2_s": tuple(p.d2_s for p in points),
+        "family": tuple(p.family for p in points),
+        "phase": tuple(o[0] for o in outcomes),
+        "amp": tuple(o[1] for o in outcomes),
+    }
+    return SweepTable(columns)
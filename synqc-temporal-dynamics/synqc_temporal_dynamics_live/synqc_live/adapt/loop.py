@@ -2,20 +2,26 @@
 Adaptive calibration loop for SynQc Temporal Dynamics.
 
 This loop runs schedule → hardware → demodulation repeatedly and nudges
-the drive amplitudes toward a target probe amplitude.
+the drive amplitudes toward a target probe amplitude. Only the gain changes
+between iterations, so the schedule is rendered once and each iteration
+rescales the cached drive envelope. With ``chunk_samples`` set the loop
+instead streams the schedule through the backend block by block, so memory
+stays bounded for arbitrarily long schedules.
 """
 
 from __future__ import annotations
 
-from dataclasses import dataclass, field
-from typing import List
+from dataclasses import astuple, dataclass, field
+from typing import List, Optional
 
+import numpy as np
 import pandas as pd
 
 from ..config import SynQcConfig, PulseConfig
 from ..scheduler import Scheduler
-from ..hardware import SimulatedBackend
-from ..demod import demodulate_probes
+from ..timeline import CompiledSchedule
+from ..hardware import RenderedSchedule, SimulatedBackend
+from ..demod import DigitalDownConverter, demodulate_probes
 
 
 @dataclass
@@ -25,6 +31,23 @@ class AdaptiveLoop:
 
     The loop adjusts a global gain applied to all pulses such that the
     average probe amplitude approaches a configured target.
+
+    The schedule is rendered once at unit gain together with the backend's
+    drift and carrier; each iteration scales that drive by ``gain`` and adds
+    fresh noise. The render is rebuilt when anything it depends on changes
+    (config timing, scheduler, backend sample rate/LO/drift). When the
+    scheduler does not share ``config`` the gain cannot be applied by
+    rescaling, and every iteration runs the full schedule → backend →
+    demodulation path.
+
+    With ``chunk_samples`` set, nothing is cached: each iteration streams
+    the schedule through ``SimulatedBackend.iter_schedule`` and demodulates
+    and averages it block by block, matching the one-shot metric up to
+    summation rounding.
+
+    When ``config.demod_decimation`` is set, the probe amplitude is measured
+    on the down-converted, decimated baseband (see ``DigitalDownConverter``)
+    in every mode.
     """
 
     config: SynQcConfig
@@ -32,7 +55,10 @@ class AdaptiveLoop:
     backend: SimulatedBackend
     gain: float = 1.0
     learning_rate: float = 0.3
+    chunk_samples: Optional[int] = None
     _base_pulses: List[PulseConfig] = field(init=False, repr=False)
+    _rendered: Optional[RenderedSchedule] = field(default=None, init=False, repr=False)
+    _render_key: Optional[tuple] = field(default=None, init=False, repr=False)
 
     def __post_init__(self) -> None:
         # Snapshot baseline pulses so that gain is always applied relative
@@ -65,6 +91,139 @@ class AdaptiveLoop:
             )
         self.config.pulses = scaled
 
+    def _structure_key(self) -> Optional[tuple]:
+        """
+        Everything the unit-gain render depends on, or None when the gain
+        cannot be applied by rescaling a cached render.
+        """
+        if self.scheduler.config is not self.config:
+            return None
+        config = self.config
+        backend = self.backend
+        return (
+            id(self.scheduler),
+            config.cycle_duration_ns,
+            config.num_cycles,
+            self.scheduler.probe_strategy.every_n_cycles,
+            tuple(astuple(p) for p in self._base_pulses),
+            backend.sample_rate_hz,
+            backend.lo_frequency_hz,
+            backend.drift_rate,
+        )
+
+    def _cached_render(self) -> Optional[RenderedSchedule]:
+        key = self._structure_key()
+        if key is None:
+            return None
+        if self._rendered is None or key != self._render_key:
+            # Render the baseline pulses (gain 1); iterations rescale the drive.
+            self._rendered = self.backend.render(self._unit_schedule())
+            self._render_key = key
+        return self._rendered
+
+    def _unit_schedule(self) -> CompiledSchedule:
+        """
+        Compile the baseline pulses, leaving the applied gain in place.
+        """
+        applied = self.config.pulses
+        self.config.pulses = self._base_pulses
+        try:
+            return self.scheduler.compile()
+        finally:
+            self.config.pulses = applied
+
+    def _downconverter(self) -> Optional[DigitalDownConverter]:
+        """
+        A fresh down-converter for one measurement, or None without decimation.
+        """
+        if self.config.demod_decimation is None:
+            return None
+        return DigitalDownConverter(
+            self.config.lo_frequency_hz,
+            self.config.sample_rate_hz,
+            self.config.demod_decimation,
+        )
+
+    def _measure_rendered(self, rendered: RenderedSchedule) -> float:
+        """
+        Average probe amplitude of the cached render at the current gain.
+        """
+        I, Q = self.backend.synthesize(rendered, gain=self.gain)
+        is_probe = rendered.frame["is_probe"].to_numpy()
+        ddc = self._downconverter()
+        if ddc is None:
+            amplitude = np.sqrt(I * I + Q * Q)
+        else:
+            _, baseband, is_probe = ddc.process_arrays(
+                rendered.frame["t_s"].to_numpy(), I, Q, is_probe
+            )
+            amplitude = np.abs(baseband)
+
+        # Focus on probe regions if available
+        region = amplitude[is_probe] if is_probe.any() else amplitude
+        return float(region.mean())
+
+    def _measure_full(self) -> float:
+        """
+        Average probe amplitude from a full schedule → backend → demod pass.
+        """
+        schedule = self.scheduler.compile()
+        raw = self.backend.run_schedule(schedule)
+        demod = demodulate_probes(
+            raw,
+            lo_frequency_hz=self.config.lo_frequency_hz,
+            sample_rate_hz=self.config.sample_rate_hz,
+            decimation=self.config.demod_decimation,
+        )
+
+        if "amplitude" not in demod.columns:
+            raise RuntimeError("Demodulated DataFrame missing 'amplitude' column")
+
+        # Focus on probe regions if available
+        if "is_probe" in demod.columns and demod["is_probe"].any():
+            region = demod[demod["is_probe"]]
+        else:
+            region = demod
+
+        return float(region["amplitude"].mean())
+
+    def _measure_streamed(self) -> float:
+        """
+        Average probe amplitude accumulated over ``iter_schedule`` blocks.
+        """
+        if self._structure_key() is None:
+            # The scheduler does not follow config: run it as configured.
+            chunks = self.backend.iter_schedule(self.scheduler.compile(), self.chunk_samples)
+        else:
+            chunks = self.backend.iter_schedule(
+                self._unit_schedule(), self.chunk_samples, gain=self.gain
+            )
+
+        ddc = self._downconverter()
+        probe_sum = total_sum = 0.0
+        probe_count = total_count = 0
+        for raw in chunks:
+            if ddc is not None:
+                demod = ddc.process(raw)
+            else:
+                demod = demodulate_probes(
+                    raw,
+                    lo_frequency_hz=self.config.lo_frequency_hz,
+                    sample_rate_hz=self.config.sample_rate_hz,
+                    copy=False,
+                )
+            amplitude = demod["amplitude"].to_numpy()
+            is_probe = demod["is_probe"].to_numpy()
+            probe_sum += float(amplitude[is_probe].sum())
+            probe_count += int(is_probe.sum())
+            total_sum += float(amplitude.sum())
+            total_count += len(amplitude)
+
+        # Focus on probe regions if available
+        if probe_count:
+            return probe_sum / probe_count
+        return total_sum / total_count
+
     def run(self, num_iterations: int = 5) -> pd.DataFrame:
         """
         Run the adaptive loop for the requested number of iterations.
@@ -76,24 +235,15 @@ class AdaptiveLoop:
 
         for iteration in range(num_iterations):
             self._apply_gain()
-            schedule = self.scheduler.build_schedule()
-            raw = self.backend.run_schedule(schedule)
-            demod = demodulate_probes(
-                raw,
-                lo_frequency_hz=self.config.lo_frequency_hz,
-                sample_rate_hz=self.config.sample_rate_hz,
-            )
-
-            if "amplitude" not in demod.columns:
-                raise RuntimeError("Demodulated DataFrame missing 'amplitude' column")
-
-            # Focus on probe regions if available
-            if "is_probe" in demod.columns and demod["is_probe"].any():
-                region = demod[demod["is_probe"]]
+            if self.chunk_samples is not None:
+                avg_amp = self._measure_streamed()
             else:
-                region = demod
+                rendered = self._cached_render()
+                if rendered is None:
+                    avg_amp = self._measure_full()
+                else:
+                    avg_amp = self._measure_rendered(rendered)
 
-            avg_amp = float(region["amplitude"].mean())
             error = float(self.config.target_amplitude - avg_amp)
 
             # Update gain in the direction of the error
@@ -12,7 +12,7 @@ from __future__ import annotations
 
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 
 
 @dataclass
@@ -41,6 +41,7 @@ class SynQcConfig:
     target_amplitude: float = 1.0
     pulses: List[PulseConfig] = field(default_factory=list)
     probe_every_n_cycles: int = 4
+    demod_decimation: Optional[int] = None
 
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> "SynQcConfig":
@@ -53,6 +54,9 @@ class SynQcConfig:
             target_amplitude=float(data.get("target_amplitude", 1.0)),
             pulses=pulses,
             probe_every_n_cycles=int(data.get("probe_every_n_cycles", 4)),
+            demod_decimation=(
+                int(data["demod_decimation"]) if data.get("demod_decimation") is not None else None
+            ),
         )
 
 
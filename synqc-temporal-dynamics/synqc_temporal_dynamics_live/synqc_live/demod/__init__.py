@@ -2,6 +2,7 @@
 IQ demodulation utilities for SynQc Temporal Dynamics.
 """
 
+from .ddc import DigitalDownConverter, cic_taps
 from .iq import demodulate_probes
 
-__all__ = ["demodulate_probes"]
+__all__ = ["DigitalDownConverter", "cic_taps", "demodulate_probes"]
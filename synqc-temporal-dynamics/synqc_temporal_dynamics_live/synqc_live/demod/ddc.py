@@ -0,0 +1,169 @@
+"""
+Digital down-conversion for SynQc Temporal Dynamics.
+
+The simulated backend (like a real digitizer front end) produces I/Q
+up-converted by the LO. The down-converter mixes the samples back to
+baseband with ``exp(-j 2π f_LO t)``, low-pass filters them with a CIC
+response (``stages`` cascaded boxcars of ``decimation`` taps, unit DC gain)
+and keeps every ``decimation``-th output. Only the kept outputs are computed,
+as in a polyphase FIR decimator.
+
+Output sample ``m`` is the filter output at input sample
+``n = (m + 1) * decimation - 1``; its time stamps are those of input ``n``
+moved back by the filter's group delay, and it is marked ``is_probe`` only
+when every input sample in its filter support is a probe sample, so drive
+samples never leak into the probe mask.
+
+``DigitalDownConverter`` keeps the filter history between calls, so blocks
+from ``SimulatedBackend.iter_schedule`` can be processed one at a time with
+the same result as one call on the concatenated record.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+
+def cic_taps(decimation: int, stages: int = 3) -> np.ndarray:
+    """
+    FIR taps of a CIC decimator (``stages`` boxcars of ``decimation`` taps),
+    normalized to unit DC gain.
+    """
+    if decimation < 1:
+        raise ValueError("decimation must be >= 1")
+    if stages < 1:
+        raise ValueError("stages must be >= 1")
+    box = np.ones(decimation)
+    taps = np.ones(1)
+    for _ in range(stages):
+        taps = np.convolve(taps, box)
+    return taps / taps.sum()
+
+
+@dataclass
+class DigitalDownConverter:
+    """
+    Streaming mixer + CIC decimating low-pass.
+
+    Parameters
+    ----------
+    lo_frequency_hz : float
+        LO frequency removed by the mixer.
+    sample_rate_hz : float
+        Input sample rate in Hz; the output rate is ``sample_rate_hz / decimation``.
+    decimation : int
+        Decimation factor (1 mixes without filtering).
+    stages : int
+        Number of CIC stages; more stages give stronger alias rejection and
+        a longer filter support of ``stages * (decimation - 1) + 1`` samples.
+    """
+
+    lo_frequency_hz: float
+    sample_rate_hz: float
+    decimation: int
+    stages: int = 3
+    taps: np.ndarray = field(init=False, repr=False)
+    _history: np.ndarray = field(init=False, repr=False)
+    _history_probe: np.ndarray = field(init=False, repr=False)
+    _consumed: int = field(default=0, init=False, repr=False)
+    _produced: int = field(default=0, init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        self.taps = cic_taps(self.decimation, self.stages)
+        self.reset()
+
+    @property
+    def output_rate_hz(self) -> float:
+        return self.sample_rate_hz / self.decimation
+
+    def reset(self) -> None:
+        """
+        Clear the filter history, as if no samples had been processed.
+        """
+        support = len(self.taps) - 1
+        self._history = np.zeros(support, dtype=complex)
+        self._history_probe = np.zeros(support, dtype=bool)
+        self._consumed = 0
+        self._produced = 0
+
+    def process(self, raw_df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Down-convert the next block of ``raw_df`` (columns ``t_s``, ``I``,
+        ``Q`` and optionally ``is_probe``).
+
+        Returns a DataFrame at the output rate with columns ``t_s``,
+        ``t_ns``, ``is_probe``, ``I``, ``Q``, ``amplitude`` and ``phase_rad``,
+        indexed by output sample number across calls.
+        """
+        if "I" not in raw_df.columns or "Q" not in raw_df.columns:
+            raise ValueError("raw_df must contain 'I' and 'Q' columns")
+        if "t_s" not in raw_df.columns:
+            raise ValueError("raw_df must contain a 't_s' column for down-conversion")
+        if "is_probe" in raw_df.columns:
+            is_probe = raw_df["is_probe"].to_numpy(dtype=bool)
+        else:
+            is_probe = None
+
+        t_s, baseband, probe = self.process_arrays(
+            raw_df["t_s"].to_numpy(dtype=float),
+            raw_df["I"].to_numpy(dtype=float),
+            raw_df["Q"].to_numpy(dtype=float),
+            is_probe,
+        )
+        start = self._produced - len(t_s)
+        return pd.DataFrame(
+            {
+                "t_s": t_s,
+                "t_ns": t_s * 1e9,
+                "is_probe": probe,
+                "I": baseband.real,
+                "Q": baseband.imag,
+                "amplitude": np.abs(baseband),
+                "phase_rad": np.angle(baseband),
+            },
+            index=pd.RangeIndex(start, self._produced),
+        )
+
+    def process_arrays(
+        self,
+        t_s: np.ndarray,
+        I: np.ndarray,
+        Q: np.ndarray,
+        is_probe: Optional[np.ndarray] = None,
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Array form of ``process``: returns ``(t_s, baseband, is_probe)`` at
+        the output rate, ``baseband`` being complex.
+        """
+        if len(t_s) == 0:
+            return np.empty(0), np.empty(0, dtype=complex), np.empty(0, dtype=bool)
+
+        omega = 2.0 * np.pi * self.lo_frequency_hz
+        mixed = (I + 1j * Q) * np.exp(-1j * omega * t_s)
+        if is_probe is None:
+            is_probe = np.zeros(len(mixed), dtype=bool)
+
+        support = len(self.taps) - 1
+        signal = np.concatenate((self._history, mixed))
+        probe = np.concatenate((self._history_probe, is_probe))
+
+        # Positions (within this block) of the inputs that end a decimation
+        # period; the window for the output at block position k starts at k
+        # in the history-extended arrays.
+        first = (-self._consumed - 1) % self.decimation
+        keep = np.arange(first, len(mixed), self.decimation)
+        baseband = sliding_window_view(signal, len(self.taps))[keep] @ self.taps[::-1]
+        probe_out = sliding_window_view(probe, len(self.taps))[keep].all(axis=1)
+        t_out = t_s[keep] - 0.5 * support / self.sample_rate_hz
+
+        if support:
+            self._history = signal[-support:]
+            self._history_probe = probe[-support:]
+        self._consumed += len(mixed)
+        self._produced += len(keep)
+        return t_out, baseband, probe_out
@@ -4,16 +4,20 @@ IQ demodulation for SynQc Temporal Dynamics.
 For the initial live implementation, we assume the backend already produces
 I/Q samples at baseband. Demodulation therefore reduces to computing
 amplitude and phase time series, with probe regions preserved via the
-`is_probe` mask.
+`is_probe` mask. With a ``decimation`` factor the samples instead go through
+a digital down-converter (LO mixing and a CIC decimating low-pass, see
+``ddc.py``) and come out at the reduced rate.
 """
 
 from __future__ import annotations
 
-from typing import Any
+from typing import Any, Optional
 
 import numpy as np
 import pandas as pd
 
+from .ddc import DigitalDownConverter
+
 
 def demodulate_probes(
     raw_df: pd.DataFrame,
@@ -21,6 +25,8 @@ def demodulate_probes(
     sample_rate_hz: float,
     *,
     copy: bool = True,
+    decimation: Optional[int] = None,
+    stages: int = 3,
 ) -> pd.DataFrame:
     """
     Compute amplitude and phase from I/Q samples.
@@ -30,17 +36,35 @@ def demodulate_probes(
     raw_df : DataFrame
         Input DataFrame with columns at least ['I', 'Q'] and optionally 'is_probe'.
     lo_frequency_hz : float
-        Local oscillator frequency (currently unused, reserved for future refinements).
+        Local oscillator frequency removed when ``decimation`` is set.
     sample_rate_hz : float
-        Sample rate in Hz (currently unused, reserved for future refinements).
+        Sample rate in Hz of ``raw_df``, used when ``decimation`` is set.
     copy : bool
         Whether to copy the input DataFrame (default True).
+    decimation : Optional[int]
+        If given, down-convert with a ``DigitalDownConverter`` of this
+        decimation factor and ``stages`` CIC stages; ``raw_df`` must then
+        also have a 't_s' column.
+    stages : int
+        CIC stages of the down-converter (ignored without ``decimation``).
 
     Returns
     -------
     DataFrame
-        Same index as the input, with added 'amplitude' and 'phase_rad' columns.
+        Without ``decimation``: same index as the input, with added
+        'amplitude' and 'phase_rad' columns. With it: one row per output
+        sample ('t_s', 't_ns', 'is_probe', baseband 'I'/'Q', 'amplitude',
+        'phase_rad').
+
+    Without ``decimation`` every output sample depends only on the same
+    input sample, so blocks from ``SimulatedBackend.iter_schedule`` can be
+    demodulated one at a time; for a decimating stream, keep one
+    ``DigitalDownConverter`` and call its ``process`` per block.
     """
+    if decimation is not None:
+        ddc = DigitalDownConverter(lo_frequency_hz, sample_rate_hz, decimation, stages)
+        return ddc.process(raw_df)
+
     df = raw_df.copy() if copy else raw_df
 
     if "I" not in df.columns or "Q" not in df.columns:
@@ -55,12 +55,13 @@ class SynQcEngine:
         """
         Run a single schedule → backend → demodulation pass.
         """
-        schedule = self.scheduler.build_schedule()
+        schedule = self.scheduler.compile()
         raw = self.backend.run_schedule(schedule)
         return demodulate_probes(
             raw,
             lo_frequency_hz=self.config.lo_frequency_hz,
             sample_rate_hz=self.config.sample_rate_hz,
+            decimation=self.config.demod_decimation,
         )
 
     def run_adaptive(self, num_iterations: int = 5) -> pd.DataFrame:
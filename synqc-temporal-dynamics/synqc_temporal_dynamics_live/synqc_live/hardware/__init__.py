@@ -2,6 +2,6 @@
 Hardware backends for SynQc Temporal Dynamics.
 """
 
-from .sim_backend import SimulatedBackend
+from .sim_backend import RenderedSchedule, SimulatedBackend
 
-__all__ = ["SimulatedBackend"]
+__all__ = ["RenderedSchedule", "SimulatedBackend"]
@@ -4,17 +4,24 @@ Simulated hardware backend for SynQc Temporal Dynamics.
 This backend consumes a Schedule, renders it to a time series, and then
 produces synthetic I/Q data with configurable drift and noise. It is
 designed to be lightweight but realistic enough for pipeline testing.
+
+Noise is drawn in fixed blocks of ``NOISE_BLOCK_SAMPLES`` samples, each from
+its own generator keyed by ``(seed, block index)``, and the drift and LO are
+functions of absolute time. A schedule can therefore be executed in chunks
+(``iter_schedule``) with exactly the samples of a one-shot ``run_schedule``.
 """
 
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Optional
+from typing import Iterator, Optional, Tuple, Union
 
 import numpy as np
 import pandas as pd
 
-from ..timeline import Schedule
+from ..timeline import CompiledSchedule, Schedule
+
+NOISE_BLOCK_SAMPLES = 1 << 16
 
 
 @dataclass
@@ -45,28 +52,147 @@ class SimulatedBackend:
     noise_std: float = 0.02
     seed: Optional[int] = None
 
-    def run_schedule(self, schedule: Schedule) -> pd.DataFrame:
+    def run_schedule(self, schedule: Union[Schedule, CompiledSchedule]) -> pd.DataFrame:
+        """
+        Execute a schedule (explicit or compiled) and return a DataFrame with I/Q samples.
         """
-        Execute a schedule and return a DataFrame with I/Q samples.
+        rendered = self.render(schedule)
+        I, Q = self.synthesize(rendered)
+
+        df = rendered.frame
+        df["I"] = I
+        df["Q"] = Q
+
+        return df
+
+    def iter_schedule(
+        self,
+        schedule: Union[Schedule, CompiledSchedule],
+        chunk_samples: int = NOISE_BLOCK_SAMPLES,
+        *,
+        gain: float = 1.0,
+    ) -> Iterator[pd.DataFrame]:
         """
-        df = schedule.to_dataframe(self.sample_rate_hz)
+        Execute a schedule in blocks of at most ``chunk_samples`` rows.
 
-        rng = np.random.default_rng(self.seed)
+        Each block has the columns of ``run_schedule`` and is indexed by its
+        absolute sample numbers; concatenating the blocks reproduces
+        ``run_schedule`` (with the drive scaled by ``gain``) exactly, while
+        only one block and one noise block are held in memory.
+        """
+        noise = _BlockNoise(self.noise_std, self.seed)
+        for df in schedule.iter_frames(self.sample_rate_hz, chunk_samples):
+            rendered = self._render_frame(df, start=int(df.index[0]))
+            I, Q = self._synthesize(rendered, gain, noise)
+            df["I"] = I
+            df["Q"] = Q
+            yield df
+
+    def render(self, schedule: Union[Schedule, CompiledSchedule]) -> "RenderedSchedule":
+        """
+        Render a schedule and precompute everything that does not depend on
+        the drive scale or the noise: the drift envelope and the LO carrier.
+        """
+        return self._render_frame(schedule.to_dataframe(self.sample_rate_hz))
+
+    def _render_frame(self, df: pd.DataFrame, start: int = 0) -> "RenderedSchedule":
         t = df["t_s"].to_numpy(dtype=float)
-        drive = df["drive_amplitude"].to_numpy(dtype=float) * self.base_amplitude
 
-        # Slow envelope drift and Gaussian noise
+        # Slow envelope drift and the LO carrier used for up-conversion
         drift = 1.0 + self.drift_rate * np.sin(2.0 * np.pi * 0.1 * t)
-        noise = self.noise_std * rng.standard_normal(len(t))
+        omega = 2.0 * np.pi * self.lo_frequency_hz
+        return RenderedSchedule(
+            frame=df,
+            drive=df["drive_amplitude"].to_numpy(dtype=float),
+            drift=drift,
+            cos=np.cos(omega * t),
+            sin=np.sin(omega * t),
+            start=start,
+        )
+
+    def synthesize(
+        self, rendered: "RenderedSchedule", gain: float = 1.0
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Produce I/Q for a rendered schedule whose drive is scaled by ``gain``.
+
+        The envelope is linear in the drive, so re-running a schedule at a
+        new gain costs one multiply-add and a fresh noise draw. The noise is
+        re-seeded from ``seed`` on every call, as in ``run_schedule``.
+        """
+        return self._synthesize(rendered, gain, _BlockNoise(self.noise_std, self.seed))
 
-        envelope = drive * drift + noise
+    def _synthesize(
+        self, rendered: "RenderedSchedule", gain: float, noise: "_BlockNoise"
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        drive = rendered.drive
+        if gain != 1.0:
+            drive = drive * gain
+        drive = drive * self.base_amplitude
+
+        start = rendered.start
+        envelope = drive * rendered.drift + noise.draw(start, start + len(drive))
 
         # Up-convert to I/Q using the LO
-        omega = 2.0 * np.pi * self.lo_frequency_hz
-        I = envelope * np.cos(omega * t)
-        Q = envelope * np.sin(omega * t)
+        return envelope * rendered.cos, envelope * rendered.sin
 
-        df["I"] = I
-        df["Q"] = Q
 
-        return df
+class _BlockNoise:
+    """
+    Gaussian noise addressed by absolute sample index.
+
+    Sample ``k`` comes from block ``k // NOISE_BLOCK_SAMPLES``, whose
+    generator is spawned from the seed with the block index as spawn key, so
+    any range can be drawn without drawing the samples before it. The most
+    recent block is kept so that consecutive small chunks share one draw.
+    """
+
+    def __init__(self, noise_std: float, seed: Optional[int]):
+        self.noise_std = noise_std
+        self.seed_seq = np.random.SeedSequence(seed)
+        self._block = -1
+        self._values = np.empty(0)
+
+    def draw(self, start: int, stop: int) -> np.ndarray:
+        out = np.empty(stop - start)
+        pos = start
+        while pos < stop:
+            block, offset = divmod(pos, NOISE_BLOCK_SAMPLES)
+            needed = min(stop - block * NOISE_BLOCK_SAMPLES, NOISE_BLOCK_SAMPLES)
+            values = self._values_for(block, needed)
+            out[pos - start:pos - start + needed - offset] = values[offset:needed]
+            pos += needed - offset
+        return out
+
+    def _values_for(self, block: int, needed: int) -> np.ndarray:
+        # Generator output is prefix-stable, so a block is drawn only as far
+        # as it has been requested; it is redrawn at least doubled when a
+        # later chunk needs more, keeping small chunks linear overall.
+        if block != self._block or len(self._values) < needed:
+            if block == self._block:
+                needed = max(needed, min(2 * len(self._values), NOISE_BLOCK_SAMPLES))
+            seq = np.random.SeedSequence(
+                self.seed_seq.entropy, spawn_key=self.seed_seq.spawn_key + (block,)
+            )
+            self._values = self.noise_std * np.random.default_rng(seq).standard_normal(needed)
+            self._block = block
+        return self._values
+
+
+@dataclass
+class RenderedSchedule:
+    """
+    A schedule rendered for a SimulatedBackend.
+
+    ``frame`` is the schedule DataFrame; ``drive`` its drive amplitude
+    column, ``drift`` the slow envelope drift and ``cos``/``sin`` the LO
+    carrier, all sampled on the frame's time base. ``start`` is the absolute
+    index of the frame's first sample (non-zero for ``iter_schedule`` blocks).
+    """
+
+    frame: pd.DataFrame
+    drive: np.ndarray
+    drift: np.ndarray
+    cos: np.ndarray
+    sin: np.ndarray
+    start: int = 0
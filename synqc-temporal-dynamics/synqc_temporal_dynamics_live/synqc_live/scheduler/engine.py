@@ -8,7 +8,7 @@ from dataclasses import dataclass, field
 from typing import List
 
 from ..config import SynQcConfig, PulseConfig
-from ..timeline import Pulse, ProbeWindow, Schedule
+from ..timeline import CompiledSchedule, Pulse, Schedule
 from ..probes import ProbeStrategy
 
 
@@ -19,7 +19,8 @@ class Scheduler:
 
     This is a deliberately simple implementation that generates a fixed
     pattern of drive pulses per cycle and probe windows at the tail of
-    designated cycles.
+    designated cycles. ``compile()`` returns that pattern as a periodic
+    CompiledSchedule; ``build_schedule()`` expands it.
     """
 
     config: SynQcConfig
@@ -30,44 +31,43 @@ class Scheduler:
             every_n_cycles=self.config.probe_every_n_cycles
         )
 
-    def build_schedule(self) -> Schedule:
-        pulses: List[Pulse] = []
-        probes: List[ProbeWindow] = []
+    def compile(self) -> CompiledSchedule:
+        """
+        Build the schedule as one cycle template plus a repetition count.
 
+        Every cycle carries the same pulses, so the compiled form costs the
+        same for any ``num_cycles``; it renders by tiling the cycle and
+        expands to an explicit Schedule only on demand.
+        """
         cycle_ns = self.config.cycle_duration_ns
-        total_duration_ns = cycle_ns * self.config.num_cycles
-
-        for cycle in range(self.config.num_cycles):
-            cycle_start = cycle * cycle_ns
-            offset = 0.0
-
-            # Emit configured pulses within this cycle
-            for pc in self.config.pulses:
-                pulses.append(
-                    Pulse(
-                        start_ns=cycle_start + offset,
-                        duration_ns=pc.duration_ns,
-                        amplitude=pc.amplitude,
-                        phase_deg=pc.phase_deg,
-                        frequency_hz=pc.frequency_hz,
-                        label=f"{pc.label}_c{cycle}",
-                    )
-                )
-                offset += pc.duration_ns
+        pulses: List[Pulse] = []
+        offset = 0.0
 
-            # Optionally append a probe window at the tail of the cycle
-            if self.probe_strategy.is_probe_cycle(cycle):
-                probe_duration_ns = min(0.25 * cycle_ns, cycle_ns)
-                probes.append(
-                    ProbeWindow(
-                        start_ns=cycle_start + cycle_ns - probe_duration_ns,
-                        duration_ns=probe_duration_ns,
-                        label=f"probe_c{cycle}",
-                    )
+        # Configured pulses back to back from the cycle start
+        for pc in self.config.pulses:
+            pulses.append(
+                Pulse(
+                    start_ns=offset,
+                    duration_ns=pc.duration_ns,
+                    amplitude=pc.amplitude,
+                    phase_deg=pc.phase_deg,
+                    frequency_hz=pc.frequency_hz,
+                    label=pc.label,
                 )
+            )
+            offset += pc.duration_ns
 
-        return Schedule(
+        # Probe window at the tail of each probe cycle
+        return CompiledSchedule(
             pulses=pulses,
-            probes=probes,
-            total_duration_ns=total_duration_ns,
+            cycle_duration_ns=cycle_ns,
+            num_cycles=self.config.num_cycles,
+            probe_duration_ns=min(0.25 * cycle_ns, cycle_ns),
+            probe_every_n_cycles=self.probe_strategy.every_n_cycles,
         )
+
+    def build_schedule(self) -> Schedule:
+        """
+        Build the explicit schedule with one Pulse/ProbeWindow per cycle.
+        """
+        return self.compile().expand()
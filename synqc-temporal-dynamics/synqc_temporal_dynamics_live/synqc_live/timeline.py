@@ -2,13 +2,16 @@
 Timeline and schedule structures for SynQc Temporal Dynamics.
 
 This module defines the canonical timeline representation (pulses, probes,
-and the resulting sampled schedule).
+and the resulting sampled schedule), plus a compiled form for periodic
+schedules that stores a single cycle. Both forms can also be rendered in
+fixed-size row blocks (``iter_frames``) so arbitrarily long schedules never
+need a full-length time base in memory.
 """
 
 from __future__ import annotations
 
 from dataclasses import dataclass, field
-from typing import List
+from typing import Iterator, List, Optional, Tuple
 
 import numpy as np
 import pandas as pd
@@ -54,40 +57,415 @@ class Schedule:
         - drive_phase_deg: drive phase
         - is_probe: boolean mask for probe windows
         """
-        if self.total_duration_ns <= 0:
-            raise ValueError("total_duration_ns must be positive")
-
-        total_duration_s = self.total_duration_ns * 1e-9
-        dt = 1.0 / float(sample_rate_hz)
-        num_samples = int(total_duration_s / dt)
-        if num_samples <= 0:
-            raise ValueError("sample_rate_hz is too low for the requested duration")
-
-        t_s = np.arange(num_samples, dtype=float) * dt
-        t_ns = t_s * 1e9
-
-        df = pd.DataFrame({"t_s": t_s, "t_ns": t_ns})
-        df["drive_amplitude"] = 0.0
-        df["drive_phase_deg"] = 0.0
-        df["is_probe"] = False
-
-        # Paint pulses onto the drive amplitude and phase
-        for pulse in self.pulses:
-            mask = (df["t_ns"] >= pulse.start_ns) & (
-                df["t_ns"] < pulse.start_ns + pulse.duration_ns
-            )
-            if not mask.any():
-                continue
-            df.loc[mask, "drive_amplitude"] += pulse.amplitude
-            df.loc[mask, "drive_phase_deg"] = pulse.phase_deg
+        t_s, t_ns = _timebase(self.total_duration_ns, sample_rate_hz)
+        num_samples = len(t_s)
+
+        # Paint pulses onto the drive amplitude and phase. Each interval maps
+        # to a contiguous sample range because t_ns is sorted; pulses are
+        # applied in order so overlaps sum amplitudes and the last pulse
+        # wins the phase.
+        drive_amplitude = np.zeros(num_samples)
+        drive_phase_deg = np.zeros(num_samples)
+        lo, hi = _sample_ranges(
+            t_ns, [p.start_ns for p in self.pulses], [p.duration_ns for p in self.pulses]
+        )
+        _paint_pulses(drive_amplitude, drive_phase_deg, self.pulses, lo, hi)
 
         # Mark probe windows
-        for probe in self.probes:
-            mask = (df["t_ns"] >= probe.start_ns) & (
-                df["t_ns"] < probe.start_ns + probe.duration_ns
+        is_probe = np.zeros(num_samples, dtype=bool)
+        lo, hi = _sample_ranges(
+            t_ns, [p.start_ns for p in self.probes], [p.duration_ns for p in self.probes]
+        )
+        for a, b in zip(lo, hi):
+            is_probe[a:b] = True
+
+        return _frame(t_s, t_ns, drive_amplitude, drive_phase_deg, is_probe)
+
+    def iter_frames(self, sample_rate_hz: float, chunk_samples: int) -> Iterator[pd.DataFrame]:
+        """
+        Yield ``to_dataframe(sample_rate_hz)`` in consecutive blocks of at most
+        ``chunk_samples`` rows, each indexed by its absolute sample numbers.
+
+        Interval sample ranges are computed once by index arithmetic and swept
+        forward, so memory is bounded by the chunk plus the pulse list.
+        """
+        num_samples, dt = _timebase_size(self.total_duration_ns, sample_rate_hz)
+        chunk_samples = _check_chunk(chunk_samples)
+        pulses_lo, pulses_hi = _interval_indices(
+            [p.start_ns for p in self.pulses], [p.duration_ns for p in self.pulses], dt, num_samples
+        )
+        probes_lo, probes_hi = _interval_indices(
+            [p.start_ns for p in self.probes], [p.duration_ns for p in self.probes], dt, num_samples
+        )
+        chunks = range(0, num_samples, chunk_samples)
+        active_pulses = _sweep(pulses_lo, pulses_hi, chunks, chunk_samples, num_samples)
+        active_probes = _sweep(probes_lo, probes_hi, chunks, chunk_samples, num_samples)
+        for start, pulse_ids, probe_ids in zip(chunks, active_pulses, active_probes):
+            stop = min(start + chunk_samples, num_samples)
+            drive_amplitude = np.zeros(stop - start)
+            drive_phase_deg = np.zeros(stop - start)
+            _paint_pulses(
+                drive_amplitude,
+                drive_phase_deg,
+                [self.pulses[i] for i in pulse_ids],
+                pulses_lo[pulse_ids],
+                pulses_hi[pulse_ids],
+                start,
+            )
+            is_probe = np.zeros(stop - start, dtype=bool)
+            _mark(is_probe, probes_lo[probe_ids], probes_hi[probe_ids], start)
+            yield _block(start, stop, dt, drive_amplitude, drive_phase_deg, is_probe)
+
+
+@dataclass
+class CompiledSchedule:
+    """
+    A periodic schedule stored as a single cycle template.
+
+    ``pulses`` are positioned relative to the start of a cycle. The cycle
+    repeats ``num_cycles`` times every ``cycle_duration_ns``; cycles where
+    ``cycle % probe_every_n_cycles == 0`` end with a probe window of
+    ``probe_duration_ns`` (none when ``probe_every_n_cycles <= 0``). Building
+    one costs the same for any ``num_cycles``; ``expand()`` returns the
+    equivalent explicit Schedule, with labels suffixed by ``_c{cycle}``.
+    """
+
+    pulses: List[Pulse] = field(default_factory=list)
+    cycle_duration_ns: float = 0.0
+    num_cycles: int = 0
+    probe_duration_ns: float = 0.0
+    probe_every_n_cycles: int = 0
+    probe_label: str = "probe"
+
+    @property
+    def total_duration_ns(self) -> float:
+        return self.cycle_duration_ns * self.num_cycles
+
+    def is_probe_cycle(self, cycle_index: int) -> bool:
+        if self.probe_every_n_cycles <= 0:
+            return False
+        return (cycle_index % self.probe_every_n_cycles) == 0
+
+    def expand(self) -> Schedule:
+        """
+        Materialize one Pulse/ProbeWindow per cycle as an explicit Schedule.
+        """
+        pulses: List[Pulse] = []
+        probes: List[ProbeWindow] = []
+        for cycle in range(self.num_cycles):
+            cycle_start = cycle * self.cycle_duration_ns
+            for pulse in self.pulses:
+                pulses.append(
+                    Pulse(
+                        start_ns=cycle_start + pulse.start_ns,
+                        duration_ns=pulse.duration_ns,
+                        amplitude=pulse.amplitude,
+                        phase_deg=pulse.phase_deg,
+                        frequency_hz=pulse.frequency_hz,
+                        label=f"{pulse.label}_c{cycle}",
+                    )
+                )
+            if self.is_probe_cycle(cycle):
+                probes.append(
+                    ProbeWindow(
+                        start_ns=cycle_start + self.cycle_duration_ns - self.probe_duration_ns,
+                        duration_ns=self.probe_duration_ns,
+                        label=f"{self.probe_label}_c{cycle}",
+                    )
+                )
+        return Schedule(
+            pulses=pulses,
+            probes=probes,
+            total_duration_ns=self.total_duration_ns,
+        )
+
+    def to_dataframe(self, sample_rate_hz: float) -> pd.DataFrame:
+        """
+        Render the same DataFrame as ``expand().to_dataframe(sample_rate_hz)``.
+
+        When every cycle's intervals land on the first cycle's sample ranges
+        shifted by a whole number of samples, one cycle (and one probe period)
+        is rendered and tiled. Otherwise, e.g. when the cycle length is not a
+        whole number of samples, the schedule is expanded and painted.
+        """
+        t_s, t_ns = _timebase(self.total_duration_ns, sample_rate_hz)
+        columns = self._tile(t_ns, sample_rate_hz)
+        if columns is None:
+            return self.expand().to_dataframe(sample_rate_hz)
+        return _frame(t_s, t_ns, *columns)
+
+    def iter_frames(self, sample_rate_hz: float, chunk_samples: int) -> Iterator[pd.DataFrame]:
+        """
+        Yield ``to_dataframe(sample_rate_hz)`` in consecutive blocks of at most
+        ``chunk_samples`` rows, each indexed by its absolute sample numbers.
+
+        Each block only visits the cycles whose intervals can reach it, so
+        time and memory per block do not depend on ``num_cycles``.
+        """
+        num_samples, dt = _timebase_size(self.total_duration_ns, sample_rate_hz)
+        chunk_samples = _check_chunk(chunk_samples)
+        cycle_ns = self.cycle_duration_ns
+        offsets = np.array([p.start_ns for p in self.pulses], dtype=float)
+        durations = np.array([p.duration_ns for p in self.pulses], dtype=float)
+        for start in range(0, num_samples, chunk_samples):
+            stop = min(start + chunk_samples, num_samples)
+            t_first = start * dt * 1e9
+            t_last = (stop - 1) * dt * 1e9
+
+            # Drive: every (cycle, pulse) pair in expand() order.
+            drive_amplitude = np.zeros(stop - start)
+            drive_phase_deg = np.zeros(stop - start)
+            if len(self.pulses):
+                cycles = self._cycles_near(
+                    t_first - float((offsets + durations).max()), t_last - float(offsets.min())
+                )
+                starts = cycles[:, None] * cycle_ns + offsets
+                lo, hi = _interval_indices(
+                    starts.ravel(), np.broadcast_to(durations, starts.shape).ravel(), dt, num_samples
+                )
+                keep = np.nonzero((lo < stop) & (hi > start))[0]
+                pulses = [self.pulses[i % len(self.pulses)] for i in keep]
+                _paint_pulses(drive_amplitude, drive_phase_deg, pulses, lo[keep], hi[keep], start)
+
+            # Probe windows at the tail of probe cycles.
+            is_probe = np.zeros(stop - start, dtype=bool)
+            if self.probe_every_n_cycles > 0:
+                cycles = self._cycles_near(t_first - cycle_ns, t_last)
+                cycles = cycles[cycles % self.probe_every_n_cycles == 0]
+                starts = (cycles * cycle_ns + cycle_ns) - self.probe_duration_ns
+                lo, hi = _interval_indices(
+                    starts, np.full(len(cycles), self.probe_duration_ns), dt, num_samples
+                )
+                _mark(is_probe, lo, hi, start)
+
+            yield _block(start, stop, dt, drive_amplitude, drive_phase_deg, is_probe)
+
+    def _cycles_near(self, first_ns: float, last_ns: float) -> np.ndarray:
+        """
+        Indices of the cycles starting within ``[first_ns, last_ns]``, padded
+        by one cycle on each side to absorb rounding.
+        """
+        cycle_ns = self.cycle_duration_ns
+        lo = max(int(np.floor(first_ns / cycle_ns)) - 1, 0)
+        hi = min(int(np.floor(last_ns / cycle_ns)) + 2, self.num_cycles)
+        return np.arange(lo, max(lo, hi))
+
+    def _tile(
+        self, t_ns: np.ndarray, sample_rate_hz: float
+    ) -> Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]]:
+        num_samples = len(t_ns)
+        cycles = self.num_cycles
+        per_cycle = int(round(self.cycle_duration_ns * 1e-9 * float(sample_rate_hz)))
+        if per_cycle <= 0 or cycles * per_cycle < num_samples:
+            return None
+
+        # Drive: the sample ranges of every cycle, checked against cycle 0.
+        index = np.arange(cycles)
+        starts = index[:, None] * self.cycle_duration_ns + np.array(
+            [p.start_ns for p in self.pulses], dtype=float
+        )
+        durations = np.broadcast_to(
+            np.array([p.duration_ns for p in self.pulses], dtype=float), starts.shape
+        )
+        lo, hi = _sample_ranges(t_ns, starts.ravel(), durations.ravel())
+        lo = lo.reshape(starts.shape)
+        hi = hi.reshape(starts.shape)
+        if not _is_periodic(lo, hi, index * per_cycle, per_cycle, num_samples):
+            return None
+        amplitude = np.zeros(per_cycle)
+        phase = np.zeros(per_cycle)
+        _paint_pulses(amplitude, phase, self.pulses, lo[0], hi[0])
+
+        # Probes: one window per probe period.
+        every = self.probe_every_n_cycles
+        if every <= 0:
+            is_probe = np.zeros(num_samples, dtype=bool)
+        else:
+            probe_cycles = index[::every]
+            starts = (
+                probe_cycles[:, None] * self.cycle_duration_ns + self.cycle_duration_ns
+            ) - self.probe_duration_ns
+            lo, hi = _sample_ranges(
+                t_ns, starts.ravel(), np.full(len(probe_cycles), self.probe_duration_ns)
             )
-            if not mask.any():
-                continue
-            df.loc[mask, "is_probe"] = True
+            lo = lo.reshape(starts.shape)
+            hi = hi.reshape(starts.shape)
+            if not _is_periodic(lo, hi, probe_cycles * per_cycle, per_cycle, num_samples):
+                return None
+            block = np.zeros(every * per_cycle, dtype=bool)
+            block[lo[0, 0]:hi[0, 0]] = True
+            is_probe = np.tile(block, len(probe_cycles))[:num_samples]
 
-        return df
+        return (
+            np.tile(amplitude, cycles)[:num_samples],
+            np.tile(phase, cycles)[:num_samples],
+            is_probe,
+        )
+
+
+def _timebase_size(total_duration_ns: float, sample_rate_hz: float) -> Tuple[int, float]:
+    if total_duration_ns <= 0:
+        raise ValueError("total_duration_ns must be positive")
+
+    total_duration_s = total_duration_ns * 1e-9
+    dt = 1.0 / float(sample_rate_hz)
+    num_samples = int(total_duration_s / dt)
+    if num_samples <= 0:
+        raise ValueError("sample_rate_hz is too low for the requested duration")
+    return num_samples, dt
+
+
+def _timebase(total_duration_ns: float, sample_rate_hz: float) -> Tuple[np.ndarray, np.ndarray]:
+    num_samples, dt = _timebase_size(total_duration_ns, sample_rate_hz)
+    t_s = np.arange(num_samples, dtype=float) * dt
+    return t_s, t_s * 1e9
+
+
+def _check_chunk(chunk_samples: int) -> int:
+    chunk_samples = int(chunk_samples)
+    if chunk_samples <= 0:
+        raise ValueError("chunk_samples must be positive")
+    return chunk_samples
+
+
+def _frame(
+    t_s: np.ndarray,
+    t_ns: np.ndarray,
+    drive_amplitude: np.ndarray,
+    drive_phase_deg: np.ndarray,
+    is_probe: np.ndarray,
+    index: Optional[pd.RangeIndex] = None,
+) -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "t_s": t_s,
+            "t_ns": t_ns,
+            "drive_amplitude": drive_amplitude,
+            "drive_phase_deg": drive_phase_deg,
+            "is_probe": is_probe,
+        },
+        index=index,
+    )
+
+
+def _block(
+    start: int,
+    stop: int,
+    dt: float,
+    drive_amplitude: np.ndarray,
+    drive_phase_deg: np.ndarray,
+    is_probe: np.ndarray,
+) -> pd.DataFrame:
+    # Same expressions as _timebase, so blocks concatenate to the full frame.
+    t_s = np.arange(start, stop, dtype=float) * dt
+    return _frame(
+        t_s, t_s * 1e9, drive_amplitude, drive_phase_deg, is_probe, pd.RangeIndex(start, stop)
+    )
+
+
+def _paint_pulses(
+    amplitude: np.ndarray,
+    phase: np.ndarray,
+    pulses: List[Pulse],
+    lo: np.ndarray,
+    hi: np.ndarray,
+    offset: int = 0,
+) -> None:
+    """
+    Paint pulses in order onto buffers that start at sample ``offset``.
+    """
+    n = len(amplitude)
+    for pulse, a, b in zip(pulses, lo, hi):
+        a = max(a - offset, 0)
+        b = min(b - offset, n)
+        if a < b:
+            amplitude[a:b] += pulse.amplitude
+            phase[a:b] = pulse.phase_deg
+
+
+def _mark(is_probe: np.ndarray, lo: np.ndarray, hi: np.ndarray, offset: int) -> None:
+    n = len(is_probe)
+    for a, b in zip(lo, hi):
+        is_probe[max(a - offset, 0):max(min(b - offset, n), 0)] = True
+
+
+def _sample_index(times_ns: np.ndarray, dt: float, num_samples: int) -> np.ndarray:
+    """
+    First sample k in ``[0, num_samples]`` with ``k * dt * 1e9 >= time``.
+
+    Equivalent to ``np.searchsorted(t_ns, times_ns)`` on the full time base
+    without materializing it: an arithmetic guess corrected by the exact
+    sample-time expression.
+    """
+    times = np.asarray(times_ns, dtype=float)
+    guess = np.ceil(times / (dt * 1e9))
+    k = np.clip(np.nan_to_num(guess, nan=0.0), 0, num_samples).astype(np.int64)
+    while True:
+        back = (k > 0) & ((k - 1) * dt * 1e9 >= times)
+        if not back.any():
+            break
+        k[back] -= 1
+    while True:
+        ahead = (k < num_samples) & (k * dt * 1e9 < times)
+        if not ahead.any():
+            break
+        k[ahead] += 1
+    return k
+
+
+def _interval_indices(
+    starts_ns, durations_ns, dt: float, num_samples: int
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    ``_sample_ranges`` for a time base described by ``dt`` and its length.
+    """
+    starts = np.asarray(starts_ns, dtype=float)
+    stops = starts + np.asarray(durations_ns, dtype=float)
+    return _sample_index(starts, dt, num_samples), _sample_index(stops, dt, num_samples)
+
+
+def _sweep(
+    lo: np.ndarray, hi: np.ndarray, chunks: range, chunk_samples: int, num_samples: int
+) -> Iterator[np.ndarray]:
+    """
+    For consecutive chunks, yield the (ascending) indices of the intervals
+    ``[lo, hi)`` overlapping each chunk.
+    """
+    order = np.argsort(lo, kind="stable")
+    cursor = 0
+    active: List[int] = []
+    for start in chunks:
+        stop = min(start + chunk_samples, num_samples)
+        while cursor < len(order) and lo[order[cursor]] < stop:
+            active.append(int(order[cursor]))
+            cursor += 1
+        active = [i for i in active if hi[i] > start]
+        yield np.array(sorted(active), dtype=np.int64)
+
+
+def _is_periodic(
+    lo: np.ndarray, hi: np.ndarray, shifts: np.ndarray, period: int, num_samples: int
+) -> bool:
+    """
+    True when row k of ``lo``/``hi`` equals row 0 shifted by ``shifts[k]``
+    (clipped to the timeline) and row 0 stays within one period.
+    """
+    if not np.all(hi[0] <= period):
+        return False
+    expected_lo = np.minimum(lo[0] + shifts[:, None], num_samples)
+    expected_hi = np.minimum(hi[0] + shifts[:, None], num_samples)
+    return bool(np.array_equal(lo, expected_lo) and np.array_equal(hi, expected_hi))
+
+
+def _sample_ranges(
+    t_ns: np.ndarray, starts_ns: List[float], durations_ns: List[float]
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Map intervals [start, start + duration) to half-open sample index ranges.
+
+    ``t_ns`` must be sorted; sample k lies in an interval exactly when
+    ``lo <= k < hi``, matching ``(t_ns >= start) & (t_ns < start + duration)``.
+    """
+    starts = np.asarray(starts_ns, dtype=float)
+    stops = starts + np.asarray(durations_ns, dtype=float)
+    return np.searchsorted(t_ns, starts, side="left"), np.searchsorted(t_ns, stops, side="left")
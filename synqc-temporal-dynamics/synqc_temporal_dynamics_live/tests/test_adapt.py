@@ -0,0 +1,87 @@
+"""Tests for the adaptive calibration loop."""
+
+from pathlib import Path
+import sys
+
+import pytest
+
+pd = pytest.importorskip("pandas")
+pytest.importorskip("numpy")
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from synqc_live.adapt import AdaptiveLoop
+from synqc_live.demod import demodulate_probes
+from synqc_live.hardware import SimulatedBackend
+from synqc_live.runtime import build_quickstart_config
+from synqc_live.scheduler import Scheduler
+
+
+def _reference_run(num_iterations, gain=1.0, learning_rate=0.3, **overrides):
+    """Full schedule → backend → demod pass per iteration, as the loop specifies."""
+    config = build_quickstart_config(**overrides)
+    base = [p.amplitude for p in config.pulses]
+    backend = SimulatedBackend(config.lo_frequency_hz, config.sample_rate_hz, seed=5)
+    gains = []
+    for _ in range(num_iterations):
+        for pulse, amplitude in zip(config.pulses, base):
+            pulse.amplitude = amplitude * gain
+        raw = backend.run_schedule(Scheduler(config=config).build_schedule())
+        demod = demodulate_probes(raw, config.lo_frequency_hz, config.sample_rate_hz)
+        avg = float(demod[demod["is_probe"]]["amplitude"].mean())
+        gain += learning_rate * (config.target_amplitude - avg)
+        gains.append(gain)
+    return gains
+
+
+def test_cached_render_matches_full_pipeline() -> None:
+    config = build_quickstart_config(num_cycles=12)
+    loop = AdaptiveLoop(
+        config=config,
+        scheduler=Scheduler(config=config),
+        backend=SimulatedBackend(config.lo_frequency_hz, config.sample_rate_hz, seed=5),
+    )
+    result = loop.run(num_iterations=4)
+    assert result["gain"].tolist() == _reference_run(4, num_cycles=12)
+    # The last iteration's gain is still applied to the configured pulses.
+    assert config.pulses[0].amplitude == result["gain"].iloc[-2]
+
+    # Structural changes invalidate the cached render.
+    rendered = loop._rendered
+    config.num_cycles = 6
+    loop.run(num_iterations=1)
+    assert loop._rendered is not rendered
+    assert len(loop._rendered.drive) == 6000
+
+
+def test_streamed_loop_matches_cached_render() -> None:
+    gains = []
+    for chunk_samples in (None, 3000):
+        config = build_quickstart_config(num_cycles=100)
+        loop = AdaptiveLoop(
+            config=config,
+            scheduler=Scheduler(config=config),
+            backend=SimulatedBackend(config.lo_frequency_hz, config.sample_rate_hz, seed=5),
+            chunk_samples=chunk_samples,
+        )
+        gains.append(loop.run(num_iterations=3)["gain"].tolist())
+    assert gains[1] == pytest.approx(gains[0], rel=1e-12)
+    assert loop._rendered is None
+
+
+def test_decimated_metric_is_consistent_across_modes() -> None:
+    averages = []
+    for chunk_samples in (None, 3000):
+        config = build_quickstart_config(num_cycles=40)
+        config.demod_decimation = 16
+        loop = AdaptiveLoop(
+            config=config,
+            scheduler=Scheduler(config=config),
+            backend=SimulatedBackend(config.lo_frequency_hz, config.sample_rate_hz, seed=5),
+            chunk_samples=chunk_samples,
+        )
+        averages.append(loop.run(num_iterations=2)["avg_probe_amplitude"].tolist())
+    assert averages[1] == pytest.approx(averages[0], rel=1e-9)
+    # Filtering averages the probe-window noise down well below its raw level.
+    assert averages[0][0] < 0.5 * loop.backend.noise_std
@@ -0,0 +1,87 @@
+"""Tests for IQ demodulation and digital down-conversion."""
+
+from pathlib import Path
+import sys
+
+import pytest
+
+np = pytest.importorskip("numpy")
+pd = pytest.importorskip("pandas")
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from synqc_live.config import SynQcConfig
+from synqc_live.demod import DigitalDownConverter, cic_taps, demodulate_probes
+from synqc_live.hardware import SimulatedBackend
+from synqc_live.runtime import build_quickstart_config
+from synqc_live.scheduler import Scheduler
+
+
+def test_cic_taps() -> None:
+    taps = cic_taps(4, stages=3)
+    assert len(taps) == 3 * (4 - 1) + 1
+    assert taps.sum() == pytest.approx(1.0)
+    np.testing.assert_array_equal(taps, taps[::-1])
+    np.testing.assert_array_equal(cic_taps(1), [1.0])
+
+
+def test_ddc_recovers_envelope_and_decimates_probe_mask() -> None:
+    config = build_quickstart_config(num_cycles=20)
+    schedule = Scheduler(config=config).compile()
+    backend = SimulatedBackend(config.lo_frequency_hz, config.sample_rate_hz, noise_std=0.0, seed=0)
+    raw = backend.run_schedule(schedule)
+
+    decimation = 16
+    out = demodulate_probes(raw, config.lo_frequency_hz, config.sample_rate_hz, decimation=decimation)
+    assert len(out) == len(raw) // decimation
+    assert list(out.columns) == ["t_s", "t_ns", "is_probe", "I", "Q", "amplitude", "phase_rad"]
+
+    # Output m is the filter output at input n = (m + 1) * R - 1 over a
+    # support of L taps: compare with the envelope there.
+    support = len(cic_taps(decimation))
+    ends = np.arange(decimation - 1, len(raw), decimation)
+    drive = raw["drive_amplitude"].to_numpy()
+    t = raw["t_s"].to_numpy()
+    drift = 1.0 + backend.drift_rate * np.sin(2.0 * np.pi * 0.1 * t)
+    envelope = np.convolve(drive * drift, cic_taps(decimation))[: len(raw)][ends]
+    np.testing.assert_allclose(out["I"].to_numpy(), envelope, atol=1e-12)
+    np.testing.assert_allclose(out["Q"].to_numpy(), 0.0, atol=1e-12)
+
+    probe = raw["is_probe"].to_numpy()
+    expected = np.array([n >= support - 1 and probe[n - support + 1 : n + 1].all() for n in ends])
+    np.testing.assert_array_equal(out["is_probe"].to_numpy(), expected)
+    assert out["is_probe"].any()
+    assert out.loc[out["is_probe"], "amplitude"].max() < 1e-12
+
+
+def test_streamed_ddc_matches_one_shot() -> None:
+    config = build_quickstart_config(num_cycles=40)
+    schedule = Scheduler(config=config).compile()
+    backend = SimulatedBackend(config.lo_frequency_hz, config.sample_rate_hz, seed=1)
+    one_shot = demodulate_probes(
+        backend.run_schedule(schedule), config.lo_frequency_hz, config.sample_rate_hz, decimation=10
+    )
+    ddc = DigitalDownConverter(config.lo_frequency_hz, config.sample_rate_hz, 10)
+    streamed = pd.concat([ddc.process(block) for block in backend.iter_schedule(schedule, 777)])
+    pd.testing.assert_frame_equal(streamed, one_shot, rtol=1e-12, atol=1e-15)
+
+
+def test_ddc_input_edge_cases() -> None:
+    ddc = DigitalDownConverter(50e6, 1e9, 8)
+    empty = ddc.process(pd.DataFrame({"t_s": [], "I": [], "Q": [], "is_probe": []}))
+    assert len(empty) == 0
+    assert list(empty.columns) == ["t_s", "t_ns", "is_probe", "I", "Q", "amplitude", "phase_rad"]
+    with pytest.raises(ValueError, match="t_s"):
+        demodulate_probes(pd.DataFrame({"I": [1.0], "Q": [0.0]}), 50e6, 1e9, decimation=8)
+
+
+def test_config_demod_decimation() -> None:
+    data = {
+        "sample_rate_hz": 1e9,
+        "lo_frequency_hz": 50e6,
+        "cycle_duration_ns": 1000.0,
+        "num_cycles": 4,
+    }
+    assert SynQcConfig.from_dict(data).demod_decimation is None
+    assert SynQcConfig.from_dict({**data, "demod_decimation": 8}).demod_decimation == 8
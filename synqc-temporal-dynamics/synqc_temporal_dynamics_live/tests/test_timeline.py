@@ -0,0 +1,96 @@
+"""Tests for rendering schedules into sampled DataFrames."""
+
+from pathlib import Path
+import sys
+
+import pytest
+
+np = pytest.importorskip("numpy")
+pd = pytest.importorskip("pandas")
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from synqc_live.config import PulseConfig
+from synqc_live.hardware import SimulatedBackend
+from synqc_live.runtime import build_quickstart_config
+from synqc_live.scheduler import Scheduler
+from synqc_live.timeline import Pulse, ProbeWindow, Schedule
+
+
+def test_to_dataframe_paints_overlapping_intervals() -> None:
+    schedule = Schedule(
+        pulses=[
+            Pulse(start_ns=0.0, duration_ns=50.0, amplitude=0.3, phase_deg=10.0, frequency_hz=1e6),
+            Pulse(start_ns=20.0, duration_ns=100.0, amplitude=0.1, phase_deg=45.0, frequency_hz=1e6),
+            Pulse(start_ns=90.0, duration_ns=3.0, amplitude=0.7, phase_deg=90.0, frequency_hz=1e6),
+            Pulse(start_ns=500.0, duration_ns=10.0, amplitude=1.0, phase_deg=1.0, frequency_hz=1e6),
+        ],
+        probes=[ProbeWindow(start_ns=10.0, duration_ns=40.0), ProbeWindow(start_ns=30.0, duration_ns=70.0)],
+        total_duration_ns=200.0,
+    )
+    df = schedule.to_dataframe(3.3e8)
+
+    t_ns = df["t_ns"].to_numpy()
+    amplitude = np.zeros(len(df))
+    phase = np.zeros(len(df))
+    for pulse in schedule.pulses:
+        mask = (t_ns >= pulse.start_ns) & (t_ns < pulse.start_ns + pulse.duration_ns)
+        amplitude[mask] += pulse.amplitude
+        phase[mask] = pulse.phase_deg
+    is_probe = np.zeros(len(df), dtype=bool)
+    for probe in schedule.probes:
+        is_probe |= (t_ns >= probe.start_ns) & (t_ns < probe.start_ns + probe.duration_ns)
+
+    assert list(df.columns) == ["t_s", "t_ns", "drive_amplitude", "drive_phase_deg", "is_probe"]
+    np.testing.assert_array_equal(df["drive_amplitude"].to_numpy(), amplitude)
+    np.testing.assert_array_equal(df["drive_phase_deg"].to_numpy(), phase)
+    np.testing.assert_array_equal(df["is_probe"].to_numpy(), is_probe)
+    assert df["is_probe"].dtype == bool
+
+
+def test_compiled_schedule_matches_expanded() -> None:
+    for cycle_ns, sample_rate_hz in ((1000.0, 1e9), (1000.0, 1.7e9), (777.7, 1e9)):
+        config = build_quickstart_config(num_cycles=9, cycle_duration_ns=cycle_ns, probe_every_n_cycles=3)
+        scheduler = Scheduler(config=config)
+        compiled = scheduler.compile()
+        assert compiled.total_duration_ns == 9 * cycle_ns
+        expanded = compiled.expand()
+        assert expanded == scheduler.build_schedule()
+        assert [p.label for p in expanded.probes] == ["probe_c0", "probe_c3", "probe_c6"]
+        pd.testing.assert_frame_equal(
+            compiled.to_dataframe(sample_rate_hz),
+            expanded.to_dataframe(sample_rate_hz),
+            check_exact=True,
+        )
+
+
+def test_iter_frames_concatenate_to_full_render() -> None:
+    config = build_quickstart_config(num_cycles=11, cycle_duration_ns=777.7, probe_every_n_cycles=3)
+    # A pulse longer than the cycle spills into the next ones.
+    config.pulses.append(PulseConfig("long", 0.25, 60.0, 1e6, 1200.0))
+    compiled = Scheduler(config=config).compile()
+    expanded = compiled.expand()
+    for sample_rate_hz in (1e9, 3.3e8):
+        full = expanded.to_dataframe(sample_rate_hz)
+        for chunk_samples in (97, 1000, len(full) + 5):
+            for schedule in (compiled, expanded):
+                blocks = list(schedule.iter_frames(sample_rate_hz, chunk_samples))
+                assert max(len(b) for b in blocks) <= chunk_samples
+                pd.testing.assert_frame_equal(pd.concat(blocks), full, check_exact=True)
+
+
+def test_iter_schedule_matches_run_schedule() -> None:
+    config = build_quickstart_config(num_cycles=150)
+    compiled = Scheduler(config=config).compile()
+    backend = SimulatedBackend(config.lo_frequency_hz, config.sample_rate_hz, seed=3)
+    full = backend.run_schedule(compiled)
+    # Chunks smaller than, straddling and larger than a noise block.
+    for chunk_samples in (1000, 7777, 100_000):
+        streamed = pd.concat(list(backend.iter_schedule(compiled, chunk_samples)))
+        pd.testing.assert_frame_equal(streamed, full, check_exact=True)
+
+    I, Q = backend.synthesize(backend.render(compiled), gain=1.7)
+    scaled = pd.concat(list(backend.iter_schedule(compiled, 5000, gain=1.7)))
+    np.testing.assert_array_equal(scaled["I"].to_numpy(), I)
+    np.testing.assert_array_equal(scaled["Q"].to_numpy(), Q)
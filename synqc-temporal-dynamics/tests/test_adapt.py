@@ -0,0 +1,70 @@
+import unittest
+
+try:
+    import numpy as np
+except ModuleNotFoundError:  # pragma: no cover - environment-specific
+    np = None
+
+from synqc.adapt import KalmanBank, ScalarKalman
+
+
+@unittest.skipUnless(np is not None, "numpy is required for KalmanBank")
+class TestKalmanBank(unittest.TestCase):
+    def test_dim1_matches_scalar_filters(self):
+        qs = [1e7, 2e7, 5e7]
+        bank = KalmanBank(3, dim=1, q=qs, r=1e6)
+        scalars = [ScalarKalman(q=q, r=1e6) for q in qs]
+        for z in ([1e3, 2e3, 3e3], [4e3, -5e3, 6e3], [2e3, 0.0, 1e3]):
+            bank.predict()
+            x, innov = bank.update(z)
+            for k, kf in enumerate(scalars):
+                kf.predict()
+                xs, ps, _, ys = kf.update(z[k])
+                self.assertAlmostEqual(x[k, 0], xs, delta=1e-9 * max(1.0, abs(xs)))
+                self.assertAlmostEqual(innov[k, 0], ys, delta=1e-9 * max(1.0, abs(ys)))
+                self.assertAlmostEqual(bank.P[k, 0, 0], ps, delta=1e-9 * ps)
+
+    def test_drift_state_tracks_ramp(self):
+        bank = KalmanBank(4, dim=2, dt=1e-3, q=[1e-2, 1e2], r=1.0, p0=1e8)
+        slopes = np.array([0.0, 1e3, -2e3, 5e2])
+        for step in range(200):
+            bank.predict()
+            bank.update(100.0 + slopes * step * 1e-3)
+        np.testing.assert_allclose(bank.x[:, 1], slopes, rtol=1e-3, atol=1e-6)
+
+    def test_steady_state_gain_matches_converged_filter(self):
+        live = KalmanBank(2, dim=2, dt=1e-3, q=[[1.0, 10.0], [2.0, 20.0]], r=[1.0, 4.0])
+        frozen = KalmanBank(2, dim=2, dt=1e-3, q=[[1.0, 10.0], [2.0, 20.0]], r=[1.0, 4.0], steady_state=True)
+        self.assertTrue(frozen.steady_state)
+        P_ss = frozen.P.copy()
+        for _ in range(3000):
+            live.predict()
+            live.update([0.0, 0.0])
+        np.testing.assert_allclose(live.P, P_ss, rtol=1e-6)
+        frozen.x[:] = live.x = np.array([[5.0, 1.0], [-3.0, 0.5]])
+        for z in ([5.1, -2.9], [5.3, -2.7]):
+            live.predict()
+            frozen.predict()
+            np.testing.assert_allclose(live.update(z)[0], frozen.update(z)[0], rtol=1e-6)
+        np.testing.assert_array_equal(frozen.P, P_ss)
+
+    def test_mask_and_nan_skip_filters(self):
+        bank = KalmanBank(3, dim=1)
+        bank.predict()
+        x, _ = bank.update([1e3, float("nan"), 2e3], mask=[True, True, False])
+        self.assertNotEqual(x[0, 0], 0.0)
+        self.assertEqual(x[1, 0], 0.0)
+        self.assertEqual(x[2, 0], 0.0)
+        self.assertEqual(bank.P[1, 0, 0], 1e12 + 1e7)
+
+    def test_validation(self):
+        with self.assertRaises(ValueError):
+            KalmanBank(2, dim=4)
+        with self.assertRaises(ValueError):
+            KalmanBank(2, dim=2, q=np.ones((3, 3)))
+        with self.assertRaises(ValueError):
+            KalmanBank(2, dim=2, H=[1.0, 0.0, 0.0])
+
+
+if __name__ == "__main__":
+    unittest.main()
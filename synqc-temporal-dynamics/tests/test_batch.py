@@ -0,0 +1,142 @@
+import math
+import unittest
+
+try:
+    import numpy as np
+except ModuleNotFoundError:  # pragma: no cover - environment-specific
+    np = None
+
+from synqc.hardware import HardwareSignature
+from synqc.rng import default_rng
+from synqc.scheduler import run_dpd_sequence
+
+if np is not None:
+    from synqc.batch import (
+        DPDBatchResult,
+        run_dpd_batch,
+        run_dpd_ensemble,
+        sample_detuning_offsets,
+    )
+
+
+@unittest.skipUnless(np is not None, "numpy is required for the batch engine")
+class TestBatch(unittest.TestCase):
+    def setUp(self):
+        self.hw = HardwareSignature.superconducting()
+        self.kwargs = dict(d1_s=1.2e-6, probe_s=8e-6, d2_s=1.2e-6, dt_s=2e-7, demod_window=8)
+
+    def test_matches_scalar_path(self):
+        detunings = [-300e3, 0.0, 150e3, 275e3]
+        omega = 2.0e6
+        batch = run_dpd_batch(
+            self.hw,
+            detunings,
+            omega,
+            rng=[default_rng(10 + k) for k in range(len(detunings))],
+            drive_substeps=2,
+            return_signals=True,
+            **self.kwargs,
+        )
+        self.assertIsInstance(batch, DPDBatchResult)
+        self.assertEqual(len(batch), len(detunings))
+        for k, det in enumerate(detunings):
+            res = run_dpd_sequence(
+                self.hw, det, omega, rng=default_rng(10 + k), drive_substeps=2, **self.kwargs
+            )
+            self.assertAlmostEqual(batch.phase[k], res.phase, places=9)
+            self.assertAlmostEqual(batch.amp[k], res.amp, places=12)
+            for a, b in zip(batch.final_states[k], res.states[-1]):
+                self.assertAlmostEqual(a, b, places=12)
+            for a, b in zip(batch.i_lp[k], res.i_lp):
+                self.assertAlmostEqual(a, b, places=12)
+            self.assertEqual(list(batch.probe_mask), list(res.probe_mask))
+            for a, b in zip(batch.signal[k], res.signal):
+                if math.isnan(b):
+                    self.assertTrue(math.isnan(a))
+                else:
+                    self.assertAlmostEqual(a, b, places=12)
+
+    def test_shared_rng_matches_serial_loop(self):
+        detunings = [100e3, 200e3, 300e3]
+        batch = run_dpd_batch(self.hw, detunings, 1.5e6, rng=default_rng(5), **self.kwargs)
+        serial_rng = default_rng(5)
+        for k, det in enumerate(detunings):
+            res = run_dpd_sequence(self.hw, det, 1.5e6, rng=serial_rng, **self.kwargs)
+            self.assertAlmostEqual(batch.phase[k], res.phase, places=9)
+        self.assertIsNone(batch.signal)
+
+    def test_per_run_relaxation_override(self):
+        batch = run_dpd_batch(
+            self.hw,
+            250e3,
+            2.5e6,
+            t1_s=[self.hw.t1, 1e-6],
+            t2_s=[self.hw.t2, 1e-6],
+            meas_noise=0.0,
+            **self.kwargs,
+        )
+        self.assertEqual(len(batch), 2)
+        hw_fast = HardwareSignature.superconducting()
+        hw_fast.t1 = 1e-6
+        hw_fast.t2 = 1e-6
+        res = run_dpd_sequence(hw_fast, 250e3, 2.5e6, meas_noise=0.0, **self.kwargs)
+        for a, b in zip(batch.final_states[1], res.states[-1]):
+            self.assertAlmostEqual(a, b, places=12)
+
+    def test_rng_sequence_length_validated(self):
+        with self.assertRaises(ValueError):
+            run_dpd_batch(self.hw, [1e5, 2e5], 1e6, rng=[default_rng(1)], **self.kwargs)
+
+
+@unittest.skipUnless(np is not None, "numpy is required for the ensemble engine")
+class TestEnsemble(unittest.TestCase):
+    def setUp(self):
+        self.hw = HardwareSignature.superconducting()
+        self.kwargs = dict(d1_s=1.2e-6, probe_s=6e-6, d2_s=1.0e-6, dt_s=2e-7, demod_window=8)
+
+    def test_zero_offsets_match_scalar_run(self):
+        ens = run_dpd_ensemble(
+            self.hw, 250e3, 2.5e6, offsets_hz=[0.0] * 16, rng=default_rng(9), **self.kwargs
+        )
+        res = run_dpd_sequence(self.hw, 250e3, 2.5e6, rng=default_rng(9), **self.kwargs)
+        self.assertAlmostEqual(ens.phase, res.phase, places=9)
+        self.assertEqual(len(ens.states), len(res.states))
+        for a, b in zip(ens.states[-1], res.states[-1]):
+            self.assertAlmostEqual(a, b, places=12)
+
+    def test_ensemble_averages_member_expectations(self):
+        offsets = [-80e3, 10e3, 120e3]
+        ens = run_dpd_ensemble(
+            self.hw, 200e3, 2.0e6, offsets_hz=offsets, meas_noise=0.0,
+            readout_axis="x", record_states=5, **self.kwargs,
+        )
+        members = [
+            run_dpd_sequence(self.hw, 200e3 + off, 2.0e6, meas_noise=0.0, readout_axis="x", **self.kwargs)
+            for off in offsets
+        ]
+        probe_index = next(i for i, flag in enumerate(ens.probe_mask) if flag)
+        expected = sum(m.signal[probe_index] for m in members) / len(members)
+        self.assertAlmostEqual(ens.signal[probe_index], expected, places=12)
+        self.assertEqual(list(ens.states.indices), list(range(0, len(ens.probe_mask), 5)))
+        mean_x = sum(m.states[10][0] for m in members) / len(members)
+        self.assertAlmostEqual(ens.states[2][0], mean_x, places=12)
+
+    def test_offset_distributions(self):
+        gen = default_rng(1)
+        for name in ("gaussian", "uniform", "lorentzian"):
+            offsets = sample_detuning_offsets(2000, 50e3, name, gen)
+            self.assertEqual(offsets.shape, (2000,))
+        uniform = sample_detuning_offsets(500, 50e3, "uniform", gen)
+        self.assertTrue(np.all(np.abs(uniform) <= 50e3))
+        self.assertLess(abs(np.median(sample_detuning_offsets(4000, 50e3, "lorentzian", gen))), 10e3)
+        with self.assertRaises(ValueError):
+            sample_detuning_offsets(10, 1.0, "cauchy-ish")
+        dephased = run_dpd_ensemble(
+            self.hw, 0.0, 2.0e6, members=400, spread_hz=2e6, rng=default_rng(2),
+            record_states="none", **self.kwargs,
+        )
+        self.assertEqual(len(dephased.states), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
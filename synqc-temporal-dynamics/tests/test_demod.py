@@ -1,6 +1,16 @@
+import math
+import time
 import unittest
 
-from synqc.demod import lockin_demod
+from synqc.demod import (
+    STREAM_BLOCK,
+    LockinDemodulator,
+    _demod_refs,
+    clear_reference_cache,
+    lockin_demod,
+    lockin_gated,
+    lockin_masked_mean,
+)
 
 
 def _max_abs(values):
@@ -27,6 +37,147 @@ class TestDemod(unittest.TestCase):
         with self.assertRaises(ValueError):
             lockin_demod(signal, ref_freq_hz=1e3, dt_s=1e-3, window=None, window_s=0.0)
 
+    def test_backends_match_direct(self):
+        signal = [math.sin(0.37 * k) + 0.1 * (k % 7) for k in range(300)]
+        for window in (1, 6, 41, 500):
+            ref_i, ref_q = lockin_demod(signal, 1e4, 1e-6, window=window, method="direct")
+            for method in ("cumsum", "fft", "auto"):
+                i_lp, q_lp = lockin_demod(signal, 1e4, 1e-6, window=window, method=method)
+                self.assertEqual(len(i_lp), len(signal))
+                for a, b in zip(ref_i + ref_q, i_lp + q_lp):
+                    self.assertAlmostEqual(a, b, places=12)
+
+    def test_running_sums_keep_precision_with_dc_offset(self):
+        # In-phase DC makes global prefix sums grow with the record; blocked
+        # sums keep the late window sums as precise as the direct filter.
+        n, window = 200_000, 4
+        signal = [1e6 + 0.1 * (k % 7) for k in range(n)]
+        ref_i, _ = lockin_demod(signal, 0.0, 1e-6, window=window, method="direct")
+        i_lp, _ = lockin_demod(signal, 0.0, 1e-6, window=window, method="auto")
+        gated = lockin_gated(signal, 0.0, 1e-6, [True] * n, window=window)[0]
+        for k in range(n - 5000, n):
+            self.assertLess(abs(i_lp[k] - ref_i[k]), 1e-12 * ref_i[k])
+            self.assertLess(abs(gated[k] - ref_i[k]), 1e-12 * ref_i[k])
+
+    def test_arbitrary_kernel_fft(self):
+        signal = [((k * 13) % 11) / 11.0 for k in range(257)]
+        kernel = [0.5 - 0.5 * math.cos(2 * math.pi * k / 20) for k in range(20)]
+        ref_i, ref_q = lockin_demod(signal, 2e3, 1e-5, kernel=kernel, method="direct")
+        i_lp, q_lp = lockin_demod(signal, 2e3, 1e-5, kernel=kernel, method="fft")
+        for a, b in zip(ref_i + ref_q, i_lp + q_lp):
+            self.assertAlmostEqual(a, b, places=10)
+
+    def test_invalid_method(self):
+        with self.assertRaises(ValueError):
+            lockin_demod([1.0] * 10, 1e3, 1e-3, method="simd")
+        with self.assertRaises(ValueError):
+            lockin_demod([1.0] * 10, 1e3, 1e-3, kernel=[1.0], method="cumsum")
+
+    def test_streaming_matches_one_shot(self):
+        signal = [math.cos(0.21 * k) * (1.0 + 0.01 * k) for k in range(400)]
+        for window in (1, 4, 9, 600):
+            ref_i, ref_q = lockin_demod(signal, 5e3, 2e-6, window=window)
+            demod = LockinDemodulator(5e3, 2e-6, window=window)
+            out_i, out_q = [], []
+            pos = 0
+            for size in (0, 1, 17, 3, 100, 64):
+                i_part, q_part = demod.push(signal[pos:pos + size])
+                out_i.extend(i_part)
+                out_q.extend(q_part)
+                pos += size
+            i_part, q_part = demod.push(signal[pos:])
+            out_i.extend(i_part)
+            out_q.extend(q_part)
+            self.assertEqual(demod.samples_out, len(signal) - min(demod.latency_samples, len(signal)))
+            i_part, q_part = demod.flush()
+            out_i.extend(i_part)
+            out_q.extend(q_part)
+            self.assertEqual(len(out_i), len(ref_i))
+            for got, want in zip(out_i + out_q, ref_i + ref_q):
+                self.assertAlmostEqual(got, want, places=12)
+
+    def test_streaming_precision_on_long_stream(self):
+        # A large in-phase signal makes raw prefix sums grow with the stream;
+        # re-anchoring keeps late outputs as precise as early ones.
+        n, window = 200_000, 4
+        signal = [1e6 + 0.1 * (k % 7) for k in range(n)]
+        demod = LockinDemodulator(0.0, 1e-6, window=window)
+        out = []
+        for pos in range(0, n, 1000):
+            out.extend(demod.push(signal[pos:pos + 1000])[0])
+        out.extend(demod.flush()[0])
+        self.assertEqual(len(out), n)
+        half = window // 2
+        for i in range(n - 2000, n - window):
+            exact = math.fsum(signal[i - half:i - half + window]) / window
+            self.assertLess(abs(out[i] - exact), 1e-13 * exact)
+
+    def test_streaming_single_large_push_is_linear(self):
+        def best_time(n):
+            signal = [math.cos(0.37 * k) for k in range(n)]
+            best = math.inf
+            for _ in range(3):
+                demod = LockinDemodulator(2e4, 1e-6, window=64)
+                start = time.perf_counter()
+                out = demod.push(signal)[0]
+                out += demod.flush()[0]
+                best = min(best, time.perf_counter() - start)
+                self.assertEqual(len(out), n)
+                self.assertLessEqual(len(demod._prefix_i), 4 * STREAM_BLOCK)
+            return best
+
+        small = best_time(25_000)
+        large = best_time(100_000)
+        # Linear work gives a ratio near 4; quadratic indexing gives ~16.
+        self.assertLess(large, 8 * small)
+
+    def test_reference_tables_cached_and_accurate(self):
+        clear_reference_cache()
+        refc, refs = _demod_refs(2000, 1.7e5, 1e-7)
+        self.assertIs(_demod_refs(2000, 1.7e5, 1e-7)[0], refc)
+        self.assertTrue(refc.readonly)
+        omega = 2.0 * math.pi * 1.7e5
+        for k in (0, 1, 255, 256, 257, 1999):
+            self.assertAlmostEqual(refc[k], math.cos(omega * (k * 1e-7)), places=13)
+            self.assertAlmostEqual(refs[k], math.sin(omega * (k * 1e-7)), places=13)
+        self.assertEqual(refc[256], math.cos(omega * (256 * 1e-7)))
+
+    def test_masked_mean_matches_filtered_average(self):
+        signal = [0.0] * 40 + [math.sin(0.3 * k) + 0.5 for k in range(300)] + [0.0] * 60
+        mask = [40 <= k < 340 for k in range(len(signal))]
+        i_lp, q_lp = lockin_demod(signal, 2e4, 1e-6, window=11)
+        i_mean, q_mean = lockin_masked_mean(signal, 2e4, 1e-6, mask, window=11)
+        self.assertAlmostEqual(i_mean, sum(i_lp[40:340]) / 300, places=12)
+        self.assertAlmostEqual(q_mean, sum(q_lp[40:340]) / 300, places=12)
+
+    def test_gated_matches_zeroed_input(self):
+        raw = [math.nan] * 30 + [math.sin(0.2 * k) + 0.3 for k in range(200)] + [0.7] * 50
+        raw[100] = math.nan
+        mask = [30 <= k < 230 for k in range(len(raw))]
+        zeroed = [v if flag and not math.isnan(v) else 0.0 for v, flag in zip(raw, mask)]
+        i_lp, q_lp, i_mean, q_mean = lockin_gated(raw, 2e4, 1e-6, mask, window=9)
+        ref_i, ref_q = lockin_demod(zeroed, 2e4, 1e-6, window=9, method="cumsum")
+        self.assertEqual(list(i_lp), ref_i)
+        self.assertEqual(list(q_lp), ref_q)
+        self.assertEqual(i_mean, math.fsum(ref_i[30:230]) / 200)
+        self.assertEqual(q_mean, math.fsum(ref_q[30:230]) / 200)
+        masked = lockin_masked_mean(raw, 2e4, 1e-6, mask, window=9, gated=True)
+        self.assertAlmostEqual(masked[0], i_mean, places=12)
+        self.assertAlmostEqual(masked[1], q_mean, places=12)
+        self.assertEqual(lockin_gated(raw, 2e4, 1e-6, [False] * len(raw), window=9)[2:], (0.0, 0.0))
+
+    def test_streaming_requires_fixed_window(self):
+        with self.assertRaises(ValueError):
+            LockinDemodulator(1e3, 1e-3, window=None, window_s=None)
+        demod = LockinDemodulator(1e3, 1e-3, window_s=0.005)
+        self.assertEqual(demod.window, 5)
+        demod.push([1.0, 2.0])
+        demod.flush()
+        with self.assertRaises(RuntimeError):
+            demod.push([1.0])
+        demod.reset()
+        self.assertEqual(demod.samples_in, 0)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,96 @@
+import unittest
+import warnings
+
+from synqc.hardware import HardwareSignature
+from synqc.observers import Observer, RealTimeObserver
+from synqc.rng import RNG, default_rng
+from synqc.scheduler import run_dpd_sequence
+
+
+class _Recorder(Observer):
+    def __init__(self, stride=1, streaming=False):
+        self.stride = stride
+        self.streaming = streaming
+        self.started = None
+        self.seen = []
+        self.history = None
+
+    def start(self, n_samples, dt_s):
+        self.started = (n_samples, dt_s)
+
+    def on_state(self, index, state):
+        self.seen.append((index, state))
+
+    def finish(self, history):
+        self.history = history
+
+
+class TestObservers(unittest.TestCase):
+    def setUp(self):
+        self.hw = HardwareSignature.superconducting()
+        self.kwargs = dict(
+            detuning_hz=180e3, omega_hz=1.8e6, d1_s=1.2e-6, probe_s=5e-6, d2_s=1.2e-6, dt_s=2e-7
+        )
+        self.full = run_dpd_sequence(self.hw, rng=default_rng(4), **self.kwargs)
+
+    def test_streaming_observer_sees_every_stride_sample(self):
+        obs = _Recorder(stride=3, streaming=True)
+        res = run_dpd_sequence(
+            self.hw, rng=default_rng(4), record_states="none", observers=[obs], **self.kwargs
+        )
+        n = len(self.full.t)
+        self.assertEqual(obs.started, (n, 2e-7))
+        self.assertEqual([idx for idx, _ in obs.seen], list(range(0, n, 3)))
+        for idx, state in obs.seen:
+            self.assertEqual(state, self.full.states[idx])
+        self.assertEqual(len(res.states), 0)
+        self.assertEqual(res.phase, self.full.phase)
+
+    def test_post_hoc_history_uses_gcd_of_strides(self):
+        obs = _Recorder(stride=4)
+        res = run_dpd_sequence(
+            self.hw, rng=default_rng(4), record_states=6, observers=[obs], **self.kwargs
+        )
+        self.assertEqual(obs.history.stride, 2)
+        self.assertEqual(obs.seen, [])
+        self.assertEqual(res.states.stride, 6)
+        self.assertEqual(list(res.states.indices), list(range(0, len(self.full.t), 6)))
+        for k, state in zip(res.states.indices, res.states):
+            self.assertEqual(state, self.full.states[k])
+
+    def test_realtime_observer_bulk_noise_order(self):
+        obs = RealTimeObserver(("x", "z"), stride=2, shots=100, meas_noise=0.3, rng=RNG(11))
+        run_dpd_sequence(self.hw, rng=default_rng(4), record_states="none", observers=[obs], **self.kwargs)
+        result = obs.result
+        self.assertEqual(result.indices, tuple(range(0, len(self.full.t), 2)))
+        ref = RNG(11)
+        for j, idx in enumerate(result.indices):
+            state = self.full.states[idx]
+            self.assertEqual(result.expectation["x"][j], state[0])
+            self.assertEqual(result.noisy["x"][j], state[0] + ref.normal(0.0, 0.03))
+            self.assertEqual(result.noisy["z"][j], state[2] + ref.normal(0.0, 0.03))
+
+    def test_optimize_options_are_deprecated_no_ops(self):
+        with self.assertWarns(DeprecationWarning):
+            obs = RealTimeObserver(("x", "y"), profile=True, optimize=False, optimize_warmup=2)
+        with self.assertWarns(DeprecationWarning):
+            res = run_dpd_sequence(
+                self.hw,
+                rng=default_rng(4),
+                real_time_axes=("x", "y"),
+                real_time_shots=0,
+                real_time_optimize=False,
+                real_time_optimize_threshold=1.0,
+                observers=[obs],
+                **self.kwargs,
+            )
+        self.assertEqual(obs.result.expectation, res.realtime.expectation)
+        self.assertEqual(obs.result.profile.kernel, "bulk")
+        with warnings.catch_warnings():
+            warnings.simplefilter("error", DeprecationWarning)
+            RealTimeObserver(("x",))
+            run_dpd_sequence(self.hw, rng=default_rng(4), real_time_axes=("x",), **self.kwargs)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,7 +1,27 @@
+import math
 import unittest
 
+try:
+    import numpy as np
+except ModuleNotFoundError:  # pragma: no cover - environment-specific
+    np = None
+
 from synqc.hardware import HardwareSignature
-from synqc.probes import drive, probe, seed_default_rng, set_default_rng
+from synqc.probes import (
+    _drive_jump,
+    _drive_propagator,
+    adaptive_substeps,
+    clear_propagator_cache,
+    drive,
+    drive_envelope,
+    drive_propagator,
+    drive_segment,
+    envelope_propagators,
+    probe,
+    seed_default_rng,
+    set_default_rng,
+)
+from synqc.pulses import drag_envelope, gaussian_envelope
 from synqc.rng import default_rng, RNG
 
 
@@ -41,6 +61,154 @@ class TestProbes(unittest.TestCase):
         for a, b in zip(coarse, manual):
             self.assertAlmostEqual(a, b, places=12)
 
+    def test_drive_segment_matches_drive_loop(self):
+        hw = HardwareSignature.superconducting()
+        state = (0.0, 0.0, 1.0)
+        manual = state
+        for _ in range(37):
+            manual = drive(manual, 180e3, 2.2e6, 1e-7, hw, substeps=3)
+        recorded = []
+        stepped = drive_segment(state, 180e3, 2.2e6, 1e-7, 37, hw, 3, on_step=recorded.append)
+        jumped = drive_segment(state, 180e3, 2.2e6, 1e-7, 37, hw, 3)
+        self.assertEqual(len(recorded), 37)
+        self.assertEqual(recorded[-1], stepped)
+        for a, b, c in zip(manual, stepped, jumped):
+            self.assertAlmostEqual(a, b, places=12)
+            self.assertAlmostEqual(a, c, places=12)
+
+    def test_drive_propagator_cache_reuse(self):
+        hw = HardwareSignature.ion_trap()
+        clear_propagator_cache()
+        first = drive_propagator(50e3, 1e6, 2e-7, hw)
+        second = drive_propagator(50e3, 1e6, 2e-7, hw)
+        self.assertIs(first, second)
+        self.assertEqual(_drive_propagator.cache_info().hits, 1)
+        with self.assertRaises(ValueError):
+            drive_propagator(50e3, 1e6, 2e-7, hw, substeps=0)
+        for bad in ("bogus", 1.5, 0, True):
+            with self.assertRaisesRegex(ValueError, "positive int or 'auto'"):
+                drive((0.0, 0.0, 1.0), 50e3, 1e6, 2e-7, hw, substeps=bad)
+            with self.assertRaisesRegex(ValueError, "positive int or 'auto'"):
+                drive_segment((0.0, 0.0, 1.0), 50e3, 1e6, 2e-7, 3, hw, bad)
+
+    def test_integer_like_substeps(self):
+        class Count:
+            def __index__(self):
+                return 3
+
+        hw = HardwareSignature.superconducting()
+        start = (0.0, 0.0, 1.0)
+        counts = [Count()] + ([np.int64(3)] if np is not None else [])
+        expected = drive(start, 50e3, 1e6, 2e-7, hw, substeps=3)
+        for count in counts:
+            self.assertEqual(drive(start, 50e3, 1e6, 2e-7, hw, substeps=count), expected)
+            self.assertIs(drive_propagator(50e3, 1e6, 2e-7, hw, count), drive_propagator(50e3, 1e6, 2e-7, hw, 3))
+            _, stats = drive_segment(start, 50e3, 1e6, 2e-7, 4, hw, count, return_stats=True)
+            self.assertEqual(type(stats.substeps), int)
+
+    def test_adaptive_substeps_meets_tolerance(self):
+        ion = HardwareSignature.ion_trap()
+        sc = HardwareSignature.superconducting()
+        self.assertEqual(adaptive_substeps(250e3, 2.5e6, 1e-7, ion, steps=50).substeps, 1)
+        stats = adaptive_substeps(250e3, 2.5e6, 1e-7, sc, steps=50, atol=1e-5)
+        self.assertTrue(stats.converged)
+        self.assertGreater(stats.substeps, 1)
+        self.assertLessEqual(stats.error_estimate, 1e-5)
+
+        reference = drive_segment((0.0, 0.0, 1.0), 250e3, 2.5e6, 1e-7, 50, sc, 8192)
+        auto = drive_segment((0.0, 0.0, 1.0), 250e3, 2.5e6, 1e-7, 50, sc, "auto", atol=1e-5)
+        self.assertLess(max(abs(a - b) for a, b in zip(auto, reference)), 1e-5)
+
+        state, single = drive((0.0, 0.0, 1.0), 250e3, 2.5e6, 1e-7, sc, "auto", atol=1e-5, return_stats=True)
+        self.assertEqual(single, adaptive_substeps(250e3, 2.5e6, 1e-7, sc, atol=1e-5))
+        self.assertEqual(state, drive((0.0, 0.0, 1.0), 250e3, 2.5e6, 1e-7, sc, single.substeps))
+
+        # The search builds its candidates outside the shared propagator cache.
+        clear_propagator_cache()
+        adaptive_substeps(180e3, 2.5e6, 1e-7, sc, steps=50, atol=1e-7)
+        self.assertEqual(_drive_propagator.cache_info().currsize, 0)
+        self.assertEqual(_drive_jump.cache_info().currsize, 0)
+
+        capped = adaptive_substeps(250e3, 2.5e6, 1e-7, sc, atol=1e-12, max_substeps=4)
+        self.assertFalse(capped.converged)
+        self.assertEqual(capped.substeps, 4)
+        with self.assertRaises(ValueError):
+            adaptive_substeps(250e3, 2.5e6, 1e-7, sc, atol=0.0)
+
+    def test_exact_drive_matches_fine_split(self):
+        sc = HardwareSignature.superconducting()
+        start = (0.3, -0.1, 0.8)
+        exact = drive(start, 250e3, 2.5e6, 2e-6, sc, method="exact")
+        split = drive(start, 250e3, 2.5e6, 2e-6, sc, 1 << 16)
+        self.assertLess(max(abs(a - b) for a, b in zip(exact, split)), 1e-6)
+        self.assertEqual(exact, drive(start, 250e3, 2.5e6, 2e-6, sc, 64, method="exact"))
+
+        # No drive: pure free precession plus T1/T2 relaxation in closed form.
+        t = 3e-6
+        x, y, z = drive(start, 100e3, 0.0, t, sc, method="exact")
+        angle = 2.0 * math.pi * 100e3 * t
+        d2 = math.exp(-t / sc.t2)
+        d1 = math.exp(-t / sc.t1)
+        self.assertAlmostEqual(x, d2 * (start[0] * math.cos(angle) - start[1] * math.sin(angle)), places=12)
+        self.assertAlmostEqual(y, d2 * (start[0] * math.sin(angle) + start[1] * math.cos(angle)), places=12)
+        self.assertAlmostEqual(z, d1 * start[2] + 1.0 - d1, places=12)
+
+        stepped = []
+        final = drive_segment(start, 250e3, 2.5e6, 1e-7, 20, sc, method="exact", on_step=stepped.append)
+        jumped = drive_segment(start, 250e3, 2.5e6, 1e-7, 20, sc, method="exact")
+        for a, b in zip(final, jumped):
+            self.assertAlmostEqual(a, b, places=12)
+        _, stats = drive(start, 250e3, 2.5e6, 1e-7, sc, method="exact", return_stats=True)
+        self.assertEqual(stats.substeps, 1)
+        with self.assertRaises(ValueError):
+            drive_propagator(50e3, 1e6, 2e-7, sc, method="magnus")
+
+    def test_constant_envelope_matches_drive_segment(self):
+        hw = HardwareSignature.superconducting()
+        recorded = []
+        shaped = drive_envelope((0.0, 0.0, 1.0), [2.2e6] * 25, 1e-7, hw, detuning_hz=180e3,
+                                on_step=recorded.append)
+        segment = drive_segment((0.0, 0.0, 1.0), 180e3, 2.2e6, 1e-7, 25, hw)
+        jumped = drive_envelope((0.0, 0.0, 1.0), [2.2e6] * 25, 1e-7, hw, detuning_hz=[180e3] * 25)
+        self.assertEqual(len(recorded), 25)
+        for a, b, c in zip(shaped, segment, jumped):
+            self.assertAlmostEqual(a, b, places=12)
+            self.assertAlmostEqual(a, c, places=12)
+
+    def test_quadrature_drive_rotates_about_y(self):
+        hw = HardwareSignature(t1=0.0, t2=0.0)
+        x, y, z = drive_envelope((0.0, 0.0, 1.0), [0.0] * 10, 1e-8, hw, quadrature_hz=[1e6] * 10)
+        theta = 2.0 * math.pi * 1e6 * 1e-7
+        self.assertAlmostEqual(x, math.sin(theta), places=12)
+        self.assertAlmostEqual(y, 0.0, places=12)
+        self.assertAlmostEqual(z, math.cos(theta), places=12)
+
+    def test_magnus_allows_coarser_steps(self):
+        hw = HardwareSignature.superconducting()
+        args = (200e-9,)
+        reference = drive_envelope((0.0, 0.0, 1.0), gaussian_envelope(*args, 1e-11, 1e7, 40e-9), 1e-11, hw,
+                                   detuning_hz=3e5)
+
+        def error(state):
+            return max(abs(a - b) for a, b in zip(state, reference))
+
+        piecewise = drive_envelope((0.0, 0.0, 1.0), gaussian_envelope(*args, 1e-8, 1e7, 40e-9), 1e-8, hw,
+                                   detuning_hz=3e5)
+        magnus = drive_envelope((0.0, 0.0, 1.0), gaussian_envelope(*args, 1e-8, 1e7, 40e-9, edges=True),
+                                1e-8, hw, detuning_hz=3e5, method="magnus")
+        self.assertLess(error(magnus), error(piecewise) / 10.0)
+
+        omega, quad = drag_envelope(200e-9, 1e-8, 1e7, 40e-9, 6e-8, edges=True)
+        self.assertEqual(len(omega), 21)
+        self.assertAlmostEqual(quad[10], 0.0, places=9)
+        first = envelope_propagators(omega, 1e-8, hw, quadrature_hz=quad, method="magnus")
+        self.assertIs(envelope_propagators(list(omega), 1e-8, hw, quadrature_hz=quad, method="magnus"), first)
+        self.assertEqual(len(first[0]), 20)
+        with self.assertRaises(ValueError):
+            envelope_propagators(omega, 1e-8, hw, quadrature_hz=quad[:-1])
+        with self.assertRaises(ValueError):
+            envelope_propagators(omega, 1e-8, hw, method="rk4")
+
     def test_set_default_rng_validation(self):
         with self.assertRaises(TypeError):
             set_default_rng("not-a-generator")
@@ -0,0 +1,67 @@
+import pickle
+import unittest
+from array import array
+
+from synqc.rng import RNG, default_rng
+
+
+class TestRNG(unittest.TestCase):
+    def test_bulk_normal_matches_scalar_draws(self):
+        scalar = default_rng(3)
+        expected = [scalar.normal(1.0, 0.5) for _ in range(11)]
+        bulk = default_rng(3).normal(1.0, 0.5, size=11)
+        self.assertIsInstance(bulk, array)
+        self.assertEqual(list(bulk), expected)
+
+    def test_out_buffer_filled_in_place(self):
+        buf = [0.0] * 6
+        gen = default_rng(8)
+        result = gen.uniform(-1.0, 1.0, out=buf)
+        self.assertIs(result, buf)
+        self.assertEqual(buf, list(default_rng(8).uniform(-1.0, 1.0, size=6)))
+        self.assertTrue(all(-1.0 <= v < 1.0 for v in buf))
+        with self.assertRaises(ValueError):
+            gen.normal(size=3, out=[0.0] * 4)
+
+    def test_spawn_is_reproducible_and_independent(self):
+        first = RNG(2024).spawn(3)
+        second = RNG(2024).spawn(3)
+        draws = [list(child.normal(size=4)) for child in first]
+        self.assertEqual(draws, [list(child.normal(size=4)) for child in second])
+        self.assertEqual(len({tuple(d) for d in draws}), 3)
+        self.assertNotEqual(draws[0], list(RNG(2024).normal(size=4)))
+
+    def test_spawn_numbering_matches_substream(self):
+        root = RNG(77)
+        root.normal(size=5)  # parent draws do not affect children
+        batch_a = root.spawn(2)
+        batch_b = root.spawn(2)
+        self.assertEqual(batch_b[1].key, (3,))
+        self.assertEqual(list(batch_b[1].normal(size=3)), list(RNG(77).substream(3).normal(size=3)))
+        self.assertEqual(batch_a[0].substream(4).key, (0, 4))
+
+    def test_unseeded_root_can_be_replayed(self):
+        gen = RNG()
+        replay = RNG(gen.root_seed)
+        self.assertEqual(gen.normal(), replay.normal())
+        clone = pickle.loads(pickle.dumps(gen))
+        self.assertEqual(clone.normal(), gen.normal())
+
+    def test_non_integer_seeds(self):
+        draws = []
+        for seed in ("run-a", "run-b", b"run-a", 1.25, 1.5, 1.0, 1):
+            gen = RNG(seed)
+            self.assertIsInstance(gen.root_seed, int)
+            self.assertEqual(list(gen.normal(size=3)), list(RNG(seed).normal(size=3)))
+            self.assertEqual(list(RNG(gen.root_seed).substream(2).normal(size=3)), list(gen.substream(2).normal(size=3)))
+            draws.append(gen.normal())
+        # Floats are hashed rather than truncated, so 1.25, 1.5, 1.0 and 1 all differ.
+        self.assertEqual(len(set(draws)), len(draws))
+        self.assertEqual(RNG(True).root_seed, 1)
+        for bad in ((1, 2), [3], object()):
+            with self.assertRaises(TypeError):
+                RNG(bad)
+
+
+if __name__ == "__main__":
+    unittest.main()
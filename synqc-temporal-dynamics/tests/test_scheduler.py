@@ -7,8 +7,10 @@ from synqc.scheduler import (
     DPDResult,
     RealTimeObservations,
     RealTimeProfile,
+    StateHistory,
     run_dpd_sequence,
 )
+from synqc.probes import adaptive_substeps, probe
 from synqc.rng import RNG, default_rng
 
 
@@ -145,7 +147,7 @@ class TestScheduler(unittest.TestCase):
         self.assertEqual(profile.total_samples, samples_expected)
         self.assertGreaterEqual(profile.expectation_time_s, 0.0)
         self.assertEqual(profile.noisy_time_s, 0.0)
-        self.assertEqual(profile.kernel, "scalar")
+        self.assertEqual(profile.kernel, "bulk")
         self.assertEqual(profile.optimizations, ())
 
     def test_realtime_stride_coerces_minimum(self):
@@ -194,6 +196,163 @@ class TestScheduler(unittest.TestCase):
         self.assertGreaterEqual(profile.avg_expectation_per_sample_s, 0.0)
         self.assertGreaterEqual(profile.avg_noisy_per_sample_s, 0.0)
 
+    def test_record_states_options(self):
+        hw = HardwareSignature.superconducting()
+        kwargs = dict(
+            detuning_hz=220e3, omega_hz=2.1e6, d1_s=1.4e-6, probe_s=4e-6, d2_s=1.4e-6, dt_s=2e-7
+        )
+        full = run_dpd_sequence(hw, rng=default_rng(3), **kwargs)
+        self.assertIsInstance(full.states, StateHistory)
+        self.assertEqual(len(full.states), len(full.t))
+
+        thinned = run_dpd_sequence(hw, rng=default_rng(3), record_states=4, **kwargs)
+        self.assertEqual(len(thinned.states), math.ceil(len(full.t) / 4))
+        self.assertEqual(list(thinned.states.indices), list(range(0, len(full.t), 4)))
+        for k, state in zip(thinned.states.indices, thinned.states):
+            self.assertEqual(state, full.states[k])
+
+        bare = run_dpd_sequence(hw, rng=default_rng(3), record_states="none", **kwargs)
+        self.assertEqual(len(bare.states), 0)
+        self.assertAlmostEqual(bare.phase, full.phase, places=12)
+        self.assertAlmostEqual(bare.amp, full.amp, places=12)
+        for k, flag in enumerate(full.probe_mask):
+            if flag:
+                self.assertAlmostEqual(bare.signal[k], full.signal[k], places=12)
+
+        for bad in ("some", 0, True):
+            with self.assertRaises(ValueError):
+                run_dpd_sequence(hw, record_states=bad, **kwargs)
+
+    def test_lazy_demod_matches_eager(self):
+        hw = HardwareSignature.superconducting()
+        kwargs = dict(
+            detuning_hz=240e3, omega_hz=2.4e6, d1_s=1.6e-6, probe_s=12e-6, d2_s=1.6e-6,
+            dt_s=2e-7, demod_window=9,
+        )
+        eager = run_dpd_sequence(hw, rng=default_rng(21), **kwargs)
+
+        phase_first = run_dpd_sequence(hw, rng=default_rng(21), lazy_demod=True, **kwargs)
+        self.assertIsNone(phase_first._i_lp)
+        self.assertAlmostEqual(phase_first.phase, eager.phase, places=12)
+        self.assertAlmostEqual(phase_first.amp, eager.amp, places=12)
+        self.assertIsNone(phase_first._i_lp)
+
+        vectors_first = run_dpd_sequence(hw, rng=default_rng(21), lazy_demod=True, **kwargs)
+        self.assertEqual(list(vectors_first.i_lp), list(eager.i_lp))
+        self.assertEqual(list(vectors_first.q_lp), list(eager.q_lp))
+        self.assertEqual(vectors_first.phase, eager.phase)
+        self.assertEqual(list(vectors_first.t), list(eager.t))
+
+    def test_auto_drive_substeps(self):
+        hw = HardwareSignature.superconducting()
+        kwargs = dict(
+            detuning_hz=240e3, omega_hz=2.4e6, d1_s=1.6e-6, probe_s=4e-6, d2_s=1.6e-6,
+            dt_s=2e-7, meas_noise=0.0,
+        )
+        fine = run_dpd_sequence(hw, drive_substeps=4096, **kwargs)
+        auto = run_dpd_sequence(hw, drive_substeps="auto", drive_atol=1e-6, **kwargs)
+        for a, b in zip(auto.states[-1], fine.states[-1]):
+            self.assertAlmostEqual(a, b, delta=2e-6)
+
+        # Both drive segments report the chosen count and its error bound.
+        self.assertEqual(len(auto.substep_stats), 2)
+        for stats, steps in zip(auto.substep_stats, (8, 8)):
+            self.assertEqual(stats, adaptive_substeps(240e3, 2.4e6, 2e-7, hw, steps=steps, atol=1e-6))
+            self.assertTrue(stats.converged)
+            self.assertLessEqual(stats.error_estimate, 1e-6)
+        self.assertEqual([s.substeps for s in fine.substep_stats], [4096, 4096])
+        empty = run_dpd_sequence(hw, drive_substeps="auto", **{**kwargs, "d2_s": 0.0})
+        self.assertIsNone(empty.substep_stats[1])
+
+    def test_exact_drive_at_coarse_dt(self):
+        hw = HardwareSignature.superconducting()
+        kwargs = dict(
+            detuning_hz=240e3, omega_hz=2.4e6, d1_s=1.6e-6, probe_s=4e-6, d2_s=1.6e-6, meas_noise=0.0,
+        )
+        fine = run_dpd_sequence(hw, dt_s=1e-8, drive_method="exact", **kwargs)
+        split = run_dpd_sequence(hw, dt_s=1e-8, drive_substeps=64, **kwargs)
+        coarse = run_dpd_sequence(hw, dt_s=4e-7, drive_method="exact", **kwargs)
+        # Compare at the probe start and at the end of the timeline.
+        for k_coarse, k_fine in ((3, 159), (-1, -1)):
+            for a, b, c in zip(coarse.states[k_coarse], fine.states[k_fine], split.states[k_fine]):
+                self.assertAlmostEqual(a, b, places=12)
+                self.assertAlmostEqual(a, c, delta=5e-6)
+
+    def test_result_equality(self):
+        hw = HardwareSignature.superconducting()
+        args = (hw, 1e5, 1e6, 1e-6, 2e-6, 1e-6)
+        eager = run_dpd_sequence(*args, dt_s=2e-7, rng=default_rng(3))
+        self.assertTrue(any(math.isnan(x) for x in eager.signal))
+        self.assertEqual(eager, run_dpd_sequence(*args, dt_s=2e-7, rng=default_rng(3)))
+        self.assertEqual(eager, run_dpd_sequence(*args, dt_s=2e-7, rng=default_rng(3), lazy_demod=True))
+        self.assertNotEqual(eager, run_dpd_sequence(*args, dt_s=2e-7, rng=default_rng(4)))
+        self.assertNotEqual(eager, run_dpd_sequence(*args, dt_s=2e-7, rng=default_rng(3), record_states=2))
+        with self.assertRaises(TypeError):
+            hash(eager)
+
+    def test_result_is_immutable(self):
+        hw = HardwareSignature.superconducting()
+        res = run_dpd_sequence(hw, 1e5, 1e6, 1e-6, 2e-6, 1e-6, dt_s=2e-7, lazy_demod=True)
+        with self.assertRaises(AttributeError):
+            res.phase = 0.0
+        with self.assertRaises(AttributeError):
+            res.signal = []
+
+    def test_result_public_field_types(self):
+        hw = HardwareSignature.superconducting()
+        res = run_dpd_sequence(
+            hw, 1e5, 1e6, 1e-6, 2e-6, 1e-6, dt_s=2e-7, rng=default_rng(3), real_time_axes=("z",)
+        )
+        self.assertEqual(DPDResult.FIELDS[:8], ("t", "signal", "i_lp", "q_lp", "phase", "amp", "states", "probe_mask"))
+        for name in ("t", "signal", "i_lp", "q_lp"):
+            self.assertTrue(all(isinstance(x, float) for x in getattr(res, name)), name)
+        self.assertIsInstance(res.phase, float)
+        self.assertIsInstance(res.amp, float)
+        self.assertIsInstance(res.states, StateHistory)
+        self.assertIsInstance(res.probe_mask, list)
+        self.assertTrue(all(type(flag) is bool for flag in res.probe_mask))
+        self.assertIsInstance(res.realtime, RealTimeObservations)
+        self.assertIsInstance(res.substep_stats, tuple)
+
+        fields = res.asdict()
+        self.assertEqual(tuple(fields), DPDResult.FIELDS)
+        self.assertIs(fields["probe_mask"], res.probe_mask)
+        self.assertEqual(DPDResult(**fields), res)
+        copy = res.replace(phase=0.5)
+        self.assertEqual(copy.phase, 0.5)
+        self.assertEqual(copy.replace(phase=res.phase), res)
+        with self.assertRaises(TypeError):
+            res.replace(mask=[])
+
+    def test_state_history_sequence_protocol(self):
+        history = StateHistory(stride=2)
+        history.append((0.0, 0.5, 1.0))
+        history.append((0.1, 0.2, 0.3))
+        self.assertEqual(len(history), 2)
+        self.assertEqual(history[-1], (0.1, 0.2, 0.3))
+        self.assertEqual(history[:1], [(0.0, 0.5, 1.0)])
+        self.assertEqual(list(history.indices), [0, 2])
+        self.assertEqual(history.x.typecode, "d")
+        history.append_repeat((0.4, 0.5, 0.6), 3)
+        history.append_repeat((0.7, 0.8, 0.9), 0)
+        self.assertEqual(history[2:], [(0.4, 0.5, 0.6)] * 3)
+
+    def test_probe_window_matches_per_sample_probe(self):
+        hw = HardwareSignature.superconducting()
+        res = run_dpd_sequence(
+            hw, 220e3, 2.1e6, 1.4e-6, 4e-6, 1.4e-6, dt_s=2e-7, rng=RNG(8), record_states=3,
+        )
+        n1, nP = 7, 20
+        frozen = res.states[3]  # sample 9, inside the probe window
+        for k in range(9, n1 + nP, 3):
+            self.assertEqual(res.states[k // 3], frozen)
+        ref = RNG(8)
+        lat = int(round(hw.probe_latency / 2e-7))
+        for k in range(n1, n1 + nP):
+            expected = probe(frozen, shots=200, meas_noise=0.02, rng=ref)
+            if k + lat < len(res.signal):
+                self.assertEqual(res.signal[k + lat], expected)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,109 @@
+import os
+import tempfile
+import unittest
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    import numpy as np
+except ModuleNotFoundError:  # pragma: no cover - environment-specific
+    np = None
+
+from synqc.hardware import HardwareSignature
+from synqc.rng import RNG
+from synqc.scheduler import run_dpd_sequence
+from synqc.sweep import run_sweep, sweep_grid
+
+if np is not None:
+    from synqc.store import ResultStore, ResultWriter
+
+
+def _reader_sum(path, run):
+    store = ResultStore(path)
+    return float(np.nansum(store.read(run, "i_lp"))), len(store)
+
+
+@unittest.skipUnless(np is not None, "numpy is required for the result store")
+class TestResultStore(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "runs")
+        self.hw = HardwareSignature.superconducting()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _run(self, detuning, probe_s=4e-6):
+        return run_dpd_sequence(self.hw, detuning, 2e6, 1e-6, probe_s, 1e-6, dt_s=2e-7, rng=RNG(1))
+
+    def test_round_trip_and_chunked_visibility(self):
+        results = {}
+        with ResultWriter(self.path, chunk_runs=2) as writer:
+            reader = ResultStore(self.path)
+            for k, det in enumerate((1e5, 2e5, 3e5)):
+                res = results[det] = self._run(det, probe_s=(4 + k) * 1e-6)
+                self.assertEqual(writer.append({"detuning_hz": det, "tag": "a"}, res), k)
+            self.assertEqual(len(reader), 0)
+            self.assertEqual(reader.refresh(), 2)
+            with self.assertRaises(RuntimeError):
+                ResultWriter(self.path)
+        self.assertEqual(reader.refresh(), 1)
+
+        store = ResultStore(self.path)
+        self.assertEqual(len(store), 3)
+        run = store.find(detuning_hz=3e5, tag="a")
+        self.assertEqual(run, [2])
+        res = results[3e5]
+        np.testing.assert_array_equal(store.read(2, "i_lp"), np.asarray(res.i_lp))
+        np.testing.assert_array_equal(store.read(2), np.asarray(res.signal))
+        self.assertIsInstance(store.read(2).base, np.memmap)
+        self.assertEqual(store.phase(2), res.phase)
+        self.assertEqual(store.column("detuning_hz"), [1e5, 2e5, 3e5])
+        self.assertEqual(store.find(tag="b"), [])
+        with self.assertRaises(KeyError):
+            store.read(0, "states")
+
+        with ResultWriter(self.path, chunk_runs=2) as writer:
+            self.assertEqual(writer.append({"detuning_hz": 4e5}, self._run(4e5)), 3)
+        store.refresh()
+        self.assertEqual(store.find(detuning_hz=4e5), [3])
+
+    def test_find_by_nested_params(self):
+        pulse = {"shape": "gauss", "sigma_s": 1e-7, "taps": [1, [2, 3]]}
+        with ResultWriter(self.path) as writer:
+            writer.append({"pulse": pulse, "grid": [1, 2]}, self._run(1e5))
+            writer.append({"pulse": {**pulse, "sigma_s": 2e-7}, "grid": [1, 3]}, self._run(2e5))
+        store = ResultStore(self.path)
+        self.assertEqual(store.find(pulse=dict(reversed(list(pulse.items())))), [0])
+        self.assertEqual(store.find(pulse={**pulse, "sigma_s": 2e-7}, grid=(1, 3)), [1])
+        self.assertEqual(store.find(pulse={"shape": "gauss"}), [])
+        self.assertEqual(store.params(0)["pulse"], pulse)
+
+    def test_concurrent_process_readers(self):
+        with ResultWriter(self.path, chunk_runs=1) as writer:
+            for det in (1e5, 2e5):
+                writer.append({"detuning_hz": det}, self._run(det))
+        expected = float(np.nansum(np.asarray(self._run(2e5).i_lp)))
+        with ProcessPoolExecutor(max_workers=2) as pool:
+            for total, runs in pool.map(_reader_sum, [self.path] * 4, [1] * 4):
+                self.assertEqual(runs, 2)
+                self.assertAlmostEqual(total, expected, places=12)
+
+    def test_sweep_streams_into_store(self):
+        points = sweep_grid([1e5, 2e5, 3e5], [1.5e6, 2.5e6], 1e-6, 4e-6, 1e-6)
+        with ResultWriter(self.path, chunk_runs=4) as writer:
+            table = run_sweep(points, root_seed=3, workers=2, chunksize=2, store=writer,
+                              dt_s=2e-7, demod_window=6)
+        store = ResultStore(self.path)
+        self.assertEqual(len(store), len(points))
+        for index, point in enumerate(points):
+            (run,) = store.find(index=index)
+            self.assertEqual(store.phase(run), table["phase"][index])
+            self.assertEqual(store.params(run)["omega_hz"], point.omega_hz)
+        res = run_dpd_sequence(self.hw, 2e5, 2.5e6, 1e-6, 4e-6, 1e-6, dt_s=2e-7, demod_window=6,
+                               rng=RNG(3).substream(4))
+        (run,) = store.find(detuning_hz=2e5, omega_hz=2.5e6)
+        np.testing.assert_allclose(store.read(run, "q_lp"), np.asarray(res.q_lp), rtol=0, atol=1e-15)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,56 @@
+import unittest
+
+from synqc.hardware import HardwareSignature
+from synqc.rng import RNG
+from synqc.scheduler import run_dpd_sequence
+from synqc.sweep import SWEEP_COLUMNS, SweepPoint, SweepTable, run_sweep, sweep_grid
+
+
+class TestSweep(unittest.TestCase):
+    def setUp(self):
+        self.points = sweep_grid(
+            detuning_hz=[100e3, 200e3, 300e3],
+            omega_hz=[1.5e6, 2.5e6],
+            d1_s=1e-6,
+            probe_s=4e-6,
+            d2_s=1e-6,
+            family=("superconducting", "ion_trap"),
+        )
+        self.kwargs = dict(dt_s=2e-7, demod_window=6)
+
+    def test_grid_order(self):
+        self.assertEqual(len(self.points), 12)
+        self.assertEqual(self.points[0], SweepPoint(100e3, 1.5e6, 1e-6, 4e-6, 1e-6, "superconducting"))
+        self.assertEqual(self.points[1].detuning_hz, 200e3)
+        self.assertEqual(self.points[-1].family, "ion_trap")
+
+    def test_results_independent_of_workers(self):
+        seen = []
+        serial = run_sweep(self.points, root_seed=11, workers=1, chunksize=5,
+                           progress=lambda done, total: seen.append((done, total)), **self.kwargs)
+        parallel = run_sweep(self.points, root_seed=11, workers=3, chunksize=2, **self.kwargs)
+        self.assertIsInstance(serial, SweepTable)
+        self.assertEqual(tuple(serial.columns), SWEEP_COLUMNS)
+        self.assertEqual(serial.columns, parallel.columns)
+        self.assertEqual(seen, [(5, 12), (10, 12), (12, 12)])
+
+    def test_point_uses_indexed_substream(self):
+        table = run_sweep(self.points, root_seed=4, workers=1, **self.kwargs)
+        point = self.points[7]
+        res = run_dpd_sequence(
+            HardwareSignature.from_family(point.family),
+            point.detuning_hz, point.omega_hz, point.d1_s, point.probe_s, point.d2_s,
+            rng=RNG(4).substream(7), **self.kwargs,
+        )
+        self.assertAlmostEqual(table["phase"][7], res.phase, places=12)
+        self.assertEqual(table.rows()[7]["family"], point.family)
+
+    def test_validation(self):
+        with self.assertRaises(ValueError):
+            run_sweep([SweepPoint(1e5, 1e6, 1e-6, 1e-6, 1e-6, "vacuum_tube")], workers=1)
+        with self.assertRaises(ValueError):
+            run_sweep(self.points, workers=0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,65 @@
+import unittest
+
+from synqc.adapt import ScalarKalman
+from synqc.hardware import HardwareSignature
+from synqc.rng import default_rng
+from synqc.scheduler import run_dpd_sequence
+from synqc.track import DetuningTracker, TrackingResult
+
+
+class TestTracker(unittest.TestCase):
+    def setUp(self):
+        self.hw = HardwareSignature.superconducting()
+        self.segments = (2.5e6, 2e-6, 20e-6, 2e-6)
+
+    def _reference_loop(self, truth, iterations, **kwargs):
+        kf = ScalarKalman(x0=0.0, p0=1e12, q=1e7, r=1e6)
+        rng = default_rng(3)
+        phases, estimates = [], []
+        for k in range(iterations):
+            res = run_dpd_sequence(
+                self.hw, truth(k) - kf.x, *self.segments, rng=rng, dt_s=2e-7,
+                record_states="none", lazy_demod=True, **kwargs,
+            )
+            kf.predict()
+            estimates.append(kf.update(res.phase * 1e5)[0])
+            phases.append(res.phase)
+        return phases, estimates
+
+    def test_matches_run_dpd_sequence_loop(self):
+        truth = lambda k: 250e3 + 2e3 * k  # noqa: E731
+        for window in (None, 8):
+            tracker = DetuningTracker(
+                self.hw, *self.segments, dt_s=2e-7, rng=default_rng(3),
+                ref_freq_hz=1e5, demod_window=window,
+            )
+            result = tracker.run(truth, 12)
+            self.assertIsInstance(result, TrackingResult)
+            phases, estimates = self._reference_loop(truth, 12, ref_freq_hz=1e5, demod_window=window)
+            for k in range(12):
+                self.assertAlmostEqual(result.phase[k], phases[k], places=11)
+                self.assertAlmostEqual(result.estimate_hz[k], estimates[k], delta=1e-6)
+            self.assertEqual(result.estimate_hz[-1], tracker.kalman.x)
+
+    def test_default_reference_follows_residual(self):
+        tracker = DetuningTracker(self.hw, *self.segments, dt_s=2e-7, rng=default_rng(3))
+        result = tracker.run(250e3, 2)
+        phases, _ = self._reference_loop(lambda k: 250e3, 2)
+        for k in range(2):
+            self.assertAlmostEqual(result.phase[k], phases[k], places=9)
+
+    def test_latency_stats(self):
+        tracker = DetuningTracker(self.hw, *self.segments, dt_s=2e-7, rng=default_rng(1))
+        stats = tracker.run(100e3, 20).stats
+        self.assertEqual(len(stats.latencies_s), 20)
+        self.assertGreater(stats.mean_s, 0.0)
+        self.assertGreaterEqual(stats.jitter_s, 0.0)
+        self.assertLessEqual(stats.percentile(0.5), stats.max_s)
+        self.assertEqual(stats.percentile(1.0), stats.max_s)
+        self.assertGreater(stats.rate_hz, 0.0)
+        with self.assertRaises(ValueError):
+            tracker.run(100e3, -1)
+
+
+if __name__ == "__main__":
+    unittest.main()